@@ -0,0 +1,83 @@
+"""
+Benchmark des encodeurs JSON sur une page de /api/users
+
+Compare l'encodeur Flask par defaut aux fournisseurs BMB installes
+(orjson, ujson, stdlib) sur la meme charge utile
+
+Usage:
+    python benchmarks/json_providers.py
+    python benchmarks/json_providers.py --page-size 1000
+"""
+
+import argparse
+import datetime
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from bmb.utils.json_provider import JSON_PROVIDERS  # noqa: E402
+
+
+def users_page(page_size):
+    """Reponse de /api/users: lignes de Model.rows() et pagination"""
+    created = datetime.datetime(2024, 1, 31, 12, 30)
+    users = [
+        {
+            'id': i,
+            'name': f'Utilisateur {i}',
+            'email': f'user{i}@example.com',
+            'age': 20 + i % 60,
+            'created_at': created + datetime.timedelta(minutes=i)
+        }
+        for i in range(page_size)
+    ]
+    return {
+        'data': {
+            'users': users,
+            'pagination': {'page': 1, 'page_size': page_size, 'total': 10000, 'total_pages': 100}
+        }
+    }
+
+
+def measure(dumps, payload, duration):
+    count = 0
+    stop = time.perf_counter() + duration
+    while time.perf_counter() < stop:
+        dumps(payload)
+        count += 1
+    return count / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des encodeurs JSON BMB")
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=2.0)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    payload = users_page(args.page_size)
+
+    flask_default = DefaultJSONProvider(app)
+    results = [('flask (defaut)', measure(lambda obj: flask_default.dumps(obj, separators=(',', ':')), payload, args.duration))]
+
+    for name, provider_class in JSON_PROVIDERS.items():
+        try:
+            provider = provider_class(app)
+        except ImportError:
+            print(f"   {name}: non installe")
+            continue
+        results.append((name, measure(provider.dumps_bytes, payload, args.duration)))
+
+    baseline = results[0][1]
+    print(f"\n{'encodeur':<16}{'pages/s':>10}{'gain':>8}")
+    for name, rate in results:
+        print(f"{name:<16}{rate:>10.0f}{rate / baseline:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
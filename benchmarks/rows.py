@@ -0,0 +1,89 @@
+"""
+Benchmark des listes en lecture seule: objets ORM + to_dict() contre
+lignes brutes (Model.rows, SELECT Core sans identity map)
+
+Usage:
+    python benchmarks/rows.py
+    python benchmarks/rows.py --rows 50000 --page-size 100
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import Column, Integer, String, create_engine, select  # noqa: E402
+from sqlalchemy.orm import declarative_base, sessionmaker  # noqa: E402
+
+from bmb.orm.queries import row_columns, rows_statement, shape_rows  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = 'users'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String)
+    email = Column(String, unique=True)
+    password = Column(String)
+    age = Column(Integer)
+
+    def to_dict(self):
+        """Equivalent de ModelMixin.to_dict"""
+        return {column.name: getattr(self, column.name) for column in self.__table__.columns}
+
+
+def orm_page(session, page_size):
+    users = session.scalars(select(User).limit(page_size)).all()
+    return [user.to_dict() for user in users]
+
+
+def rows_page(session, page_size):
+    names = row_columns(User)
+    statement = rows_statement(User, {}, names, limit=page_size)
+    return shape_rows(User, names, session.execute(statement).all())
+
+
+def measure(fn, session_factory, page_size, duration):
+    count = 0
+    stop = time.perf_counter() + duration
+    while time.perf_counter() < stop:
+        with session_factory() as session:
+            fn(session, page_size)
+        count += 1
+    return count / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des lignes brutes BMB")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f'sqlite:///{Path(tmp) / "bench.db"}')
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as session:
+            session.add_all([
+                User(name=f'user {i}', email=f'user{i}@example.com', password='x' * 102, age=i % 90)
+                for i in range(args.rows)
+            ])
+            session.commit()
+
+        orm = measure(orm_page, session_factory, args.page_size, args.duration)
+        raw = measure(rows_page, session_factory, args.page_size, args.duration)
+        engine.dispose()
+
+    print(f"\n{'mode':<16}{'pages/s':>10}")
+    print(f"{'ORM + to_dict':<16}{orm:>10.0f}")
+    print(f"{'rows()':<16}{raw:>10.0f}")
+    print(f"\nGain: x{raw / (orm or 1):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark du profil SQLite de production
+
+Lecteurs concurrents + un ecrivain (un processus chacun, comme des workers)
+sur une base fichier, avec les reglages SQLite d'origine puis avec le profil
+'production' (WAL, busy_timeout, mmap...). En mode journal classique chaque
+commit bloque les lecteurs; en WAL les lecteurs ne sont jamais bloques.
+
+Usage:
+    python benchmarks/sqlite_profile.py
+    python benchmarks/sqlite_profile.py --readers 8 --duration 5 --batch 50
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from bmb.orm.sqlite import SQLiteProfile  # noqa: E402
+
+PRODUCTION_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+
+
+def prepare(path, rows):
+    """Creer la table et la remplir"""
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, counter INTEGER, payload TEXT)"))
+        conn.execute(
+            text("INSERT INTO items (id, counter, payload) VALUES (:id, 0, :payload)"),
+            [{'id': i, 'payload': f'item-{i}-' + 'x' * 200} for i in range(1, rows + 1)]
+        )
+    engine.dispose()
+
+
+def make_engine(path, profile):
+    engine = create_engine(f'sqlite:///{path}')
+    if profile == 'production':
+        SQLiteProfile(PRODUCTION_PRAGMAS, checkpoint_interval=1).install(engine)
+    return engine
+
+
+def reader(path, profile, stop, rows, results):
+    engine = make_engine(path, profile)
+    done = errors = 0
+    with engine.connect() as conn:
+        while time.time() < stop:
+            try:
+                low = random.randint(1, rows - 100)
+                conn.execute(
+                    text("SELECT id, payload FROM items WHERE id BETWEEN :low AND :high"),
+                    {'low': low, 'high': low + 100}
+                ).fetchall()
+                conn.rollback()
+                done += 1
+            except OperationalError:
+                conn.rollback()
+                errors += 1
+    engine.dispose()
+    results.put(('reads', done, errors))
+
+
+def writer(path, profile, stop, rows, batch, results):
+    engine = make_engine(path, profile)
+    done = errors = 0
+    while time.time() < stop:
+        try:
+            with engine.begin() as conn:
+                for _ in range(batch):
+                    conn.execute(
+                        text("UPDATE items SET counter = counter + 1 WHERE id = :id"),
+                        {'id': random.randint(1, rows)}
+                    )
+            done += 1
+        except OperationalError:
+            errors += 1
+    engine.dispose()
+    results.put(('writes', done, errors))
+
+
+def run(path, profile, readers, duration, rows, batch=1):
+    """Mesurer lectures/ecritures par seconde pour un profil (un processus par client)"""
+    # Passer en WAL une fois avant de lancer les clients
+    make_engine(path, profile).dispose()
+
+    results = multiprocessing.Queue()
+    stop = time.time() + duration
+    processes = [
+        multiprocessing.Process(target=reader, args=(path, profile, stop, rows, results))
+        for _ in range(readers)
+    ]
+    processes.append(multiprocessing.Process(target=writer, args=(path, profile, stop, rows, batch, results)))
+    for process in processes:
+        process.start()
+
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    for _ in processes:
+        kind, done, errors = results.get()
+        counts[kind] += done
+        counts['errors'] += errors
+    for process in processes:
+        process.join()
+
+    return {key: value / duration for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du profil SQLite BMB")
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--rows', type=int, default=20000)
+    # 1 = une transaction par ecriture, comme ModelMixin.save()
+    parser.add_argument('--batch', type=int, default=1, help="UPDATE par transaction d'ecriture")
+    args = parser.parse_args()
+
+    results = {}
+    for profile in ('default', 'production'):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'bench.db'
+            prepare(path, args.rows)
+            results[profile] = run(path, profile, args.readers, args.duration, args.rows, args.batch)
+
+    print(f"\n{'profil':<12}{'lectures/s':>14}{'ecritures/s':>14}{'erreurs/s':>12}")
+    for profile, result in results.items():
+        print(f"{profile:<12}{result['reads']:>14.0f}{result['writes']:>14.0f}{result['errors']:>12.0f}")
+
+    baseline = results['default']['reads'] or 1
+    print(f"\nGain en lecture: x{results['production']['reads'] / baseline:.1f}")
+
+
+if __name__ == '__main__':
+    main()
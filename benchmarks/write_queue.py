@@ -0,0 +1,98 @@
+"""
+Benchmark de la file d'ecriture unique (commit groupe)
+
+N threads enregistrent des lignes en continu, soit avec un commit par
+ecriture (comme ModelMixin.save), soit via WriteCoordinator qui regroupe
+les ecritures de tous les threads dans une transaction
+
+Usage:
+    python benchmarks/write_queue.py
+    python benchmarks/write_queue.py --threads 32 --duration 5 --synchronous FULL
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import Column, Integer, String, create_engine  # noqa: E402
+from sqlalchemy.orm import declarative_base, sessionmaker  # noqa: E402
+
+from bmb.orm import SQLiteProfile, WriteCoordinator  # noqa: E402
+
+Base = declarative_base()
+
+
+class Event(Base):
+    __tablename__ = 'events'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String)
+
+
+def direct_save(session_factory, instance):
+    """Equivalent de ModelMixin.save: une session et un commit par ecriture"""
+    session = session_factory()
+    try:
+        session.add(instance)
+        session.commit()
+        session.refresh(instance)
+    finally:
+        session.close()
+
+
+def run(mode, threads, duration, synchronous):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f'sqlite:///{Path(tmp) / "bench.db"}', pool_size=threads + 1)
+        SQLiteProfile({'busy_timeout': 30000, 'journal_mode': 'WAL', 'synchronous': synchronous}).install(engine)
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+
+        coordinator = WriteCoordinator(session_factory) if mode == 'queue' else None
+        counts = [0] * threads
+        stop = time.monotonic() + duration
+
+        def worker(index):
+            while time.monotonic() < stop:
+                event = Event(name=f'event-{index}')
+                if coordinator is not None:
+                    coordinator.write('save', event)
+                else:
+                    direct_save(session_factory, event)
+                counts[index] += 1
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        stats = coordinator.stats() if coordinator is not None else None
+        if coordinator is not None:
+            coordinator.stop()
+        engine.dispose()
+
+    return sum(counts) / duration, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la file d'ecriture BMB")
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--synchronous', default='FULL', help="PRAGMA synchronous (FULL = un fsync par commit)")
+    args = parser.parse_args()
+
+    direct, _ = run('direct', args.threads, args.duration, args.synchronous)
+    queued, stats = run('queue', args.threads, args.duration, args.synchronous)
+
+    print(f"\n{'mode':<10}{'ecritures/s':>14}")
+    print(f"{'direct':<10}{direct:>14.0f}")
+    print(f"{'file':<10}{queued:>14.0f}   (lots de {stats['avg_batch']} en moyenne)")
+    print(f"\nGain en ecriture: x{queued / (direct or 1):.1f}")
+
+
+if __name__ == '__main__':
+    main()
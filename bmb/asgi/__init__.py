@@ -0,0 +1,8 @@
+"""
+Mode ASGI de BMB (Quart)
+Necessite: pip install bmb[asgi]
+"""
+
+from .app import create_asgi_app
+
+__all__ = ['create_asgi_app']
\ No newline at end of file
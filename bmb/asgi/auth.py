@@ -0,0 +1,165 @@
+"""
+Routes d'authentification asynchrones
+"""
+
+from quart import Blueprint, request
+from quart.utils import run_sync
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from ..models_loader import load_models
+from ..utils import JWTManager, Validator, instance_etag
+from .utils import token_required, success_response, error_response, conditional, not_modified, use_etag
+
+auth_bp = Blueprint('auth', __name__)
+
+
+@auth_bp.route('/register', methods=['POST'])
+async def register():
+    """
+    Inscription d'un nouvel utilisateur
+
+    Body:
+        {
+            "name": "string",
+            "email": "string",
+            "password": "string",
+            "age": int (optionnel)
+        }
+    """
+    try:
+        data = await request.get_json()
+
+        if not data:
+            return error_response("Corps de requete manquant", 400)
+
+        # Validation des champs requis
+        is_valid, message = Validator.validate_required_fields(
+            data,
+            ['name', 'email', 'password']
+        )
+        if not is_valid:
+            return error_response(message, 400)
+
+        # Validation de l'email
+        if not Validator.validate_email(data['email']):
+            return error_response("Format d'email invalide", 400)
+
+        # Validation du mot de passe
+        is_valid, message = Validator.validate_password(data['password'])
+        if not is_valid:
+            return error_response(message, 400)
+
+        User = load_models().get('User')
+
+        if not User:
+            return error_response("Modele User introuvable", 500)
+
+        # Hasher le mot de passe (CPU) hors de la boucle d'evenements
+        hashed_password = await run_sync(generate_password_hash)(data['password'])
+
+        # Insertion atomique: un email deja utilise donne un conflit, pas une erreur 500
+        saved_user = await User.ainsert_or_ignore(
+            conflict_cols=['email'],
+            name=data['name'],
+            email=data['email'],
+            password=hashed_password,
+            age=data.get('age')
+        )
+        if saved_user is None:
+            return error_response("Cet email est deja utilise", 409)
+
+        token = JWTManager.generate_token(saved_user.id)
+
+        return success_response(
+            data={
+                'token': token,
+                'user': saved_user.to_dict()
+            },
+            message="Utilisateur cree avec succes",
+            status=201
+        )
+
+    except Exception as e:
+        return error_response(f"Erreur lors de l'inscription: {str(e)}", 500)
+
+
+@auth_bp.route('/login', methods=['POST'])
+async def login():
+    """
+    Connexion utilisateur
+
+    Body:
+        {
+            "email": "string",
+            "password": "string"
+        }
+    """
+    try:
+        data = await request.get_json()
+
+        if not data:
+            return error_response("Corps de requete manquant", 400)
+
+        is_valid, message = Validator.validate_required_fields(
+            data,
+            ['email', 'password']
+        )
+        if not is_valid:
+            return error_response(message, 400)
+
+        User = load_models().get('User')
+
+        user = await User.afirst(email=data['email'], defer=[])
+
+        if not user:
+            return error_response("Email ou mot de passe incorrect", 401)
+
+        password_ok = await run_sync(check_password_hash)(user.password, data['password'])
+        if not password_ok:
+            return error_response("Email ou mot de passe incorrect", 401)
+
+        token = JWTManager.generate_token(user.id)
+
+        return success_response(
+            data={
+                'token': token,
+                'user': user.to_dict()
+            },
+            message="Connexion reussie"
+        )
+
+    except Exception as e:
+        return error_response(f"Erreur lors de la connexion: {str(e)}", 500)
+
+
+@auth_bp.route('/me', methods=['GET'])
+@token_required
+@conditional()
+async def get_current_user(current_user):
+    """Recuperer les informations de l'utilisateur connecte (304 si inchangees)"""
+    if use_etag(instance_etag(current_user)):
+        return await not_modified()
+
+    return success_response(
+        data={'user': current_user.to_dict()},
+        message="Profil recupere"
+    )
+
+
+@auth_bp.route('/refresh', methods=['POST'])
+@token_required
+async def refresh_token(current_user):
+    """Renouveler le token JWT"""
+    new_token = JWTManager.generate_token(current_user.id)
+
+    return success_response(
+        data={'token': new_token},
+        message="Token renouvele"
+    )
+
+
+@auth_bp.route('/logout', methods=['POST'])
+@token_required
+async def logout(current_user):
+    """Deconnexion (cote client, il faut supprimer le token)"""
+    return success_response(message="Deconnexion reussie")
@@ -108,6 +108,8 @@ class BMBCLI:
             # Create .env.example
             env_content = """# Configuration BMDB
 DB_CONNECTION=sqlite:///./database.db
+# SQLite: production (WAL, busy_timeout, mmap...) ou default
+# SQLITE_PROFILE=production
 
 # Configuration BMB
 SECRET_KEY=change-this-secret-key
@@ -140,8 +142,12 @@ CREATE_TABLES_ON_START=True
     .env
     .env.local
     *.db
+    *.db-wal
+    *.db-shm
     *.sqlite
     *.log
+    exports/
+    .bmb/
     .vscode/
     .idea/
     .DS_Store
@@ -176,6 +182,7 @@ if __name__ == '__main__':
     print("[BMB] {project_name} - Backend Framework")
     print("="*60)
     print(f"Server: http://{{AppConfig.HOST}}:{{AppConfig.PORT}}")
+    print("Production: bmb serve")
     print("="*60 + "\\n")
     
     app.run(
@@ -227,6 +234,12 @@ python run.py
     ```
     L'API sera disponible sur http://localhost:5000
 
+    # Production
+    ```bash
+pip install bmb[server]
+bmb serve --workers 4 --threads 8
+    ```
+
     #Documentation API
     POST /api/auth/register - Inscription
 
@@ -254,7 +267,7 @@ GET /api/health - Health check
             print(" 8. bmdb add-fields User name String email String --unique email password String")
             print(" 9. bmdb generate")
             print(" 10. bmdb migrate-schema")
-            print(" 11. python run.py")
+            print(" 11. python run.py (developpement) | bmb serve (production)")
             
 
     def _copy_template_files(self, source, dest):
@@ -304,7 +317,7 @@ Genere automatiquement par BMB CLI
 from flask import Blueprint, request
 
 from models_loader import load_models
-from utils import JWTManager, success_response, error_response
+from utils import JWTManager, success_response, error_response, requested_fields, requested_includes
 from config import AppConfig
 
 {model_name.lower()}_bp = Blueprint('{model_name.lower()}', __name__)
@@ -313,7 +326,14 @@ from config import AppConfig
 @{model_name.lower()}_bp.route('', methods=['GET'])
 @JWTManager.token_required
 def get_{model_name.lower()}s(current_user):
-    """Recuperer tous les {model_name}s avec pagination"""
+    """
+    Recuperer tous les {model_name}s avec pagination
+    
+    Query params:
+        - page, page_size: pagination
+        - fields: colonnes a retourner (ex: ?fields=id,name)
+        - include: relations a inclure (ex: ?include=author)
+    """
     try:
         models = load_models()
         {model_name} = models.get('{model_name}')
@@ -328,18 +348,25 @@ def get_{model_name.lower()}s(current_user):
             AppConfig.MAX_PAGE_SIZE
         )
         
-        # Recuperer tous les {model_name}s
-        items = {model_name}.all()
+        # Projection et relations demandees par le client
+        try:
+            fields = requested_fields(request, {model_name})
+            includes = requested_includes(request, {model_name})
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        # Colonnes demandees seules en SQL, relations chargees par lot (selectinload)
+        items = {model_name}.rows(
+            columns=fields,
+            include=includes,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
         total_count = {model_name}.count()
         
-        # Pagination manuelle
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated = items[start:end]
-        
         return success_response(
             data={{
-                'items': [item.to_dict() for item in paginated],
+                'items': items,
                 'pagination': {{
                     'page': page,
                     'page_size': page_size,
@@ -412,17 +439,15 @@ def update_{model_name.lower()}(current_user, item_id):
         models = load_models()
         {model_name} = models.get('{model_name}')
         
-        item = {model_name}.get(item_id)
-        
-        if not item:
-            return error_response("{model_name} introuvable", 404)
+        # Champs connus du modele (l'id n'est pas modifiable)
+        columns = {model_name}.__table__.columns
+        fields = {{key: value for key, value in data.items() if key in columns and key != 'id'}}
         
-        # Mettre a jour les champs
-        for key, value in data.items():
-            if hasattr(item, key):
-                setattr(item, key, value)
+        # Une seule requete UPDATE ... WHERE id = ? RETURNING *
+        updated_item = {model_name}.update(item_id, **fields)
         
-        updated_item = item.save()
+        if not updated_item:
+            return error_response("{model_name} introuvable", 404)
         
         return success_response(
             data={{'item': updated_item.to_dict()}},
@@ -494,6 +519,185 @@ def delete_{model_name.lower()}(current_user, item_id):
         
         return True
     
+    def serve(self, app_path=None, host=None, port=None, workers=None, threads=None,
+              preload=None, max_requests=None, asgi=False):
+        """Lancer l'application sous un serveur de production (WSGI ou ASGI)"""
+        self.print_header("Serveur de production BMB")
+        
+        from .server import serve, serve_asgi
+        
+        try:
+            if asgi:
+                serve_asgi(app_path, host=host, port=port, workers=workers)
+                return True
+            
+            serve(
+                app_path,
+                host=host,
+                port=port,
+                workers=workers,
+                threads=threads,
+                preload=preload,
+                max_requests=max_requests
+            )
+            return True
+        except Exception as e:
+            self.print_error(f"Erreur lors du lancement du serveur: {e}")
+            return False
+    
+    def export(self, model_name, fmt='csv', columns=None, where=None, output=None, compress=True):
+        """
+        Exporter un modele en CSV ou NDJSON (gzip), directement depuis la base
+
+        Les lignes sont lues en flux et ecrites par lots: memoire constante,
+        aucun worker HTTP sollicite.
+        """
+        self.print_header(f"Export du modele: {model_name}")
+        
+        import time
+        from datetime import datetime
+        from .config import AppConfig
+        from .exports import ExportError, get_export_manager
+        from .models_loader import load_models
+        
+        try:
+            model = load_models().get(model_name)
+            if model is None:
+                self.print_error(f"Modele introuvable: {model_name}")
+                return False
+            
+            filters = {}
+            for condition in where or []:
+                name, sep, value = condition.partition('=')
+                if not sep:
+                    self.print_error(f"Filtre invalide (CHAMP=VALEUR attendu): {condition}")
+                    return False
+                filters[name] = self._coerce_filter(model, name, value)
+            
+            manager = get_export_manager()
+            # Colonnes explicites: la CLI peut exporter les champs exclus de l'API
+            job = manager.create(
+                model,
+                fmt=fmt,
+                columns=columns,
+                filters=filters,
+                compress=compress,
+                exclude=() if columns else None
+            )
+            if output is None:
+                extension = job['file'].split('.', 1)[1]
+                stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+                output = Path(AppConfig.EXPORT_DIR) / f"{model_name.lower()}-{stamp}.{extension}"
+            
+            self.print_info(f"Colonnes: {', '.join(job['columns'])}")
+            started = time.perf_counter()
+            job = manager.run(model, job, output)
+            elapsed = time.perf_counter() - started
+        except ExportError as e:
+            self.print_error(str(e))
+            return False
+        except Exception as e:
+            self.print_error(f"Erreur lors de l'export: {e}")
+            return False
+        
+        if job['status'] != 'done':
+            self.print_error(f"Export en echec: {job['error']}")
+            return False
+        
+        megabytes = job['bytes'] / (1024 * 1024)
+        self.print_success(f"{job['rows']} lignes exportees en {elapsed:.1f}s ({megabytes:.1f} Mo)")
+        self.print_success(f"Fichier: {output}")
+        return True
+    
+    def import_file(self, model_name, path, fmt=None, prehashed=False, batch_size=None, report_path=None):
+        """
+        Importer un fichier CSV ou NDJSON (eventuellement .gz) dans un modele
+        
+        Memes regles que POST /api/users/import; --prehashed reprend des
+        mots de passe deja haches (migration depuis une autre base).
+        """
+        self.print_header(f"Import du modele: {model_name}")
+        
+        import json
+        from .imports import BulkImportError, import_format, importer_for, parse_records
+        from .models_loader import load_models
+        
+        path = Path(path)
+        try:
+            model = load_models().get(model_name)
+            if model is None:
+                self.print_error(f"Modele introuvable: {model_name}")
+                return False
+            
+            fmt = import_format(fmt, filename=path.name)
+            options = {'batch_size': batch_size} if batch_size else {}
+            importer = importer_for(model, prehashed=prehashed, **options)
+            
+            self.print_info(f"Fichier: {path} ({fmt}, lots de {importer.batch_size})")
+            with open(path, 'rb') as f:
+                report = importer.run(parse_records(f, fmt, gzipped=path.suffix == '.gz'))
+        except BulkImportError as e:
+            self.print_error(str(e))
+            return False
+        except Exception as e:
+            self.print_error(f"Erreur lors de l'import: {e}")
+            return False
+        
+        result = report.to_dict()
+        self.print_success(f"{result['inserted']} lignes inserees en {result['seconds']:.1f}s")
+        if result['rejected']:
+            self.print_warning(f"{result['rejected']} lignes rejetees")
+            for error in result['errors'][:20]:
+                print(f"  ligne {error['line']}: {'; '.join(error['errors'])}")
+            if result['rejected'] > 20:
+                print("  ...")
+        if report_path:
+            Path(report_path).write_text(json.dumps(result, indent=2, ensure_ascii=False))
+            self.print_success(f"Rapport: {report_path}")
+        return True
+    
+    def create_tenant(self, tenant_id):
+        """
+        Creer la base d'un tenant et ses tables (TENANT_DB_URL)
+
+        Les requetes HTTP ne creent jamais de base: un tenant inconnu recoit 404.
+        """
+        self.print_header(f"Creation du tenant: {tenant_id}")
+        
+        from .models_loader import ModelsLoader, load_models
+        from .orm import InvalidTenant
+        
+        try:
+            load_models()
+            registry = ModelsLoader.get_tenant_registry()
+            if registry is None:
+                self.print_error("TENANT_DB_URL n'est pas defini")
+                return False
+            registry.provision(tenant_id)
+        except InvalidTenant as e:
+            self.print_error(str(e))
+            return False
+        except Exception as e:
+            self.print_error(f"Erreur lors de la creation du tenant: {e}")
+            return False
+        
+        self.print_success(f"Base creee: {registry.url_for(tenant_id)}")
+        return True
+    
+    @staticmethod
+    def _coerce_filter(model, name, value):
+        """Convertir la valeur d'un filtre texte selon le type de la colonne"""
+        column = model.__table__.columns.get(name)
+        if column is None:
+            return value
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        if python_type in (int, float):
+            return python_type(value)
+        return value
+    
     def show_info(self):
         """Afficher les informations sur BMB"""
         self.print_header("BMB Backend Framework")
@@ -506,6 +710,10 @@ def delete_{model_name.lower()}(current_user, item_id):
         print(f"  {self.colors.CYAN}bmb init <projet>{self.colors.ENDC} - Creer un nouveau projet")
         print(f"  {self.colors.CYAN}bmb generate-crud <Model>{self.colors.ENDC} - Generer un CRUD")
         print(f"  {self.colors.CYAN}bmb list-routes{self.colors.ENDC} - Lister les routes")
+        print(f"  {self.colors.CYAN}bmb serve{self.colors.ENDC} - Lancer le serveur de production")
+        print(f"  {self.colors.CYAN}bmb export <Model>{self.colors.ENDC} - Exporter un modele (CSV/NDJSON)")
+        print(f"  {self.colors.CYAN}bmb import <Model> <fichier>{self.colors.ENDC} - Importer un fichier CSV/NDJSON")
+        print(f"  {self.colors.CYAN}bmb create-tenant <id>{self.colors.ENDC} - Creer la base d'un tenant")
         print(f"  {self.colors.CYAN}bmb info{self.colors.ENDC} - Afficher les informations")
         
         print(f"\n{self.colors.BOLD}Documentation:{self.colors.ENDC}")
@@ -533,6 +741,56 @@ def main():
     # Commande list-routes
     subparsers.add_parser('list-routes', help='Lister les routes')
     
+    # Commande serve
+    serve_parser = subparsers.add_parser('serve', help='Lancer le serveur de production')
+    serve_parser.add_argument('--app', dest='app_path', default=None,
+                              help="Factory de l'application 'module:factory' (defaut: app:create_app)")
+    serve_parser.add_argument('--host', default=None, help='Adresse d\'ecoute (defaut: HOST)')
+    serve_parser.add_argument('--port', type=int, default=None, help='Port (defaut: PORT)')
+    serve_parser.add_argument('-w', '--workers', type=int, default=None,
+                              help='Nombre de workers (defaut: 2 x coeurs + 1)')
+    serve_parser.add_argument('-t', '--threads', type=int, default=None,
+                              help='Threads par worker (defaut: 4)')
+    serve_parser.add_argument('--preload', dest='preload', action='store_true', default=None,
+                              help='Charger modeles et engine avant le fork')
+    serve_parser.add_argument('--no-preload', dest='preload', action='store_false',
+                              help='Charger l\'application dans chaque worker')
+    serve_parser.add_argument('--max-requests', type=int, default=None,
+                              help='Recycler un worker apres N requetes (0 = jamais)')
+    serve_parser.add_argument('--asgi', action='store_true',
+                              help='Mode ASGI (hypercorn + create_asgi_app)')
+    
+    # Commande export
+    export_parser = subparsers.add_parser('export', help='Exporter un modele en CSV ou NDJSON (gzip)')
+    export_parser.add_argument('model_name', help='Nom du modele')
+    export_parser.add_argument('-f', '--format', dest='fmt', choices=['csv', 'ndjson'], default='csv',
+                               help='Format du fichier (defaut: csv)')
+    export_parser.add_argument('--columns', default=None,
+                               help='Colonnes separees par des virgules (defaut: toutes sauf SERIALIZER_EXCLUDE)')
+    export_parser.add_argument('--where', action='append', default=[], metavar='CHAMP=VALEUR',
+                               help='Filtre d\'egalite (repetable)')
+    export_parser.add_argument('-o', '--output', default=None,
+                               help='Fichier produit (defaut: EXPORT_DIR/<modele>-<date>.csv.gz)')
+    export_parser.add_argument('--no-compress', dest='compress', action='store_false',
+                               help='Ne pas compresser en gzip')
+    
+    # Commande import
+    import_parser = subparsers.add_parser('import', help='Importer un fichier CSV ou NDJSON (gzip accepte)')
+    import_parser.add_argument('model_name', help='Nom du modele')
+    import_parser.add_argument('path', help='Fichier a importer (.csv, .ndjson, .jsonl, eventuellement .gz)')
+    import_parser.add_argument('-f', '--format', dest='fmt', choices=['csv', 'ndjson'], default=None,
+                               help='Format du fichier (defaut: deduit de l\'extension)')
+    import_parser.add_argument('--prehashed', action='store_true',
+                               help='Mots de passe deja haches (repris tels quels)')
+    import_parser.add_argument('--batch-size', type=int, default=None,
+                               help='Lignes par transaction (defaut: IMPORT_BATCH_SIZE)')
+    import_parser.add_argument('--report', default=None,
+                               help='Ecrire le rapport complet en JSON dans ce fichier')
+    
+    # Commande create-tenant
+    tenant_parser = subparsers.add_parser('create-tenant', help='Creer la base d\'un tenant (TENANT_DB_URL)')
+    tenant_parser.add_argument('tenant_id', help='Identifiant du tenant')
+    
     # Commande info
     subparsers.add_parser('info', help='Informations sur BMB')
     
@@ -546,6 +804,42 @@ def main():
         cli.generate_crud(args.model_name)
     elif args.command == 'list-routes':
         cli.list_routes()
+    elif args.command == 'serve':
+        cli.serve(
+            args.app_path,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            threads=args.threads,
+            preload=args.preload,
+            max_requests=args.max_requests,
+            asgi=args.asgi
+        )
+    elif args.command == 'export':
+        ok = cli.export(
+            args.model_name,
+            fmt=args.fmt,
+            columns=args.columns.split(',') if args.columns else None,
+            where=args.where,
+            output=args.output,
+            compress=args.compress
+        )
+        if not ok:
+            raise SystemExit(1)
+    elif args.command == 'import':
+        ok = cli.import_file(
+            args.model_name,
+            args.path,
+            fmt=args.fmt,
+            prehashed=args.prehashed,
+            batch_size=args.batch_size,
+            report_path=args.report
+        )
+        if not ok:
+            raise SystemExit(1)
+    elif args.command == 'create-tenant':
+        if not cli.create_tenant(args.tenant_id):
+            raise SystemExit(1)
     elif args.command == 'info':
         cli.show_info()
     else:
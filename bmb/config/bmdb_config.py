@@ -20,7 +20,70 @@ class BMDBConfig:
     # Configuration de la base de données (gérée par BMDB)
     # BMDB lit directement DB_CONNECTION du .env
     DB_CONNECTION = os.getenv('DB_CONNECTION')
-    
+
+    # Replicas en lecture (URLs séparées par des virgules)
+    DB_REPLICAS = [url.strip() for url in os.getenv('DB_REPLICAS', '').split(',') if url.strip()]
+    DB_REPLICA_WEIGHTS = [int(w) for w in os.getenv('DB_REPLICA_WEIGHTS', '').split(',') if w.strip()]
+    # 'weighted' (tirage pondéré) ou 'least_connections'
+    DB_REPLICA_STRATEGY = os.getenv('DB_REPLICA_STRATEGY', 'weighted')
+    # Fenêtre lecture-après-écriture: les lectures restent sur le primaire (secondes)
+    READ_YOUR_WRITES_WINDOW = float(os.getenv('READ_YOUR_WRITES_WINDOW', 5))
+    READ_YOUR_WRITES_COOKIE = os.getenv('READ_YOUR_WRITES_COOKIE', 'bmb_primary_until')
+
+    # Sharding horizontal (URLs des shards séparées par des virgules)
+    # Le nombre de shards fait partie des identifiants: ne pas le modifier
+    DB_SHARDS = [url.strip() for url in os.getenv('DB_SHARDS', '').split(',') if url.strip()]
+    # Clé de sharding par modèle, ex: "User:email" (défaut: id)
+    DB_SHARD_KEYS = {
+        model.strip(): key.strip()
+        for model, key in (
+            item.split(':') for item in os.getenv('DB_SHARD_KEYS', '').split(',') if ':' in item
+        )
+    }
+
+    # Colonnes lourdes non chargées par défaut par filter/first/all, ex: "User:password,Post:body"
+    DB_DEFERRED_COLUMNS = [
+        tuple(part.strip() for part in item.split(':'))
+        for item in os.getenv('DB_DEFERRED_COLUMNS', '').split(',') if ':' in item
+    ]
+
+    # Champs jamais renvoyés par to_dict() (sauf demande explicite), tous modèles confondus
+    SERIALIZER_EXCLUDE = [
+        name.strip() for name in os.getenv('SERIALIZER_EXCLUDE', 'password').split(',') if name.strip()
+    ]
+
+    # Multi-tenant: une base par client, ex: "sqlite:///./tenants/{tenant}.db"
+    TENANT_DB_URL = os.getenv('TENANT_DB_URL', '')
+    # Tenants autorisés (vide: seules les bases SQLite déjà créées sont servies)
+    # Les bases sont créées explicitement: bmb create-tenant <id>
+    TENANTS = [t.strip() for t in os.getenv('TENANTS', '').split(',') if t.strip()]
+    # Pools ouverts au maximum par worker (le moins récemment utilisé est libéré)
+    TENANT_MAX_ENGINES = int(os.getenv('TENANT_MAX_ENGINES', 64))
+    # Libérer le pool d'un tenant inactif depuis N secondes
+    TENANT_IDLE_TIMEOUT = float(os.getenv('TENANT_IDLE_TIMEOUT', 300))
+
+    # Profil SQLite: 'default' (réglages SQLite d'origine) ou 'production' (WAL, busy_timeout, mmap...)
+    # 'production' est à activer explicitement: WAL crée des fichiers -wal/-shm à côté de la base
+    SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'default')
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # millisecondes
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # octets
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))  # négatif = Kio (64 Mo)
+    SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+    # Checkpoint du journal WAL toutes les N secondes (0 = auto-checkpoint SQLite seul)
+    SQLITE_WAL_CHECKPOINT_INTERVAL = float(os.getenv('SQLITE_WAL_CHECKPOINT_INTERVAL', 300))
+    SQLITE_WAL_CHECKPOINT_MODE = os.getenv('SQLITE_WAL_CHECKPOINT_MODE', 'PASSIVE')
+
+    # File d'écriture unique: save/delete regroupés en une transaction par lot
+    WRITE_QUEUE_ENABLED = os.getenv('WRITE_QUEUE_ENABLED', 'False').lower() == 'true'
+    WRITE_QUEUE_MAX_BATCH = int(os.getenv('WRITE_QUEUE_MAX_BATCH', 64))
+    WRITE_QUEUE_MAX_WAIT = float(os.getenv('WRITE_QUEUE_MAX_WAIT', 0.002))  # secondes
+    WRITE_QUEUE_TIMEOUT = float(os.getenv('WRITE_QUEUE_TIMEOUT', 30))  # secondes
+
+    # Écriture différée (Model.defer_update): fréquence et taille des lots
+    WRITE_BEHIND_FLUSH_MS = int(os.getenv('WRITE_BEHIND_FLUSH_MS', 500))
+    WRITE_BEHIND_MAX_ROWS = int(os.getenv('WRITE_BEHIND_MAX_ROWS', 1000))
+
     # Options de chargement des modèles
     AUTO_LOAD_MODELS = os.getenv('AUTO_LOAD_MODELS', 'True').lower() == 'true'
     CREATE_TABLES_ON_START = os.getenv('CREATE_TABLES_ON_START', 'True').lower() == 'true'
@@ -36,10 +99,34 @@ class BMDBConfig:
                 f"Le dossier des modèles BMDB n'existe pas: {cls.MODELS_DIR}\n"
                 "Exécutez 'bmdb generate' pour créer les modèles"
             )
-        
+
+        if cls.DB_REPLICA_WEIGHTS and len(cls.DB_REPLICA_WEIGHTS) != len(cls.DB_REPLICAS):
+            raise ValueError("DB_REPLICA_WEIGHTS doit contenir un poids par replica de DB_REPLICAS")
+
+        if cls.TENANT_DB_URL and '{tenant}' not in cls.TENANT_DB_URL:
+            raise ValueError("TENANT_DB_URL doit contenir {tenant}")
+
+        if cls.SQLITE_PROFILE not in ('production', 'default'):
+            raise ValueError("SQLITE_PROFILE doit valoir 'production' ou 'default'")
+
         return True
     
     @classmethod
     def get_models_path(cls):
         """Retourner le chemin complet des modèles"""
-        return str(cls.MODELS_DIR)
\ No newline at end of file
+        return str(cls.MODELS_DIR)
+    
+    @classmethod
+    def sqlite_pragmas(cls):
+        """PRAGMA du profil SQLite configuré (vide pour 'default')"""
+        if cls.SQLITE_PROFILE != 'production':
+            return {}
+        
+        return {
+            'busy_timeout': cls.SQLITE_BUSY_TIMEOUT,
+            'journal_mode': 'WAL',
+            'synchronous': cls.SQLITE_SYNCHRONOUS,
+            'mmap_size': cls.SQLITE_MMAP_SIZE,
+            'cache_size': cls.SQLITE_CACHE_SIZE,
+            'temp_store': cls.SQLITE_TEMP_STORE
+        }
@@ -0,0 +1,447 @@
+"""
+Exports massifs de modeles en CSV ou NDJSON (gzip), hors des workers HTTP
+Les lignes sont lues en flux (Model.stream) et ecrites par lots sur disque;
+l'etat de chaque job est un fichier JSON lisible par tous les processus.
+Un job dont le processus a disparu (worker recycle ou tue) est marque en echec
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .config import AppConfig
+from .orm import Tenant
+from .orm.queries import row_columns
+from .orm.serializers import column_encoders
+from .utils.json_provider import create_json_provider
+
+logger = logging.getLogger('bmb')
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Champs internes du job, non renvoyes par l'API
+PRIVATE_FIELDS = ('owner', 'tenant', 'file', 'pid', 'host', 'heartbeat')
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class ExportError(ValueError):
+    """Demande d'export invalide (modele, format, colonnes ou filtres)"""
+
+
+class ExportManager:
+    """
+    Jobs d'export executes par un pool de threads dedie
+
+    Fichiers dans `directory`:
+        <id>.json       etat du job (pending, running, done, failed)
+        <id>.csv.gz     donnees (suffixe .part pendant l'ecriture)
+
+    Chaque job en cours porte le pid et l'hote de son processus et un
+    battement (mis a jour a chaque lot). Si ce processus n'existe plus, ou
+    sans battement depuis `heartbeat_timeout`, le job est marque en echec
+    a la lecture de son etat et au demarrage (voir recover).
+
+    Args:
+        directory: Dossier des exports
+        max_workers: Exports simultanes
+        batch_size: Lignes lues et ecrites par lot
+        compresslevel: Niveau gzip (1 = le plus rapide)
+        ttl: Duree de conservation des exports termines (secondes, 0 = illimitee)
+        heartbeat_timeout: Silence au-dela duquel un export en cours est abandonne (secondes)
+    """
+
+    def __init__(self, directory, max_workers=2, batch_size=10000, compresslevel=1, ttl=0,
+                 heartbeat_timeout=300):
+        self.directory = Path(directory)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.compresslevel = compresslevel
+        self.ttl = ttl
+        self.heartbeat_timeout = heartbeat_timeout
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def create(self, model, fmt='csv', columns=None, filters=None, compress=True,
+               owner=None, exclude=None):
+        """
+        Valider une demande et enregistrer le job (sans l'executer)
+
+        Args:
+            model: Classe du modele
+            fmt: 'csv' ou 'ndjson'
+            columns: Colonnes exportees (defaut: toutes sauf `exclude`)
+            filters: Filtres d'egalite {champ: valeur}
+            compress: Compresser en gzip
+            owner: Identifiant du demandeur (controle d'acces)
+            exclude: Colonnes jamais exportees (defaut: SERIALIZER_EXCLUDE du modele)
+
+        Raises:
+            ExportError: Demande invalide
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ExportError(f"Le format doit etre parmi {', '.join(EXPORT_FORMATS)}")
+
+        table_columns = model.__table__.columns
+        filters = dict(filters or {})
+        unknown = [name for name in filters if name not in table_columns]
+        if unknown:
+            raise ExportError(f"Filtres inconnus pour {model.__name__}: {', '.join(unknown)}")
+
+        if exclude is None:
+            exclude = getattr(model, '_serializer_exclude', ())
+        if columns is not None:
+            forbidden = [name for name in columns if name in exclude]
+            if forbidden:
+                raise ExportError(f"Colonnes non exportables: {', '.join(forbidden)}")
+        if columns is None:
+            columns = [name for name in table_columns.keys() if name not in exclude]
+        try:
+            names = row_columns(model, columns)
+        except ValueError as e:
+            raise ExportError(str(e))
+
+        job_id = uuid.uuid4().hex
+        extension = f"{fmt}.gz" if compress else fmt
+        job = {
+            'id': job_id,
+            'model': model.__name__,
+            'format': fmt,
+            'compress': bool(compress),
+            'columns': list(names),
+            'filters': filters,
+            'status': 'pending',
+            'rows': 0,
+            'bytes': 0,
+            'error': None,
+            'created_at': _now(),
+            'started_at': None,
+            'finished_at': None,
+            'owner': owner,
+            'tenant': Tenant.current(),
+            'file': f"{job_id}.{extension}",
+            'pid': os.getpid(),
+            'host': socket.gethostname(),
+            'heartbeat': time.time(),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._save(job)
+        return job
+
+    def start(self, model, **kwargs):
+        """Creer un job et l'executer en arriere-plan (voir create)"""
+        self.purge()
+        job = self.create(model, **kwargs)
+        # Copie: le job retourne n'est pas modifie par le thread d'export
+        self._get_executor().submit(self.run, model, dict(job))
+        return job
+
+    def run(self, model, job, output=None):
+        """
+        Executer un job dans le thread courant (CLI, pool d'exports)
+
+        Args:
+            output: Chemin du fichier produit (defaut: dossier des exports)
+        """
+        target = Path(output) if output is not None else self.directory / job['file']
+        partial = target.with_name(target.name + '.part')
+        job.update(
+            status='running', started_at=_now(), pid=os.getpid(), host=socket.gethostname(), heartbeat=time.time()
+        )
+        self._save(job)
+
+        try:
+            with Tenant.scope(job['tenant']) if job['tenant'] else nullcontext():
+                with self._open(partial, job['compress']) as raw:
+                    writer = CsvWriter if job['format'] == 'csv' else NdjsonWriter
+                    self._write(model, job, writer(model, job['columns'], raw))
+            os.replace(partial, target)
+        except Exception as e:
+            logger.exception("Export %s en echec", job['id'])
+            partial.unlink(missing_ok=True)
+            job.update(status='failed', error=str(e), finished_at=_now())
+            self._save(job)
+            return job
+
+        job.update(status='done', bytes=target.stat().st_size, finished_at=_now())
+        self._save(job)
+        return job
+
+    def _write(self, model, job, writer):
+        result = 'tuple' if job['format'] == 'csv' else 'dict'
+        rows = model.stream(columns=job['columns'], result=result, batch_size=self.batch_size, **job['filters'])
+        writer.header()
+        with rows:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    self._flush(job, writer, batch)
+                    batch = []
+            if batch:
+                self._flush(job, writer, batch)
+
+    def _flush(self, job, writer, batch):
+        writer.write(batch)
+        job['rows'] += len(batch)
+        job['heartbeat'] = time.time()
+        self._save(job)
+
+    def _open(self, path, compress):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if compress:
+            return gzip.open(path, 'wb', compresslevel=self.compresslevel)
+        return open(path, 'wb')
+
+    # ------------------------------------------------------------------
+    # Etat
+    # ------------------------------------------------------------------
+
+    def _status_path(self, job_id):
+        return self.directory / f"{job_id}.json"
+
+    def _save(self, job):
+        # Ecriture atomique: les autres processus ne lisent jamais un etat partiel
+        path = self._status_path(job['id'])
+        temporary = path.with_name(path.name + '.tmp')
+        temporary.write_text(json.dumps(job))
+        os.replace(temporary, path)
+
+    def get(self, job_id):
+        """Etat d'un job (None si inconnu), job orphelin marque en echec"""
+        if not isinstance(job_id, str) or not JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            job = json.loads(self._status_path(job_id).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        if self._orphaned(job):
+            self._abandon(job)
+        return job
+
+    def _orphaned(self, job):
+        """Job en cours dont le processus a disparu ou ne donne plus signe de vie"""
+        if job['status'] not in ACTIVE_STATUSES or job.get('pid') is None:
+            return False
+        if job.get('host') == socket.gethostname() and not _process_alive(job['pid']):
+            return True
+        # En attente dans le pool d'un processus vivant: pas de battement a attendre
+        if job['status'] == 'pending' and job.get('host') == socket.gethostname():
+            return False
+        return bool(self.heartbeat_timeout) and time.time() - job['heartbeat'] > self.heartbeat_timeout
+
+    def _abandon(self, job):
+        logger.warning("Export %s abandonne: processus %s arrete", job['id'], job['pid'])
+        self.file_path(job).with_name(job['file'] + '.part').unlink(missing_ok=True)
+        job.update(status='failed', error="Export interrompu (processus arrete)", finished_at=_now())
+        self._save(job)
+
+    def recover(self):
+        """Marquer en echec les jobs orphelins (au demarrage), retourne leur nombre"""
+        if not self.directory.exists():
+            return 0
+        recovered = 0
+        for path in self.directory.glob('*.json'):
+            try:
+                job = json.loads(path.read_text())
+            except (FileNotFoundError, ValueError):
+                continue
+            if self._orphaned(job):
+                self._abandon(job)
+                recovered += 1
+        return recovered
+
+    def file_path(self, job):
+        """Fichier d'un job termine"""
+        return self.directory / job['file']
+
+    def purge(self):
+        """Supprimer les exports termines plus anciens que ttl"""
+        if not self.ttl or not self.directory.exists():
+            return 0
+        limit = time.time() - self.ttl
+        removed = 0
+        for path in self.directory.glob('*.json'):
+            job = self.get(path.stem)
+            if job is None or job['status'] not in ('done', 'failed') or path.stat().st_mtime > limit:
+                continue
+            self.file_path(job).unlink(missing_ok=True)
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _get_executor(self):
+        # Les threads ne survivent pas a un fork (workers gunicorn)
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='bmb-export'
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def shutdown(self, wait=True):
+        """Arreter le pool (attend les exports en cours si wait)"""
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=wait)
+        self._executor = None
+
+
+def public_job(job):
+    """Job sans les champs internes (reponses API)"""
+    return {key: value for key, value in job.items() if key not in PRIVATE_FIELDS}
+
+
+class CsvWriter:
+    """Lots de tuples en CSV (en-tete, dates ISO 8601)"""
+
+    def __init__(self, model, names, raw):
+        self.names = names
+        self._raw = raw
+        self._encoders = column_encoders(model, names)
+
+    def _write_rows(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        self._raw.write(buffer.getvalue().encode('utf-8'))
+
+    def header(self):
+        self._write_rows([self.names])
+
+    def write(self, rows):
+        if self._encoders:
+            rows = [self._encode(row) for row in rows]
+        self._write_rows(rows)
+
+    def _encode(self, row):
+        row = list(row)
+        for index, encoder in self._encoders:
+            if row[index] is not None:
+                row[index] = encoder(row[index])
+        return row
+
+
+class NdjsonWriter:
+    """Lots de dictionnaires en NDJSON (encodeur JSON le plus rapide disponible)"""
+
+    def __init__(self, model, names, raw):
+        self._raw = raw
+        self._dumps = create_json_provider(AppConfig.JSON_PROVIDER).dumps_bytes
+
+    def header(self):
+        pass
+
+    def write(self, rows):
+        dumps = self._dumps
+        self._raw.write(b''.join([dumps(row) + b'\n' for row in rows]))
+
+
+def request_export(data, owner, models):
+    """
+    Lancer un export depuis le corps d'une requete API
+
+    Args:
+        data: {"model", "format", "columns", "filters", "compress"}
+        owner: Identifiant du demandeur
+        models: Modeles charges (load_models)
+
+    Raises:
+        ExportError: Modele non exportable ou demande invalide
+    """
+    name = data.get('model')
+    if name not in AppConfig.EXPORT_MODELS or name not in models:
+        raise ExportError(f"Modele non exportable: {name}")
+
+    columns = data.get('columns')
+    filters = data.get('filters')
+    if columns is not None and not isinstance(columns, list):
+        raise ExportError("'columns' doit etre une liste")
+    if filters is not None and not isinstance(filters, dict):
+        raise ExportError("'filters' doit etre un objet")
+
+    return get_export_manager().start(
+        models[name],
+        fmt=data.get('format', 'csv'),
+        columns=columns,
+        filters=filters,
+        compress=bool(data.get('compress', True)),
+        owner=owner
+    )
+
+
+def owned_job(job_id, owner):
+    """Job du demandeur dans le tenant courant (None sinon)"""
+    job = get_export_manager().get(job_id)
+    if job is None or job['owner'] != owner or job['tenant'] != Tenant.current():
+        return None
+    return job
+
+
+def download_name(job):
+    """Nom du fichier telecharge, ex: user-<id>.csv.gz"""
+    return f"{job['model'].lower()}-{job['file']}"
+
+
+def download_mimetype(job):
+    return 'application/gzip' if job['compress'] else EXPORT_MIMETYPES[job['format']]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_export_manager():
+    """Gestionnaire d'exports de l'application (cree a la demande depuis AppConfig)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ExportManager(
+                AppConfig.EXPORT_DIR,
+                max_workers=AppConfig.EXPORT_WORKERS,
+                batch_size=AppConfig.EXPORT_BATCH_SIZE,
+                compresslevel=AppConfig.EXPORT_GZIP_LEVEL,
+                ttl=AppConfig.EXPORT_TTL_HOURS * 3600,
+                heartbeat_timeout=AppConfig.EXPORT_HEARTBEAT_TIMEOUT
+            )
+            # Jobs laisses en cours par un worker precedent
+            _manager.recover()
+        return _manager
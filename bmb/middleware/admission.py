@@ -0,0 +1,233 @@
+"""
+Controle d'admission et delestage de charge
+Limite les requetes simultanees par worker et par classe de route
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from flask import g, request
+
+from ..config import AppConfig
+from ..utils import error_response
+
+
+class AdmissionGate:
+    """
+    Limiteur de concurrence avec file d'attente prioritaire et delai maximal
+
+    Les requetes prioritaires passent devant les requetes normales dans la
+    file et disposent d'une reserve de places (priority_reserve) que les
+    requetes normales ne peuvent pas consommer.
+    """
+
+    def __init__(self, name, limit, max_queue=128, priority_reserve=0):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.priority_reserve = priority_reserve
+
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._counter = itertools.count()
+
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timeouts = 0
+
+    def _capacity(self, priority):
+        return self.limit + (self.priority_reserve if priority > 0 else 0)
+
+    def _can_enter(self, entry, priority):
+        if self.in_flight >= self._capacity(priority):
+            return False
+        return not self._waiters or self._waiters[0] is entry
+
+    def acquire(self, priority=0, timeout=0.0):
+        """
+        Reserver une place
+
+        Args:
+            priority: Priorite de la requete (plus grand = plus prioritaire)
+            timeout: Temps d'attente maximal dans la file (secondes)
+
+        Returns:
+            bool: True si la requete est admise, False si elle est delestee
+        """
+        with self._cond:
+            if not self._waiters and self.in_flight < self._capacity(priority):
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+
+            if len(self._waiters) >= self.max_queue or timeout <= 0:
+                self.shed += 1
+                return False
+
+            entry = [-priority, next(self._counter)]
+            heapq.heappush(self._waiters, entry)
+            deadline = time.monotonic() + timeout
+
+            try:
+                while not self._can_enter(entry, priority):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        self.shed += 1
+                        return False
+                    self._cond.wait(remaining)
+
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            finally:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def release(self):
+        """Liberer une place et reveiller la file d'attente"""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Metriques du limiteur"""
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'queue_depth': len(self._waiters),
+                'admitted': self.admitted,
+                'shed': self.shed,
+                'timeouts': self.timeouts
+            }
+
+
+class AdmissionController:
+    """
+    Controle d'admission a deux niveaux: worker (global) puis classe de route
+
+    La classe de route correspond au nom du blueprint (auth, users, health...).
+    """
+
+    def __init__(self, max_concurrent=64, route_limits=None, queue_timeout=0.5,
+                 max_queue=128, priority_paths=None, priority_reserve=4):
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.priority_reserve = priority_reserve
+        self.priority_paths = set(priority_paths or [])
+
+        self.worker_gate = AdmissionGate('worker', max_concurrent, max_queue, priority_reserve)
+        self.route_gates = {
+            name: AdmissionGate(name, limit, max_queue, priority_reserve)
+            for name, limit in (route_limits or {}).items()
+        }
+
+    @classmethod
+    def from_config(cls, config=AppConfig):
+        """Construire le controleur depuis la configuration"""
+        return cls(
+            max_concurrent=config.ADMISSION_MAX_CONCURRENT,
+            route_limits=config.ADMISSION_ROUTE_LIMITS,
+            queue_timeout=config.ADMISSION_QUEUE_TIMEOUT,
+            max_queue=config.ADMISSION_MAX_QUEUE,
+            priority_paths=config.ADMISSION_PRIORITY_PATHS,
+            priority_reserve=config.ADMISSION_PRIORITY_RESERVE
+        )
+
+    def priority_for(self, path):
+        """Priorite d'un chemin (1 pour les chemins prioritaires, 0 sinon)"""
+        return 1 if path.rstrip('/') in self.priority_paths else 0
+
+    def admit(self, route_class, priority=0):
+        """
+        Admettre une requete
+
+        Returns:
+            list: Les limiteurs reserves (a liberer), ou None si delestee
+        """
+        timeout = self.queue_timeout
+        acquired = []
+
+        # Classe de route d'abord: une route saturee ne doit pas occuper
+        # des places globales pendant qu'elle attend
+        gates = [self.route_gates.get(route_class), self.worker_gate]
+        for gate in gates:
+            if gate is None:
+                continue
+            start = time.monotonic()
+            if not gate.acquire(priority, timeout):
+                self.release(acquired)
+                return None
+            acquired.append(gate)
+            timeout = max(0.0, timeout - (time.monotonic() - start))
+
+        return acquired
+
+    @staticmethod
+    def release(gates):
+        """Liberer les limiteurs reserves"""
+        for gate in reversed(gates or []):
+            gate.release()
+
+    def stats(self):
+        """Metriques de toutes les files"""
+        return {
+            'worker': self.worker_gate.stats(),
+            'routes': {name: gate.stats() for name, gate in self.route_gates.items()}
+        }
+
+    def prometheus(self):
+        """Metriques au format texte Prometheus"""
+        lines = []
+        gates = [('worker', self.worker_gate)] + [
+            (f'route:{name}', gate) for name, gate in self.route_gates.items()
+        ]
+        for metric in ('in_flight', 'queue_depth', 'admitted', 'shed', 'timeouts'):
+            lines.append(f'# TYPE bmb_admission_{metric} '
+                         f'{"gauge" if metric in ("in_flight", "queue_depth") else "counter"}')
+            for scope, gate in gates:
+                value = gate.stats()[metric]
+                lines.append(f'bmb_admission_{metric}{{scope="{scope}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def setup_admission_control(app, controller=None):
+    """
+    Activer le controle d'admission sur l'application
+
+    Les requetes excedentaires attendent au plus ADMISSION_QUEUE_TIMEOUT
+    secondes puis sont rejetees avec 503 et un en-tete Retry-After.
+    """
+    if controller is None:
+        controller = AdmissionController.from_config()
+
+    app.extensions['bmb_admission'] = controller
+
+    @app.before_request
+    def admit_request():
+        """Reserver une place pour la requete"""
+        priority = controller.priority_for(request.path)
+        gates = controller.admit(request.blueprint, priority)
+
+        if gates is None:
+            response, status = error_response(
+                "Service surcharge, veuillez reessayer plus tard", 503
+            )
+            response.headers['Retry-After'] = str(AppConfig.ADMISSION_RETRY_AFTER)
+            return response, status
+
+        g._admission_gates = gates
+        return None
+
+    @app.teardown_request
+    def release_request(exc=None):
+        """Liberer la place a la fin de la requete"""
+        controller.release(g.pop('_admission_gates', None))
+
+    return controller
@@ -0,0 +1,72 @@
+"""
+Coherence lecture-apres-ecriture entre requetes HTTP
+Apres une ecriture, les requetes suivantes du meme client lisent sur le
+primaire jusqu'a l'echeance transmise par cookie (ou en-tete), signee
+"""
+
+import hashlib
+import hmac
+import time
+
+from flask import request
+
+from ..config import AppConfig, BMDBConfig
+from ..orm import ReadYourWrites
+
+PRIMARY_UNTIL_HEADER = 'X-BMB-Primary-Until'
+
+
+def _signature(until):
+    return hmac.new(AppConfig.SECRET_KEY.encode('utf-8'), until.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def sign_primary_until(until):
+    """Echeance signee (SECRET_KEY) transmise au client: <echeance>:<hmac>"""
+    value = f"{until:.3f}"
+    return f"{value}:{_signature(value)}"
+
+
+def _client_primary_until():
+    """
+    Echeance transmise par le client (cookie, sinon en-tete)
+
+    Seules les echeances signees par le serveur sont retenues, et seulement
+    jusqu'a maintenant + READ_YOUR_WRITES_WINDOW: un client ne peut ni
+    forger ni prolonger son passage sur le primaire.
+    """
+    value = request.cookies.get(BMDBConfig.READ_YOUR_WRITES_COOKIE) or request.headers.get(PRIMARY_UNTIL_HEADER)
+    until, _, signature = (value or '').partition(':')
+    if not signature or not hmac.compare_digest(signature, _signature(until)):
+        return 0.0
+    try:
+        until = float(until)
+    except ValueError:
+        return 0.0
+    now = time.time()
+    if not now < until <= now + ReadYourWrites.window:
+        return 0.0
+    return until
+
+
+def setup_read_your_writes(app):
+    """Activer la coherence lecture-apres-ecriture (replicas en lecture)"""
+
+    @app.before_request
+    def start_read_your_writes():
+        """Reprendre la fenetre de coherence du client"""
+        ReadYourWrites.begin(_client_primary_until())
+
+    @app.after_request
+    def propagate_read_your_writes(response):
+        """Transmettre l'echeance au client apres une ecriture"""
+        if ReadYourWrites.wrote():
+            until = sign_primary_until(ReadYourWrites.primary_until())
+            response.set_cookie(
+                BMDBConfig.READ_YOUR_WRITES_COOKIE,
+                until,
+                max_age=max(1, int(BMDBConfig.READ_YOUR_WRITES_WINDOW + 1)),
+                httponly=True,
+                samesite='Lax'
+            )
+            response.headers[PRIMARY_UNTIL_HEADER] = until
+        return response
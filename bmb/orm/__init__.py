@@ -0,0 +1,76 @@
+"""
+Extensions ORM BMB pour les modeles BMDB
+"""
+
+from .deadlines import Deadline, DeadlineExceeded, install_deadline_hooks
+from .aio import AsyncModelMixin, async_url
+from .replicas import ReplicaSet, RoutingSession, ReadYourWrites
+from .sharding import ShardMap, ShardedModelMixin
+from .tenancy import Tenant, TenantRegistry, InvalidTenant, UnknownTenant
+from .sqlite import SQLiteProfile
+from .writer import WriteCoordinator
+from .write_behind import WriteBehindBuffer, WriteBehindMixin
+from .updates import UpdateMixin
+from .upserts import UpsertMixin
+from .queries import QueryMixin
+from .serializers import Serializer, SerializerMixin, install_serializers
+from .changes import TableVersions
+
+# Mixins dont les methodes sont ajoutees aux modeles charges par ModelsLoader
+MODEL_EXTENSIONS = [
+    AsyncModelMixin,
+    QueryMixin,
+    SerializerMixin,
+    WriteBehindMixin,
+    UpdateMixin,
+    UpsertMixin
+]
+
+
+def install_model_extensions(models):
+    """
+    Ajouter les methodes des extensions BMB aux modeles BMDB
+    
+    Les modeles sont generes par BMDB (ne pas les modifier a la main):
+    les extensions sont donc greffees au chargement.
+    
+    Args:
+        models: Iterable de classes de modeles
+    """
+    for model in models:
+        for mixin in MODEL_EXTENSIONS:
+            for name, member in vars(mixin).items():
+                if not name.startswith('__'):
+                    setattr(model, name, member)
+    return models
+
+
+__all__ = [
+    'Deadline',
+    'DeadlineExceeded',
+    'install_deadline_hooks',
+    'AsyncModelMixin',
+    'async_url',
+    'ReplicaSet',
+    'RoutingSession',
+    'ReadYourWrites',
+    'ShardMap',
+    'ShardedModelMixin',
+    'Tenant',
+    'TenantRegistry',
+    'InvalidTenant',
+    'UnknownTenant',
+    'SQLiteProfile',
+    'WriteCoordinator',
+    'WriteBehindBuffer',
+    'WriteBehindMixin',
+    'UpdateMixin',
+    'UpsertMixin',
+    'QueryMixin',
+    'Serializer',
+    'SerializerMixin',
+    'install_serializers',
+    'TableVersions',
+    'MODEL_EXTENSIONS',
+    'install_model_extensions'
+]
\ No newline at end of file
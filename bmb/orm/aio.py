@@ -0,0 +1,265 @@
+"""
+API asynchrone des modeles BMDB (SQLAlchemy asyncio)
+Equivalents awaitables de get/all/filter/first/count/save/delete
+"""
+
+import asyncio
+
+from .deadlines import Deadline
+from .queries import (
+    STREAM_BATCH_SIZE, check_embed, count_statement, embed_rows, entities_statement,
+    exists_statement, select_statement, row_columns, row_shaper, rows_statement, shape_rows
+)
+from .updates import check_columns, update_statement
+from .upserts import insert_or_ignore_statement, was_inserted
+
+
+# Pilotes asyncio par dialecte
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def async_url(url):
+    """
+    Convertir une URL de connexion synchrone en URL asyncio
+
+    Exemple: sqlite:///./database.db -> sqlite+aiosqlite:///./database.db
+    """
+    url_string = url if isinstance(url, str) else url.render_as_string(hide_password=False)
+    scheme, sep, rest = url_string.partition('://')
+    dialect = scheme.split('+')[0]
+
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"Pas de pilote asyncio connu pour le dialecte '{dialect}'")
+
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+
+async def bounded(awaitable):
+    """Executer une coroutine dans la limite de l'echeance de la requete"""
+    remaining = Deadline.remaining()
+    if remaining is None:
+        return await awaitable
+    if remaining <= 0:
+        Deadline.fail()
+    try:
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError as e:
+        Deadline.fail(e)
+
+
+_EXHAUSTED = object()
+
+
+class AsyncRowStream:
+    """
+    Iterateur asynchrone de lignes sur un resultat ouvert (voir RowStream)
+
+    Curseur et session sont liberes a l'epuisement, a la premiere erreur
+    ou a l'appel de aclose() (client deconnecte).
+    """
+
+    def __init__(self, model, names, cursor, session, result='dict'):
+        self._partitions = cursor.partitions().__aiter__()
+        self._cursor = cursor
+        self._session = session
+        self._model = model
+        self._names = names
+        self._result = result
+        self._batch = iter(())
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        row = next(self._batch, _EXHAUSTED)
+        while row is _EXHAUSTED:
+            if self.closed:
+                raise StopAsyncIteration
+            try:
+                partition = await self._partitions.__anext__()
+            except BaseException:
+                await self.aclose()
+                raise
+            self._batch = iter(shape_rows(self._model, self._names, partition, self._result))
+            row = next(self._batch, _EXHAUSTED)
+        return row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Liberer le curseur puis la session"""
+        if self.closed:
+            return
+        self.closed = True
+        self._batch = iter(())
+        for resource in (self._cursor, self._session):
+            try:
+                await resource.close()
+            except Exception:
+                pass
+
+
+def _async_session():
+    from ..models_loader import ModelsLoader
+    return ModelsLoader.get_async_session()()
+
+
+class AsyncModelMixin:
+    """Methodes asynchrones ajoutees aux modeles BMDB par ModelsLoader"""
+
+    @classmethod
+    async def aget(cls, id):
+        """Recuperer un enregistrement par ID"""
+        async def query():
+            async with _async_session() as session:
+                return await session.get(cls, id)
+        return await bounded(query())
+
+    @classmethod
+    async def aall(cls, only=None, defer=None):
+        """Recuperer tous les enregistrements"""
+        return await cls.afilter(only=only, defer=defer)
+
+    @classmethod
+    async def afilter(cls, only=None, defer=None, **kwargs):
+        """Filtrer les enregistrements par valeur de champs (voir filter pour only/defer)"""
+        async def query():
+            async with _async_session() as session:
+                result = await session.scalars(select_statement(cls, kwargs, only, defer))
+                return result.all()
+        return await bounded(query())
+
+    @classmethod
+    async def afirst(cls, only=None, defer=None, **kwargs):
+        """Premier enregistrement correspondant aux filtres"""
+        async def query():
+            async with _async_session() as session:
+                return (await session.scalars(select_statement(cls, kwargs, only, defer).limit(1))).first()
+        return await bounded(query())
+
+    @classmethod
+    async def arows(cls, columns=None, defer=None, limit=None, offset=None, order_by='id',
+                    desc=False, result='dict', include=None, **kwargs):
+        """Lignes brutes sans objets ORM, ou avec relations incluses (voir rows)"""
+        names = row_columns(cls, columns, defer)
+        if include:
+            check_embed(result)
+            statement = entities_statement(cls, kwargs, names, include, limit, offset, order_by, desc)
+
+            async def query():
+                async with _async_session() as session:
+                    instances = (await session.scalars(statement)).all()
+                    return embed_rows(cls, names, include, instances)
+            return await bounded(query())
+
+        statement = rows_statement(cls, kwargs, names, limit, offset, order_by, desc)
+
+        async def query():
+            async with _async_session() as session:
+                return shape_rows(cls, names, (await session.execute(statement)).all(), result)
+        return await bounded(query())
+
+    @classmethod
+    async def astream(cls, columns=None, defer=None, order_by='id', desc=False, result='dict',
+                      batch_size=STREAM_BATCH_SIZE, **kwargs):
+        """
+        Lignes brutes en flux (voir stream)
+
+        Usage:
+            async with await User.astream(defer=['password']) as rows:
+                async for row in rows:
+                    ...
+        """
+        names = row_columns(cls, columns, defer)
+        row_shaper(cls, names, result)
+        statement = rows_statement(cls, kwargs, names, order_by=order_by, desc=desc)
+        session = _async_session()
+        try:
+            cursor = await bounded(session.stream(statement, execution_options={'yield_per': batch_size}))
+        except BaseException:
+            await session.close()
+            raise
+        return AsyncRowStream(cls, names, cursor, session, result)
+
+    @classmethod
+    async def acount(cls, limit=None, **kwargs):
+        """Compter les enregistrements correspondant aux filtres (bornes a limit)"""
+        async def query():
+            async with _async_session() as session:
+                return await session.scalar(count_statement(cls, kwargs, limit))
+        return await bounded(query())
+
+    @classmethod
+    async def aexists(cls, **kwargs):
+        """Tester l'existence d'un enregistrement sans le charger"""
+        async def query():
+            async with _async_session() as session:
+                return bool(await session.scalar(exists_statement(cls, kwargs)))
+        return await bounded(query())
+
+    @classmethod
+    async def aupdate(cls, id, **fields):
+        """Mettre a jour des champs sans charger l'enregistrement (voir update)"""
+        check_columns(cls, fields)
+        if not fields:
+            return await cls.aget(id)
+
+        async def query():
+            async with _async_session() as session:
+                statement = update_statement(cls, [cls.id == id], fields)
+                if session.bind.dialect.update_returning:
+                    instance = (await session.scalars(statement.returning(cls))).first()
+                elif (await session.execute(statement)).rowcount == 0:
+                    instance = None
+                else:
+                    instance = await session.get(cls, id)
+                await session.commit()
+                return instance
+        return await bounded(query())
+
+    @classmethod
+    async def ainsert_or_ignore(cls, conflict_cols=None, **values):
+        """Inserer sauf conflit d'unicite, None en cas de conflit (voir insert_or_ignore)"""
+        check_columns(cls, {name: value for name, value in values.items() if name != 'id'})
+
+        async def query():
+            async with _async_session() as session:
+                dialect = session.bind.dialect
+                statement = insert_or_ignore_statement(dialect, cls, values, conflict_cols)
+                if dialect.insert_returning:
+                    instance = (await session.scalars(statement.returning(cls))).first()
+                else:
+                    result = await session.execute(statement)
+                    inserted = was_inserted(dialect, result)
+                    instance = await session.get(cls, result.inserted_primary_key[0]) if inserted else None
+                await session.commit()
+                return instance
+        return await bounded(query())
+
+    async def asave(self):
+        """Creer ou mettre a jour cette instance"""
+        async def query():
+            async with _async_session() as session:
+                session.add(self)
+                await session.commit()
+                await session.refresh(self)
+                return self
+        return await bounded(query())
+
+    async def adelete(self):
+        """Supprimer cette instance"""
+        async def query():
+            async with _async_session() as session:
+                await session.delete(self)
+                await session.commit()
+                return True
+        return await bounded(query())
@@ -0,0 +1,178 @@
+"""
+Delais maximaux (deadlines) propages aux requetes SQL
+Chaque requete HTTP dispose d'un budget de temps que les instructions SQL
+ne peuvent pas depasser (progress handler SQLite, statement_timeout PostgreSQL)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+
+class _Budget:
+    """
+    Echeance absolue (time.monotonic) de la requete en cours
+
+    Objet mutable: un contexte copie (executor asyncio) partage le meme
+    budget et peut signaler son depassement a la requete d'origine.
+    """
+
+    __slots__ = ('expires_at', 'exceeded')
+
+    def __init__(self, seconds=None):
+        self.expires_at = time.monotonic() + seconds if seconds and seconds > 0 else None
+        self.exceeded = False
+
+
+_budget = ContextVar('bmb_deadline', default=None)
+
+# Nombre d'instructions SQLite entre deux verifications de l'echeance
+SQLITE_PROGRESS_STEPS = 1000
+
+
+class DeadlineExceeded(Exception):
+    """Le budget de temps de la requete est epuise"""
+
+
+class Deadline:
+    """Gestion de l'echeance de la requete courante"""
+
+    @staticmethod
+    def set(seconds):
+        """
+        Definir l'echeance de la requete courante
+
+        Args:
+            seconds: Budget en secondes (None ou <= 0 pour aucune limite)
+        """
+        _budget.set(_Budget(seconds))
+
+    @staticmethod
+    def clear():
+        """Supprimer l'echeance de la requete courante"""
+        _budget.set(None)
+
+    @staticmethod
+    def remaining():
+        """Temps restant en secondes (None si aucune echeance)"""
+        budget = _budget.get()
+        if budget is None or budget.expires_at is None:
+            return None
+        return budget.expires_at - time.monotonic()
+
+    @staticmethod
+    def exceeded():
+        """True si une instruction a ete interrompue par l'echeance"""
+        budget = _budget.get()
+        return budget is not None and budget.exceeded
+
+    @staticmethod
+    def fail(cause=None):
+        """Signaler le depassement de l'echeance et lever DeadlineExceeded"""
+        budget = _budget.get()
+        if budget is not None:
+            budget.exceeded = True
+        raise DeadlineExceeded("Delai de la requete depasse") from cause
+
+    @staticmethod
+    def check():
+        """Lever DeadlineExceeded si l'echeance est depassee"""
+        remaining = Deadline.remaining()
+        if remaining is not None and remaining <= 0:
+            Deadline.fail()
+
+    @staticmethod
+    @contextmanager
+    def scope(seconds):
+        """
+        Context manager pour borner un bloc de code (taches de fond, CLI)
+
+        Usage:
+            with Deadline.scope(5):
+                users = User.all()
+        """
+        token = _budget.set(_Budget(seconds))
+        try:
+            yield
+        finally:
+            _budget.reset(token)
+
+
+def _is_timeout_error(dialect_name, error):
+    """Reconnaitre l'erreur produite par l'interruption d'une instruction"""
+    if dialect_name == 'sqlite':
+        return 'interrupted' in str(error).lower()
+    if dialect_name == 'postgresql':
+        return getattr(error, 'pgcode', None) == '57014'  # query_canceled
+    return False
+
+
+def install_deadline_hooks(engine):
+    """
+    Propager l'echeance de la requete courante aux instructions SQL de l'engine
+
+    - SQLite: progress handler qui interrompt l'instruction a l'echeance
+    - PostgreSQL: SET LOCAL statement_timeout avant chaque instruction
+    - Autres dialectes: verification de l'echeance avant execution
+
+    Args:
+        engine: Engine SQLAlchemy a instrumenter
+    """
+    if engine is None or event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return engine
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+    return engine
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    remaining = Deadline.remaining()
+    dialect_name = conn.dialect.name
+
+    dbapi_connection = conn.connection.dbapi_connection
+    # Les connexions asyncio (aiosqlite) sont bornees par asyncio.wait_for
+    if dialect_name == 'sqlite' and hasattr(dbapi_connection, 'set_progress_handler'):
+        if remaining is None:
+            dbapi_connection.set_progress_handler(None, 0)
+            return
+        Deadline.check()
+        deadline = _budget.get().expires_at
+        dbapi_connection.set_progress_handler(
+            lambda: 1 if time.monotonic() >= deadline else 0,
+            SQLITE_PROGRESS_STEPS
+        )
+        return
+
+    if remaining is None:
+        return
+
+    Deadline.check()
+
+    if dialect_name == 'postgresql':
+        # SET LOCAL est annule a la fin de la transaction: rien ne fuit
+        # vers les autres utilisateurs de la connexion du pool
+        cursor.execute(f"SET LOCAL statement_timeout = {max(1, int(remaining * 1000))}")
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    dbapi_connection = conn.connection.dbapi_connection
+    if Deadline.remaining() is not None and hasattr(dbapi_connection, 'set_progress_handler'):
+        dbapi_connection.set_progress_handler(None, 0)
+
+
+def _handle_error(context):
+    dialect = context.dialect
+    if context.connection is not None and dialect.name == 'sqlite':
+        try:
+            context.connection.connection.dbapi_connection.set_progress_handler(None, 0)
+        except Exception:
+            pass
+
+    budget = _budget.get()
+    if budget is not None and budget.expires_at is not None \
+            and _is_timeout_error(dialect.name, context.original_exception):
+        Deadline.fail(context.original_exception)
@@ -0,0 +1,93 @@
+"""
+Profil SQLite de production
+PRAGMA appliques a chaque nouvelle connexion (WAL, busy_timeout, mmap...)
+et checkpoint periodique du journal WAL
+"""
+
+import threading
+import time
+import weakref
+
+from sqlalchemy import event
+
+# Ordre d'application: busy_timeout d'abord (le passage en WAL prend un verrou)
+PRAGMA_ORDER = ('busy_timeout', 'journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store')
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+_installed = weakref.WeakSet()
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Executer les PRAGMA sur une connexion DBAPI"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name in PRAGMA_ORDER:
+            if pragmas.get(name) is not None:
+                cursor.execute(f"PRAGMA {name}={pragmas[name]}")
+    finally:
+        cursor.close()
+
+
+class SQLiteProfile:
+    """
+    Reglages SQLite appliques a un engine
+
+    Args:
+        pragmas: dict PRAGMA -> valeur (voir PRAGMA_ORDER)
+        checkpoint_interval: secondes entre deux wal_checkpoint (0 = jamais)
+        checkpoint_mode: PASSIVE (n'attend pas les lecteurs), FULL, RESTART, TRUNCATE
+    """
+
+    def __init__(self, pragmas, checkpoint_interval=300, checkpoint_mode='PASSIVE'):
+        if checkpoint_mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Mode de checkpoint inconnu: {checkpoint_mode}")
+
+        self.pragmas = dict(pragmas)
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_mode = checkpoint_mode
+        self._last_checkpoint = time.monotonic()
+        self._lock = threading.Lock()
+        self.checkpoints = 0
+
+    def install(self, engine):
+        """Installer le profil sur un engine SQLite (sans effet sur les autres dialectes)"""
+        if engine.dialect.name != 'sqlite' or engine in _installed:
+            return engine
+
+        event.listen(engine, 'connect', self.on_connect)
+        if self.checkpoint_interval and self.pragmas.get('journal_mode', '').upper() == 'WAL':
+            event.listen(engine, 'checkin', self.on_checkin)
+
+        _installed.add(engine)
+        return engine
+
+    def on_connect(self, dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, self.pragmas)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        # Checkpoint au retour d'une connexion dans le pool, au plus
+        # une fois par intervalle et par processus: pas de thread dedie
+        if dbapi_connection is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_checkpoint < self.checkpoint_interval:
+                return
+            self._last_checkpoint = now
+
+        self.checkpoint(dbapi_connection)
+
+    def checkpoint(self, dbapi_connection):
+        """Reporter le journal WAL dans la base"""
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(f"PRAGMA wal_checkpoint({self.checkpoint_mode})")
+            finally:
+                cursor.close()
+            self.checkpoints += 1
+        except Exception:
+            # Base occupee: le prochain intervalle reessaiera
+            pass
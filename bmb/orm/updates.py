@@ -0,0 +1,123 @@
+"""
+Mises a jour partielles sans chargement prealable de la ligne
+Une seule instruction UPDATE ... WHERE (avec RETURNING si le dialecte le permet)
+"""
+
+from sqlalchemy import update
+
+
+def check_columns(model, fields):
+    """Refuser les champs inconnus et la cle primaire"""
+    columns = model.__table__.columns
+    unknown = [name for name in fields if name not in columns or name == 'id']
+    if unknown:
+        raise ValueError(f"Champs inconnus pour {model.__name__}: {', '.join(unknown)}")
+
+
+def where_criteria(model, filters):
+    """Criteres d'egalite stricts: un filtre inconnu ne doit pas elargir l'UPDATE"""
+    unknown = [name for name in filters if name not in model.__table__.columns]
+    if unknown:
+        raise ValueError(f"Filtres inconnus pour {model.__name__}: {', '.join(unknown)}")
+    return [getattr(model, name) == value for name, value in filters.items()]
+
+
+def update_statement(model, criteria, fields):
+    """UPDATE ORM sans synchronisation de la session (session dediee)"""
+    return (
+        update(model)
+        .where(*criteria)
+        .values(**fields)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def update_by_id(session, model, id, fields):
+    """
+    Mettre a jour une ligne et la retourner
+
+    RETURNING: une seule instruction. Sinon UPDATE puis SELECT.
+    """
+    statement = update_statement(model, [model.id == id], fields)
+    if session.connection().dialect.update_returning:
+        return session.scalars(statement.returning(model)).first()
+    if session.execute(statement).rowcount == 0:
+        return None
+    return session.get(model, id)
+
+
+def _session_factory():
+    from ..models_loader import ModelsLoader
+    return ModelsLoader.get_session()
+
+
+class UpdateMixin:
+    """Mises a jour partielles ajoutees aux modeles BMDB par ModelsLoader"""
+
+    @classmethod
+    def _update_sessions(cls, filters, fields):
+        """Fabriques de sessions concernees (shard proprietaire ou tous les shards)"""
+        shards = getattr(cls, '_shard_map', None)
+        if shards is None:
+            return [_session_factory()]
+
+        key = shards.key_for(cls)
+        if key != 'id' and key in fields:
+            raise ValueError(f"La cle de sharding '{key}' ne peut pas etre modifiee")
+        shard = cls._target_shard(filters)
+        if shard is not None:
+            return [shards.sessions[shard]]
+        return shards.sessions
+
+    @classmethod
+    def update(cls, id, **fields):
+        """
+        Mettre a jour des champs d'un enregistrement sans le charger
+
+        Usage:
+            user = User.update(user_id, name='Alice')
+
+        Returns:
+            Instance mise a jour, ou None si l'id n'existe pas
+        """
+        check_columns(cls, fields)
+        if not fields:
+            return cls.get(id)
+
+        factory, = cls._update_sessions({'id': id}, fields)
+        with factory(expire_on_commit=False) as session:
+            try:
+                instance = update_by_id(session, cls, id, fields)
+                session.commit()
+                return instance
+            except Exception:
+                session.rollback()
+                raise
+
+    @classmethod
+    def update_where(cls, filters, **fields):
+        """
+        Mettre a jour tous les enregistrements correspondant aux filtres
+
+        Usage:
+            User.update_where({'age': 17}, age=18)
+
+        Returns:
+            int: Nombre de lignes modifiees
+        """
+        check_columns(cls, fields)
+        criteria = where_criteria(cls, filters)
+        if not fields:
+            return 0
+
+        statement = update_statement(cls, criteria, fields)
+        updated = 0
+        for factory in cls._update_sessions(filters, fields):
+            with factory() as session:
+                try:
+                    updated += session.execute(statement).rowcount
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+        return updated
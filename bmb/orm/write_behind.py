@@ -0,0 +1,249 @@
+"""
+Ecriture differee (write-behind) pour les mises a jour frequentes et
+tolerantes a la perte (derniere connexion, compteurs...)
+Les mises a jour sont fusionnees par ligne en memoire puis ecrites par lots
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from sqlalchemy import bindparam, update
+
+from .changes import TableVersions
+from .tenancy import Tenant
+from .updates import check_columns
+
+logger = logging.getLogger('bmb')
+
+
+class _PendingRow:
+    __slots__ = ('values', 'increments')
+
+    def __init__(self):
+        self.values = {}
+        self.increments = {}
+
+
+class WriteBehindBuffer:
+    """
+    Tampon de mises a jour differees
+
+    - defer_update: la derniere valeur de chaque champ l'emporte
+    - defer_increment: les increments d'un meme champ s'additionnent
+    - ecriture toutes les `flush_interval` secondes ou des `max_rows` lignes
+      en attente, et a l'arret du processus
+    - une instruction UPDATE (executemany) par modele et jeu de colonnes
+
+    Args:
+        get_session: Callable retournant la fabrique de sessions (ModelsLoader.get_session)
+        flush_interval: Intervalle d'ecriture en secondes
+        max_rows: Nombre de lignes en attente declenchant une ecriture
+        unversioned_columns: Colonnes de suivi (ex: last_seen) dont l'ecriture
+            seule n'invalide pas les reponses en cache
+    """
+
+    def __init__(self, get_session, flush_interval=0.5, max_rows=1000, unversioned_columns=()):
+        self.get_session = get_session
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.unversioned_columns = frozenset(unversioned_columns)
+
+        self._pending = {}  # (tenant, modele, id) -> _PendingRow
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._flushes = 0
+        self._rows_written = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    def _row(self, model, id):
+        key = (Tenant.current(), model, id)
+        row = self._pending.get(key)
+        if row is None:
+            row = self._pending[key] = _PendingRow()
+        else:
+            self._coalesced += 1
+        return row
+
+    def update(self, model, id, fields):
+        """Mettre en attente une mise a jour de champs"""
+        check_columns(model, fields)
+        self._ensure_started()
+        with self._lock:
+            row = self._row(model, id)
+            for name, value in fields.items():
+                row.values[name] = value
+                # Une valeur absolue remplace les increments precedents
+                row.increments.pop(name, None)
+            pending = len(self._pending)
+        self._maybe_wakeup(pending)
+
+    def increment(self, model, id, deltas):
+        """Mettre en attente des increments de champs numeriques"""
+        check_columns(model, deltas)
+        self._ensure_started()
+        with self._lock:
+            row = self._row(model, id)
+            for name, delta in deltas.items():
+                if name in row.values:
+                    row.values[name] += delta
+                else:
+                    row.increments[name] = row.increments.get(name, 0) + delta
+            pending = len(self._pending)
+        self._maybe_wakeup(pending)
+
+    def _maybe_wakeup(self, pending):
+        if pending >= self.max_rows:
+            self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Ecriture
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """Ecrire toutes les mises a jour en attente, retourne le nombre de lignes"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            # Regrouper par tenant, modele et forme de l'instruction
+            groups = defaultdict(list)
+            for (tenant, model, id), row in pending.items():
+                shape = (tuple(sorted(row.values)), tuple(sorted(row.increments)))
+                groups[(tenant, model, shape)].append((id, row))
+
+            written = 0
+            for (tenant, model, shape), rows in groups.items():
+                try:
+                    written += self._write_group(tenant, model, shape, rows)
+                    # Ecriture hors ORM (connection.execute): invalider les caches
+                    # de reponses explicitement (voir changes.TableVersions),
+                    # sauf pour les seules colonnes de suivi
+                    if not set(shape[0] + shape[1]) <= self.unversioned_columns:
+                        TableVersions.bump((model.__table__.name,))
+                except Exception as e:
+                    # Ecritures tolerantes a la perte: on journalise et on continue
+                    self._errors += 1
+                    logger.error(f"❌ Ecriture differee de {model.__name__} impossible: {e}")
+
+            self._flushes += 1
+            self._rows_written += written
+            return written
+
+    def _write_group(self, tenant, model, shape, rows):
+        value_names, increment_names = shape
+        table = model.__table__
+
+        values = {name: bindparam(f'v_{name}') for name in value_names}
+        values.update({name: table.c[name] + bindparam(f'i_{name}') for name in increment_names})
+        statement = update(table).where(table.c.id == bindparam('row_id')).values(values)
+
+        def params(id, row):
+            data = {'row_id': id}
+            data.update({f'v_{name}': row.values[name] for name in value_names})
+            data.update({f'i_{name}': row.increments[name] for name in increment_names})
+            return data
+
+        # Modeles shardes: une instruction par shard proprietaire
+        shard_map = getattr(model, '_shard_map', None)
+        if shard_map is not None:
+            by_shard = defaultdict(list)
+            for id, row in rows:
+                by_shard[shard_map.shard_for_id(id)].append(params(id, row))
+            for shard, shard_params in by_shard.items():
+                with shard_map.sessions[shard]() as session:
+                    session.connection().execute(statement, shard_params)
+                    session.commit()
+            return len(rows)
+
+        if tenant is not None:
+            with Tenant.scope(tenant):
+                return self._execute(statement, [params(id, row) for id, row in rows])
+        return self._execute(statement, [params(id, row) for id, row in rows])
+
+    def _execute(self, statement, params):
+        with self.get_session()() as session:
+            session.connection().execute(statement, params)
+            session.commit()
+        return len(params)
+
+    # ------------------------------------------------------------------
+    # Thread d'ecriture
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            # Apres un fork: repartir d'un tampon vide dans le worker
+            if self._pid is not None:
+                self._pending = {}
+            else:
+                atexit.register(self.stop)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='bmb-write-behind', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        thread = threading.current_thread()
+        while self._thread is thread:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def stop(self):
+        """Arreter le thread et ecrire les mises a jour restantes"""
+        thread, self._thread = self._thread, None
+        self._wakeup.set()
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            thread.join(self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        """Metriques du tampon"""
+        return {
+            'pending': len(self._pending),
+            'flushes': self._flushes,
+            'rows_written': self._rows_written,
+            'coalesced': self._coalesced,
+            'errors': self._errors
+        }
+
+
+def _buffer():
+    from ..models_loader import ModelsLoader
+    return ModelsLoader.get_write_behind()
+
+
+class WriteBehindMixin:
+    """Mises a jour differees ajoutees aux modeles BMDB par ModelsLoader"""
+
+    @classmethod
+    def defer_update(cls, id, **fields):
+        """
+        Mettre a jour des champs sans attendre l'ecriture en base
+
+        Usage:
+            User.defer_update(user.id, last_seen=datetime.utcnow())
+        """
+        _buffer().update(cls, id, fields)
+
+    @classmethod
+    def defer_increment(cls, id, **deltas):
+        """
+        Incrementer des compteurs sans attendre l'ecriture en base
+
+        Usage:
+            Article.defer_increment(article.id, views=1)
+        """
+        _buffer().increment(cls, id, deltas)
@@ -0,0 +1,247 @@
+"""
+File d'ecriture unique (group commit) pour les deploiements SQLite
+Les save/delete des modeles passent par un thread ecrivain qui regroupe
+les ecritures de plusieurs requetes dans une seule transaction
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .deadlines import Deadline
+from .replicas import ReadYourWrites
+from .tenancy import Tenant
+
+_STOP = object()
+
+
+class _WriteJob:
+    __slots__ = ('op', 'instance', 'future')
+
+    def __init__(self, op, instance):
+        self.op = op
+        self.instance = instance
+        self.future = Future()
+
+
+@lru_cache(maxsize=None)
+def _needs_refresh(model):
+    """Valeurs calculees par la base (server_default...) a relire apres commit"""
+    return any(
+        column.server_default is not None or column.server_onupdate is not None
+        for column in inspect(model).columns
+    )
+
+
+def _copy_back(source, target):
+    """Reporter les valeurs en base (id, defauts serveur) sur l'instance de l'appelant"""
+    for attr in inspect(type(source)).column_attrs:
+        set_committed_value(target, attr.key, getattr(source, attr.key))
+
+
+class WriteCoordinator:
+    """
+    Thread ecrivain unique avec commit groupe
+
+    Chaque ecriture est copiee (session.merge) dans la session du thread
+    ecrivain: l'instance de l'appelant n'est jamais partagee entre threads.
+    Un lot = une transaction = un fsync. Si le lot echoue, chaque ecriture
+    est rejouee seule pour que seule l'ecriture fautive echoue.
+
+    Args:
+        session_factory: Fabrique de sessions (SessionLocal)
+        max_batch: Nombre maximal d'ecritures par transaction
+        max_wait: Attente maximale (secondes) pour completer un lot
+        timeout: Attente maximale de l'appelant sans echeance de requete
+    """
+
+    def __init__(self, session_factory, max_batch=64, max_wait=0.002, timeout=30):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._batches = 0
+        self._writes = 0
+        self._retried = 0
+
+    # ------------------------------------------------------------------
+    # Cote appelant
+    # ------------------------------------------------------------------
+
+    def submit(self, op, instance):
+        """Mettre une ecriture ('save' ou 'delete') en file, retourne un Future"""
+        self._ensure_started()
+        job = _WriteJob(op, instance)
+        self._queue.put(job)
+        return job.future
+
+    def write(self, op, instance):
+        """Ecrire et attendre la confirmation du thread ecrivain"""
+        future = self.submit(op, instance)
+        remaining = Deadline.remaining()
+        timeout = self.timeout if remaining is None else max(0.0, remaining)
+
+        try:
+            result = future.result(timeout)
+        except FutureTimeoutError as e:
+            if not future.cancel():
+                # Transaction deja en cours: son issue est imminente
+                return future.result()
+            if remaining is not None:
+                Deadline.fail(e)
+            raise TimeoutError("File d'ecriture saturee") from e
+
+        # Les lectures suivantes de la requete doivent voir cette ecriture
+        ReadYourWrites.mark_write()
+        return result
+
+    # ------------------------------------------------------------------
+    # Thread ecrivain
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        with self._lock:
+            # Les threads ne survivent pas a un fork (workers gunicorn)
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='bmb-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+
+            batch = [job]
+            stop = False
+            flush_at = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stop = True
+                    break
+                batch.append(job)
+
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch):
+        # Ignorer les ecritures abandonnees par leur appelant
+        batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            self._write(batch)
+        except Exception:
+            self._retried += 1
+            for job in batch:
+                try:
+                    self._write([job])
+                except Exception as e:
+                    job.future.set_exception(e)
+
+    def _write(self, jobs):
+        session = self.session_factory(expire_on_commit=False)
+        try:
+            copies = []
+            for job in jobs:
+                copy = session.merge(job.instance)
+                if job.op == 'delete':
+                    session.delete(copy)
+                copies.append(copy)
+            session.commit()
+        except Exception:
+            session.rollback()
+            session.close()
+            raise
+
+        # Transaction validee: resultat individuel de chaque ecriture
+        try:
+            for job, copy in zip(jobs, copies):
+                try:
+                    if job.op == 'save':
+                        if _needs_refresh(type(copy)):
+                            session.refresh(copy)
+                        _copy_back(copy, job.instance)
+                        job.future.set_result(job.instance)
+                    else:
+                        job.future.set_result(True)
+                except Exception as e:
+                    job.future.set_exception(e)
+        finally:
+            session.close()
+
+        self._batches += 1
+        self._writes += len(jobs)
+
+    def stop(self, timeout=10):
+        """Vider la file puis arreter le thread ecrivain"""
+        with self._lock:
+            thread = self._thread if self._pid == os.getpid() else None
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def stats(self):
+        """Metriques de la file d'ecriture"""
+        return {
+            'queued': self._queue.qsize(),
+            'batches': self._batches,
+            'writes': self._writes,
+            'avg_batch': round(self._writes / self._batches, 2) if self._batches else 0,
+            'retried_batches': self._retried
+        }
+
+    def install(self, models):
+        """Faire passer save/delete des modeles par la file d'ecriture"""
+        for model in models:
+            if model.save is CoordinatedWriteMixin.save:
+                model._write_coordinator = self
+                continue
+            model._bmb_direct_save = model.save
+            model._bmb_direct_delete = model.delete
+            model._write_coordinator = self
+            model.save = CoordinatedWriteMixin.save
+            model.delete = CoordinatedWriteMixin.delete
+        atexit.register(self.stop)
+        return models
+
+
+class CoordinatedWriteMixin:
+    """save/delete via le thread ecrivain (direct pour un tenant: une base par tenant)"""
+
+    _write_coordinator = None
+
+    def save(self):
+        """Creer ou mettre a jour cette instance (commit groupe)"""
+        if Tenant.current() is not None:
+            return self._bmb_direct_save()
+        return self._write_coordinator.write('save', self)
+
+    def delete(self):
+        """Supprimer cette instance (commit groupe)"""
+        if Tenant.current() is not None:
+            return self._bmb_direct_delete()
+        return self._write_coordinator.write('delete', self)
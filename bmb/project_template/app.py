@@ -8,7 +8,16 @@ from flask_cors import CORS
 from config import AppConfig, BMDBConfig
 from models_loader import load_models
 from database import Database
-from middleware import setup_logging, register_error_handlers
+from utils import install_json_provider
+from middleware import (
+    setup_logging,
+    register_error_handlers,
+    setup_admission_control,
+    setup_request_deadlines,
+    setup_read_your_writes,
+    setup_tenancy,
+    setup_compression
+)
 
 
 def create_app(config_class=AppConfig):
@@ -26,6 +35,10 @@ def create_app(config_class=AppConfig):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # Encodeur JSON rapide (orjson/ujson si installes)
+    json_provider = install_json_provider(app, AppConfig.JSON_PROVIDER)
+    print(f"⚡ Encodeur JSON: {json_provider.name}")
+    
     # Valider les configurations
     print("🔧 Validation des configurations...")
     AppConfig.validate()
@@ -52,12 +65,31 @@ def create_app(config_class=AppConfig):
     else:
         print("⚠️  Attention: Impossible de se connecter à la base de données")
     
+    # Compression des réponses (enregistrée en premier: s'exécute en dernier)
+    if AppConfig.COMPRESSION_ENABLED:
+        setup_compression(app)
+    
     # Configurer le logging
     setup_logging(app)
     
     # Enregistrer les gestionnaires d'erreurs
     register_error_handlers(app)
     
+    # Controle d'admission (delestage en cas de surcharge)
+    if AppConfig.ADMISSION_CONTROL_ENABLED:
+        setup_admission_control(app)
+    
+    # Delai maximal par requete (propage aux requetes SQL)
+    setup_request_deadlines(app)
+    
+    # Lecture-apres-ecriture: lectures sur le primaire apres une ecriture
+    if BMDBConfig.DB_REPLICAS:
+        setup_read_your_writes(app)
+    
+    # Multi-tenant: base de donnees du tenant de la requete
+    if BMDBConfig.TENANT_DB_URL:
+        setup_tenancy(app)
+    
     # Enregistrer les blueprints (routes)
     from routes import register_routes
     register_routes(app)
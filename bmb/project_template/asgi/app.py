@@ -0,0 +1,201 @@
+"""
+Factory pour creer l'application ASGI BMB (Quart)
+Memes routes que create_app, servies par une boucle d'evenements:
+un client lent n'occupe plus un thread pendant toute la requete
+"""
+
+import logging
+import time
+import traceback
+
+from quart import Quart, request
+from quart.wrappers.response import DataBody
+
+from config import AppConfig, BMDBConfig
+from database import Database
+from middleware.compression import ResponseCompressor
+from middleware.deadlines import resolve_deadline
+from models_loader import ModelsLoader, load_models
+from orm import Deadline, DeadlineExceeded
+from utils import install_json_provider
+from .utils import error_response
+
+
+def create_asgi_app(config_class=AppConfig):
+    """
+    Factory pour creer l'application BMB en mode ASGI
+
+    Usage:
+        hypercorn "bmb.asgi:create_asgi_app()"
+        bmb serve --asgi
+
+    Args:
+        config_class: Classe de configuration a utiliser
+
+    Returns:
+        Quart app configuree
+    """
+    app = Quart(__name__)
+    app.config.from_object(config_class)
+
+    json_provider = install_json_provider(app, AppConfig.JSON_PROVIDER)
+    print(f"⚡ Encodeur JSON: {json_provider.name}")
+
+    print("🔧 Validation des configurations...")
+    AppConfig.validate()
+    BMDBConfig.validate()
+
+    # Les sessions asyncio n'utilisent qu'une base: pas de routage par tenant
+    if BMDBConfig.TENANT_DB_URL:
+        raise RuntimeError(
+            "Le mode ASGI ne gere pas le multi-tenant (TENANT_DB_URL): "
+            "servir l'application en WSGI (bmb serve sans --asgi)"
+        )
+
+    # Ni replicas, ni shards, ni file d'ecriture: aget/arows/ainsert_or_ignore
+    # liraient et ecriraient la base principale au lieu de la base resolue
+    unsupported = [
+        name for name, enabled in (
+            ('DB_REPLICAS', BMDBConfig.DB_REPLICAS),
+            ('DB_SHARDS', BMDBConfig.DB_SHARDS),
+            ('WRITE_QUEUE_ENABLED', BMDBConfig.WRITE_QUEUE_ENABLED),
+        ) if enabled
+    ]
+    if unsupported:
+        raise RuntimeError(
+            f"Le mode ASGI ne gere pas {', '.join(unsupported)}: "
+            "servir l'application en WSGI (bmb serve sans --asgi)"
+        )
+
+    print("📦 Chargement des modeles BMDB...")
+    app.bmdb_models = load_models()
+
+    if BMDBConfig.CREATE_TABLES_ON_START:
+        print("🗄️  Initialisation de la base de donnees...")
+        Database.init_db()
+
+    if Database.test_connection():
+        print("✅ Connexion a la base de donnees etablie")
+    else:
+        print("⚠️  Attention: Impossible de se connecter a la base de donnees")
+
+    if AppConfig.COMPRESSION_ENABLED:
+        _setup_compression(app)
+    _setup_cors(app)
+    _setup_logging(app)
+    _setup_deadlines(app)
+    _register_error_handlers(app)
+
+    from .auth import auth_bp
+    from .users import users_bp
+    from .health import health_bp
+    from .exports import exports_bp
+
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(users_bp, url_prefix='/api/users')
+    app.register_blueprint(health_bp, url_prefix='/api')
+    app.register_blueprint(exports_bp, url_prefix='/api/exports')
+
+    @app.after_serving
+    async def close_async_engine():
+        """Fermer le pool asyncio depuis la boucle d'evenements"""
+        await ModelsLoader.dispose_async_engine()
+
+    print("✅ Application BMB (ASGI) creee avec succes")
+
+    return app
+
+
+def _setup_compression(app):
+    """Compression des reponses (voir middleware/compression.py), executee en dernier"""
+    compressor = ResponseCompressor.from_config()
+    app.extensions['bmb_compression'] = compressor
+
+    @app.after_request
+    async def compress_response(response):
+        if not isinstance(response.response, DataBody) or not compressor.accepts(response):
+            return response
+        return compressor.apply(response, await response.get_data(), request.accept_encodings)
+
+
+def _setup_cors(app):
+    """CORS via quart-cors si installe, sinon en-tetes minimaux"""
+    try:
+        from quart_cors import cors
+        cors(app, allow_origin=AppConfig.CORS_ORIGINS)
+        return
+    except ImportError:
+        pass
+
+    @app.after_request
+    async def add_cors_headers(response):
+        origin = request.headers.get('Origin')
+        if origin and ('*' in AppConfig.CORS_ORIGINS or origin in AppConfig.CORS_ORIGINS):
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.headers['Access-Control-Allow-Methods'] = ', '.join(AppConfig.CORS_METHODS)
+            response.headers['Access-Control-Allow-Headers'] = ', '.join(AppConfig.CORS_ALLOW_HEADERS)
+            response.headers['Vary'] = 'Origin'
+        return response
+
+
+def _setup_logging(app):
+    """Logger chaque requete"""
+    logger = logging.getLogger('bmb')
+
+    @app.before_request
+    async def log_request():
+        request.start_time = time.time()
+        logger.info(f"⮕  {request.method} {request.path}")
+
+    @app.after_request
+    async def log_response(response):
+        if hasattr(request, 'start_time'):
+            duration = time.time() - request.start_time
+            logger.info(
+                f"⮐  {request.method} {request.path} "
+                f"- Status: {response.status_code} "
+                f"- Duration: {duration:.3f}s"
+            )
+        return response
+
+
+def _setup_deadlines(app):
+    """Delai maximal par requete, propage aux requetes SQL"""
+
+    @app.before_request
+    async def start_deadline():
+        Deadline.set(resolve_deadline(app.view_functions.get(request.endpoint), request.headers))
+
+    @app.after_request
+    async def deadline_response(response):
+        if Deadline.exceeded():
+            timeout_response, status = error_response("Delai de la requete depasse", 504)
+            timeout_response.status_code = status
+            return timeout_response
+        return response
+
+    @app.errorhandler(DeadlineExceeded)
+    async def deadline_exceeded(error):
+        return error_response("Delai de la requete depasse", 504)
+
+
+def _register_error_handlers(app):
+    """Gestionnaires d'erreurs globaux"""
+
+    @app.errorhandler(404)
+    async def not_found(error):
+        return error_response('Ressource introuvable', 404)
+
+    @app.errorhandler(Exception)
+    async def handle_exception(error):
+        if app.debug:
+            return error_response(
+                'Exception non geree',
+                500,
+                errors={
+                    'details': str(error),
+                    'type': type(error).__name__,
+                    'traceback': traceback.format_exc()
+                }
+            )
+        return error_response('Une erreur est survenue', 500)
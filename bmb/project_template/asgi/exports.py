@@ -0,0 +1,77 @@
+"""
+Routes asynchrones des exports massifs (voir routes/exports.py)
+"""
+
+from quart import Blueprint, request, send_file, url_for
+from quart.utils import run_sync
+
+from exports import (
+    ExportError, download_mimetype, download_name, get_export_manager,
+    owned_job, public_job, request_export
+)
+from models_loader import load_models
+from .utils import token_required, success_response, error_response
+
+exports_bp = Blueprint('exports', __name__)
+
+
+def _export_data(job):
+    data = public_job(job)
+    if job['status'] == 'done':
+        data['download_url'] = url_for('exports.download_export', job_id=job['id'])
+    return data
+
+
+@exports_bp.route('', methods=['POST'])
+@token_required
+async def create_export(current_user):
+    """Lancer un export en arriere-plan (202, en-tete Location)"""
+    data = await request.get_json(silent=True) or {}
+    try:
+        # Creation du job sur disque hors de la boucle d'evenements
+        job = await run_sync(request_export)(data, current_user.id, load_models())
+    except ExportError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+    response, status = success_response(
+        data={'export': _export_data(job)},
+        message="Export demarre",
+        status=202
+    )
+    response.headers['Location'] = url_for('exports.get_export', job_id=job['id'])
+    return response, status
+
+
+@exports_bp.route('/<job_id>', methods=['GET'])
+@token_required
+async def get_export(current_user, job_id):
+    """Etat d'un export"""
+    job = owned_job(job_id, current_user.id)
+    if job is None:
+        return error_response("Export introuvable", 404)
+    return success_response(data={'export': _export_data(job)})
+
+
+@exports_bp.route('/<job_id>/download', methods=['GET'])
+@token_required
+async def download_export(current_user, job_id):
+    """Telecharger le fichier d'un export termine (Range supporte)"""
+    job = owned_job(job_id, current_user.id)
+    if job is None:
+        return error_response("Export introuvable", 404)
+    if job['status'] != 'done':
+        return error_response(f"Export non termine ({job['status']})", 409)
+
+    path = get_export_manager().file_path(job)
+    if not path.exists():
+        return error_response("Fichier d'export expire", 410)
+
+    return await send_file(
+        path.resolve(),
+        mimetype=download_mimetype(job),
+        as_attachment=True,
+        attachment_filename=download_name(job),
+        conditional=True
+    )
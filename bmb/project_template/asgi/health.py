@@ -0,0 +1,89 @@
+"""
+Routes de sante asynchrones
+"""
+
+import datetime
+
+from quart import Blueprint
+from quart.utils import run_sync
+
+from database import Database
+from models_loader import ModelsLoader
+from config.bmdb_config import BMDBConfig
+from .utils import success_response, error_response, conditional, cached_response
+
+health_bp = Blueprint('health', __name__)
+
+
+@health_bp.route('/health', methods=['GET'])
+async def health_check():
+    """Verifier l'etat de l'API et de la base de donnees"""
+    try:
+        db_connected = await run_sync(Database.test_connection)()
+
+        models_list = ModelsLoader.list_models()
+        User = ModelsLoader.get_model('User')
+
+        try:
+            user_count = await User.acount() if User else 0
+            db_query_ok = True
+        except Exception:
+            user_count = 0
+            db_query_ok = False
+
+        health_status = {
+            'status': 'healthy' if db_connected and db_query_ok else 'unhealthy',
+            'timestamp': datetime.datetime.utcnow().isoformat(),
+            'components': {
+                'database': {
+                    'status': 'connected' if db_connected else 'disconnected',
+                    'orm': 'BMDB'
+                },
+                'models': {
+                    'loaded': len(models_list),
+                    'list': models_list
+                },
+                'api': {
+                    'status': 'running',
+                    'mode': 'asgi'
+                }
+            },
+            'metrics': {
+                'total_users': user_count
+            }
+        }
+
+        status_code = 200 if health_status['status'] == 'healthy' else 503
+
+        return success_response(data=health_status, status=status_code)
+
+    except Exception as e:
+        return error_response(
+            message="Health check failed",
+            status=503,
+            errors={'details': str(e)}
+        )
+
+
+@health_bp.route('/info', methods=['GET'])
+@conditional('public, max-age=60')
+@cached_response(ttl=60)
+async def app_info():
+    """Informations sur l'application"""
+    from . import __version__
+
+    info = {
+        'name': 'BMB Backend Framework',
+        'version': __version__,
+        'orm': 'BMDB',
+        'mode': 'asgi',
+        'database': {
+            'connection_configured': bool(BMDBConfig.DB_CONNECTION)
+        },
+        'models': {
+            'auto_load': BMDBConfig.AUTO_LOAD_MODELS,
+            'loaded': ModelsLoader.list_models()
+        }
+    }
+
+    return success_response(data=info)
@@ -0,0 +1,312 @@
+"""
+Routes CRUD asynchrones pour les utilisateurs
+"""
+
+import asyncio
+
+from quart import Blueprint, request
+from quart.utils import run_sync
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.security import generate_password_hash
+
+from config import AppConfig
+from imports import BulkImportError, can_import, import_format, importer_for, parse_records
+from models_loader import load_models
+from orm import Deadline
+from utils import (
+    Validator, instance_etag, requested_fields, requested_includes, stream_format, stream_requested
+)
+from .utils import (
+    BodyReader, token_required, success_response, error_response, stream_response,
+    conditional, not_modified, use_etag, cached_response
+)
+
+users_bp = Blueprint('users', __name__)
+
+
+@users_bp.route('', methods=['GET'])
+@token_required
+@cached_response(ttl=5, vary_on=('args',), depends_on=['User'], unless=lambda: stream_requested(request))
+async def get_users(current_user):
+    """
+    Recuperer tous les utilisateurs avec filtres et pagination
+
+    Query params:
+        - age, name, email: filtres
+        - page: int (numero de page, defaut: 1)
+        - page_size: int (taille de page, defaut: 20, max: 100)
+        - stream: ndjson ou json (flux sans pagination, ou Accept: application/x-ndjson)
+        - fields: colonnes a retourner, lues seules en SQL (ex: id,name)
+        - include: relations a inclure, chargees par lot (pas en flux)
+    """
+    try:
+        User = load_models().get('User')
+
+        filters = {}
+        if request.args.get('age'):
+            try:
+                filters['age'] = int(request.args.get('age'))
+            except ValueError:
+                return error_response("Le parametre 'age' doit etre un entier", 400)
+
+        if request.args.get('name'):
+            filters['name'] = request.args.get('name')
+
+        if request.args.get('email'):
+            filters['email'] = request.args.get('email')
+
+        # Projection (?fields=) et relations incluses (?include=)
+        try:
+            fields = requested_fields(request, User)
+            includes = requested_includes(request, User)
+        except ValueError as e:
+            return error_response(str(e), 400)
+
+        # Flux sans limite de taille: NDJSON ou tableau JSON par morceaux
+        try:
+            fmt = stream_format(request)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        if fmt:
+            if includes:
+                return error_response("Le parametre 'include' n'est pas disponible en flux", 400)
+            rows = await User.astream(
+                columns=fields, defer=['password'], batch_size=AppConfig.STREAM_BATCH_SIZE, **filters
+            )
+            return stream_response(rows, fmt, AppConfig.STREAM_BATCH_SIZE)
+
+        try:
+            page = int(request.args.get('page', 1))
+            page_size = min(
+                int(request.args.get('page_size', AppConfig.DEFAULT_PAGE_SIZE)),
+                AppConfig.MAX_PAGE_SIZE
+            )
+        except ValueError:
+            return error_response("Parametres de pagination invalides", 400)
+
+        # Lignes brutes paginees en SQL (sans objets ORM ni mot de passe)
+        users = await User.arows(
+            columns=fields,
+            defer=['password'],
+            include=includes,
+            limit=page_size,
+            offset=(page - 1) * page_size,
+            **filters
+        )
+        total_count = await User.acount(**filters)
+
+        return success_response(
+            data={
+                'users': users,
+                'pagination': {
+                    'page': page,
+                    'page_size': page_size,
+                    'total': total_count,
+                    'total_pages': (total_count + page_size - 1) // page_size
+                }
+            }
+        )
+
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+
+@users_bp.route('/<int:user_id>', methods=['GET'])
+@token_required
+@conditional()
+async def get_user(current_user, user_id):
+    """Recuperer un utilisateur par ID"""
+    try:
+        User = load_models().get('User')
+
+        user = await User.aget(user_id)
+
+        if not user:
+            return error_response("Utilisateur introuvable", 404)
+
+        if use_etag(instance_etag(user)):
+            return await not_modified()
+
+        return success_response(data={'user': user.to_dict()})
+
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+
+@users_bp.route('/<int:user_id>', methods=['PUT'])
+@token_required
+async def update_user(current_user, user_id):
+    """Mettre a jour un utilisateur"""
+    try:
+        if current_user.id != user_id:
+            return error_response("Non autorise a modifier cet utilisateur", 403)
+
+        User = load_models().get('User')
+
+        data = await request.get_json()
+        if not data:
+            return error_response("Corps de requete manquant", 400)
+
+        fields = {}
+
+        if 'name' in data:
+            fields['name'] = data['name']
+
+        if 'email' in data:
+            if not Validator.validate_email(data['email']):
+                return error_response("Format d'email invalide", 400)
+
+            if data['email'] != current_user.email and await User.aexists(email=data['email']):
+                return error_response("Cet email est deja utilise", 409)
+
+            fields['email'] = data['email']
+
+        if 'age' in data:
+            try:
+                fields['age'] = int(data['age'])
+            except (ValueError, TypeError):
+                return error_response("L'age doit etre un entier", 400)
+
+        if 'password' in data:
+            is_valid, message = Validator.validate_password(data['password'])
+            if not is_valid:
+                return error_response(message, 400)
+
+            fields['password'] = await run_sync(generate_password_hash)(data['password'])
+
+        # Une seule requete UPDATE ... RETURNING
+        updated_user = await User.aupdate(user_id, **fields)
+        if not updated_user:
+            return error_response("Utilisateur introuvable", 404)
+
+        return success_response(
+            data={'user': updated_user.to_dict()},
+            message="Utilisateur mis a jour avec succes"
+        )
+
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+
+@users_bp.route('/<int:user_id>', methods=['DELETE'])
+@token_required
+async def delete_user(current_user, user_id):
+    """Supprimer un utilisateur"""
+    try:
+        if current_user.id != user_id:
+            return error_response("Non autorise a supprimer cet utilisateur", 403)
+
+        User = load_models().get('User')
+
+        user = await User.aget(user_id)
+        if not user:
+            return error_response("Utilisateur introuvable", 404)
+
+        if await user.adelete():
+            return success_response(message="Utilisateur supprime avec succes")
+        return error_response("echec de la suppression", 500)
+
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+
+@users_bp.route('/search', methods=['GET'])
+@token_required
+async def search_user(current_user):
+    """Rechercher un utilisateur par email"""
+    try:
+        email = request.args.get('email')
+        if not email:
+            return error_response("Parametre 'email' requis", 400)
+
+        User = load_models().get('User')
+
+        user = await User.afirst(email=email, defer=['password'])
+
+        if not user:
+            return error_response("Utilisateur introuvable", 404)
+
+        return success_response(data={'user': user.to_dict()})
+
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+
+@users_bp.route('/stats', methods=['GET'])
+@token_required
+@cached_response(ttl=30, vary_on=('args',), depends_on=['User'])
+async def get_user_stats(current_user):
+    """Statistiques des utilisateurs"""
+    try:
+        User = load_models().get('User')
+
+        total_users = await User.acount()
+        all_users = await User.aall(only=['age'])
+
+        ages = [user.age for user in all_users if user.age is not None]
+
+        stats = {
+            'total_users': total_users,
+            'average_age': sum(ages) / len(ages) if ages else 0,
+            'users_with_age': len(ages),
+            'users_without_age': total_users - len(ages)
+        }
+
+        age_ranges = {'18-25': 0, '26-35': 0, '36-45': 0, '46+': 0}
+        for age in ages:
+            if 18 <= age <= 25:
+                age_ranges['18-25'] += 1
+            elif 26 <= age <= 35:
+                age_ranges['26-35'] += 1
+            elif 36 <= age <= 45:
+                age_ranges['36-45'] += 1
+            else:
+                age_ranges['46+'] += 1
+
+        stats['age_distribution'] = age_ranges
+
+        return success_response(data={'stats': stats})
+
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+
+def _import_users(User, stream, fmt, gzipped):
+    # Thread de run_sync: lecture du corps, validation et insertion bloquantes
+    with Deadline.scope(AppConfig.IMPORT_TIMEOUT):
+        return importer_for(User).run(parse_records(stream, fmt, gzipped))
+
+
+@users_bp.route('/import', methods=['POST'])
+@token_required
+async def import_users(current_user):
+    """
+    Importer des utilisateurs en masse (voir routes/users.py)
+
+    Le corps est lu morceau par morceau depuis le thread d'import.
+    Quart compare Content-Length a MAX_CONTENT_LENGTH avant la route:
+    envoyer les gros fichiers en chunked ou relever MAX_CONTENT_LENGTH.
+    """
+    if not can_import(current_user):
+        return error_response("Import reserve aux administrateurs", 403)
+
+    try:
+        fmt = import_format(request.args.get('format'), request.mimetype)
+    except BulkImportError as e:
+        return error_response(str(e), 400)
+
+    try:
+        User = load_models().get('User')
+
+        gzipped = request.headers.get('Content-Encoding', '').lower() == 'gzip'
+        stream = BodyReader(request.body, asyncio.get_running_loop(), AppConfig.IMPORT_MAX_CONTENT_LENGTH)
+        report = await run_sync(_import_users)(User, stream, fmt, gzipped)
+
+        return success_response(data={'import': report.to_dict()}, message="Import termine")
+
+    except (EOFError, OSError, UnicodeDecodeError) as e:
+        return error_response(f"Corps de requete illisible: {str(e)}", 400)
+    except RequestEntityTooLarge:
+        return error_response("Fichier trop volumineux (IMPORT_MAX_CONTENT_LENGTH)", 413)
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
@@ -0,0 +1,248 @@
+"""
+Utilitaires asynchrones pour le mode ASGI (reponses, flux, authentification JWT)
+"""
+
+import asyncio
+import io
+from functools import wraps
+
+from quart import Response, current_app, g, jsonify, make_response, request
+from quart.utils import run_sync
+from quart.wrappers.response import DataBody
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from models_loader import load_models
+from utils import JWTManager
+from config import AppConfig
+from orm import Tenant
+from orm.changes import TableVersions
+from utils.conditional import body_etag, cache_control_for, etag_matches, make_etag
+from utils.response_cache import CachePolicy, cache_key, cached_headers, get_response_cache, storable
+from utils.streaming import (
+    STREAM_HEADERS, AsyncChunks, ChunkEncoder, aencode_stream, json_dumps_bytes
+)
+
+
+def api_response(data=None, message=None, status=200):
+    """Reponse API standardisee"""
+    response = {}
+
+    if message:
+        response['message'] = message
+
+    if data is not None:
+        response['data'] = data
+
+    return jsonify(response), status
+
+
+def success_response(data=None, message="Succes", status=200):
+    """Reponse de succes"""
+    return api_response(data=data, message=message, status=status)
+
+
+def error_response(message, status=400, errors=None):
+    """Reponse d'erreur"""
+    response = {'error': message}
+
+    if errors:
+        response['errors'] = errors
+
+    return jsonify(response), status
+
+
+def stream_response(rows, fmt='ndjson', batch_size=1000):
+    """
+    Reponse en flux (voir utils.streaming.stream_response)
+
+    Args:
+        rows: Flux asynchrone de lignes, de preference await Model.astream(...)
+        fmt: 'ndjson' ou 'json'
+        batch_size: Lignes par morceau envoye
+    """
+    encoder = ChunkEncoder(fmt, json_dumps_bytes(current_app))
+    body = AsyncChunks(aencode_stream(rows, encoder, batch_size), rows)
+    return Response(body, mimetype=encoder.mimetype, headers=STREAM_HEADERS)
+
+
+class BodyReader(io.RawIOBase):
+    """
+    Corps de requete lisible en flux depuis un thread (run_sync)
+
+    Chaque lecture attend le morceau suivant sur la boucle asyncio:
+    le corps n'est jamais charge entierement en memoire.
+
+    Args:
+        body: request.body (iterable asynchrone de morceaux)
+        loop: Boucle de la requete
+        max_length: Taille maximale du corps (None = illimitee)
+    """
+
+    def __init__(self, body, loop, max_length=None):
+        super().__init__()
+        self._chunks = body.__aiter__()
+        self._loop = loop
+        self._max_length = max_length
+        self._pending = b''
+        self._received = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._pending:
+            try:
+                chunk = asyncio.run_coroutine_threadsafe(self._chunks.__anext__(), self._loop).result()
+            except StopAsyncIteration:
+                return 0
+            self._received += len(chunk)
+            if self._max_length is not None and self._received > self._max_length:
+                raise RequestEntityTooLarge()
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _cacheable(response):
+    # GET/HEAD, 200 et corps deja en memoire (pas de flux)
+    return (
+        request.method in ('GET', 'HEAD')
+        and response.status_code == 200
+        and isinstance(response.response, DataBody)
+    )
+
+
+def use_etag(etag):
+    """Annoncer l'ETag avant de construire la reponse (voir utils.conditional.use_etag)"""
+    g.bmb_etag = make_etag(request.endpoint, request.query_string, etag)
+    return etag_matches(g.bmb_etag, request.if_none_match)
+
+
+async def not_modified():
+    """Reponse 304 vide (ETag et Cache-Control ajoutes par @conditional)"""
+    response = await make_response('', 304)
+    response.set_etag(g.bmb_etag)
+    return response
+
+
+def conditional(cache_control='private, no-cache'):
+    """Decorateur asynchrone: ETag fort, 304 et Cache-Control (voir utils.conditional)"""
+    def decorator(f):
+        @wraps(f)
+        async def decorated(*args, **kwargs):
+            response = await make_response(await f(*args, **kwargs))
+            if response.status_code != 304 and not _cacheable(response):
+                return response
+            response.headers['Cache-Control'] = cache_control_for(request.endpoint, cache_control)
+            if response.status_code == 304:
+                return response
+
+            etag = g.get('bmb_etag') or body_etag(await response.get_data())
+            response.set_etag(etag)
+            return await response.make_conditional(request)
+
+        return decorated
+    return decorator
+
+
+def cached_response(ttl=60, vary_on=('args', 'user'), depends_on=(), stale_ttl=None, unless=None):
+    """Decorateur asynchrone: reponse GET en cache (voir utils.response_cache.cached_response)"""
+    policy = CachePolicy(ttl, vary_on, depends_on, stale_ttl, unless)
+
+    def decorator(f):
+        @wraps(f)
+        async def decorated(*args, **kwargs):
+            if policy.bypass(request):
+                return await f(*args, **kwargs)
+
+            cache = get_response_cache()
+            tables = policy.tables
+            key = cache_key(request, policy.vary_on, args)
+
+            entry, state = cache.lookup(key, tables)
+            if state == 'fresh':
+                return _replay(entry, 'HIT')
+
+            event = cache.claim(key)
+            if event is not None:
+                if state == 'stale':
+                    cache.served_stale()
+                    return _replay(entry, 'STALE')
+                # Attente hors de la boucle d'evenements
+                await run_sync(event.wait)(AppConfig.RESPONSE_CACHE_WAIT)
+                entry, state = cache.lookup(key, tables)
+                if state == 'fresh':
+                    return _replay(entry, 'HIT')
+                return await f(*args, **kwargs)
+
+            try:
+                versions = TableVersions.get(tables)
+                response = await make_response(await f(*args, **kwargs))
+                if isinstance(response.response, DataBody) and storable(response):
+                    cache.store(
+                        key, await response.get_data(), response.status_code, cached_headers(response),
+                        versions, policy.ttl, policy.stale_ttl
+                    )
+            finally:
+                cache.release(key)
+
+            response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return decorated
+    return decorator
+
+
+def _replay(entry, state):
+    return current_app.response_class(entry.body, status=entry.status, headers=entry.headers_for(state))
+
+
+def token_required(f):
+    """Decorateur asynchrone pour proteger les routes"""
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        token = None
+
+        # Recuperer le token
+        if 'Authorization' in request.headers:
+            auth_header = request.headers['Authorization']
+            try:
+                token = auth_header.split(" ")[1]  # Bearer TOKEN
+            except IndexError:
+                return error_response('Format de token invalide', 401)
+
+        if not token:
+            return error_response('Token manquant', 401)
+
+        try:
+            # Decoder le token
+            data = JWTManager.decode_token(token)
+
+            # Un token n'est valable que pour le tenant qui l'a emis
+            if data.get(AppConfig.TENANT_JWT_CLAIM) != Tenant.current():
+                return error_response('Token emis pour un autre tenant', 401)
+
+            # Charger le modele User
+            User = load_models().get('User')
+
+            if not User:
+                return error_response('Modele User introuvable', 500)
+
+            # Recuperer l'utilisateur sans bloquer la boucle d'evenements
+            current_user = await User.aget(data['user_id'])
+
+            if not current_user:
+                return error_response('Utilisateur introuvable', 401)
+
+            JWTManager.touch_last_seen(User, current_user)
+
+        except ValueError as e:
+            return error_response(str(e), 401)
+        except Exception as e:
+            return error_response(f'Erreur d\'authentification: {str(e)}', 401)
+
+        return await f(current_user, *args, **kwargs)
+
+    return decorated
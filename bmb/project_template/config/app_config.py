@@ -33,14 +33,121 @@ class AppConfig:
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
     
+    # Serveur de production (bmb serve), 0 = dimensionnement automatique
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', 0))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 0))
+    SERVER_PRELOAD = os.getenv('SERVER_PRELOAD', 'True').lower() == 'true'
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 60))
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', 10000))
+    
     # Pagination
     DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 20))
     MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
+    # Flux (?stream=ndjson|json): lignes lues et envoyées par lot, sans limite de taille
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 1000))
+    
+    # Exports massifs (POST /api/exports, bmb export)
+    EXPORT_DIR = os.getenv('EXPORT_DIR', 'exports')
+    EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', 2))
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 10000))
+    EXPORT_GZIP_LEVEL = int(os.getenv('EXPORT_GZIP_LEVEL', 1))  # 1 = le plus rapide
+    EXPORT_TTL_HOURS = float(os.getenv('EXPORT_TTL_HOURS', 24))  # 0 = conservation illimitée
+    # Export en cours abandonné (échec) sans progression depuis N secondes ou si son worker a disparu
+    EXPORT_HEARTBEAT_TIMEOUT = float(os.getenv('EXPORT_HEARTBEAT_TIMEOUT', 300))
+    # Modèles exportables via l'API (la CLI peut exporter tous les modèles)
+    EXPORT_MODELS = [m.strip() for m in os.getenv('EXPORT_MODELS', 'User').split(',') if m.strip()]
+    
+    # Imports massifs (POST /api/users/import, bmb import)
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))  # lignes par transaction
+    IMPORT_HASH_WORKERS = int(os.getenv('IMPORT_HASH_WORKERS', 0))  # 0 = nombre de coeurs
+    IMPORT_HASH_METHOD = os.getenv('IMPORT_HASH_METHOD', '')  # vide = méthode de l'inscription
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 1000))  # erreurs détaillées dans le rapport
+    IMPORT_MAX_CONTENT_LENGTH = int(os.getenv('IMPORT_MAX_CONTENT_LENGTH', 1024 * 1024 * 1024))  # 1GB
+    IMPORT_TIMEOUT = float(os.getenv('IMPORT_TIMEOUT', 0))  # secondes, 0 = pas d'échéance
+    # Administrateurs autorisés à importer via l'API (emails; ou colonne is_admin du modèle User)
+    IMPORT_ADMINS = [e.strip().lower() for e in os.getenv('IMPORT_ADMINS', '').split(',') if e.strip()]
+    
+    # Requêtes conditionnelles (ETag, 304) sur les routes décorées par @conditional
+    # Colonnes de version utilisées pour l'ETag, sans sérialiser l'enregistrement
+    ETAG_VERSION_COLUMNS = [c.strip() for c in os.getenv('ETAG_VERSION_COLUMNS', 'version_id,version,updated_at').split(',') if c.strip()]
+    # Colonnes de suivi (écriture différée) ignorées par l'ETag et par l'invalidation du cache de réponses
+    ETAG_IGNORE_COLUMNS = [c.strip() for c in os.getenv('ETAG_IGNORE_COLUMNS', 'last_seen').split(',') if c.strip()]
+    # Cache-Control par route (endpoint), ex: "health.app_info=public, max-age=60;users.get_user=private, no-cache"
+    CACHE_CONTROL_ROUTES = {
+        endpoint.strip(): policy.strip()
+        for endpoint, policy in (
+            item.split('=', 1) for item in os.getenv('CACHE_CONTROL_ROUTES', '').split(';') if '=' in item
+        )
+    }
+    
+    # Cache des réponses GET (@cached_response), en mémoire par worker
+    # Versions des tables partagées entre workers par ce dossier: un commit d'un worker
+    # invalide le cache des autres (vide: versions par processus, un seul worker)
+    RESPONSE_CACHE_SHARED_DIR = os.getenv('RESPONSE_CACHE_SHARED_DIR', '.bmb/table_versions')
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+    RESPONSE_CACHE_MAX_BODY = int(os.getenv('RESPONSE_CACHE_MAX_BODY', 1024 * 1024))  # 1MB par réponse
+    # Attente maximale d'une réponse en cours de calcul par une autre requête (secondes)
+    RESPONSE_CACHE_WAIT = float(os.getenv('RESPONSE_CACHE_WAIT', 5))
+    
+    # Compression des réponses (Accept-Encoding), par ordre de préférence du serveur
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESSION_ALGORITHMS = [a.strip() for a in os.getenv('COMPRESSION_ALGORITHMS', 'zstd,br,gzip').split(',') if a.strip()]
+    # Niveaux par algorithme, ex: "gzip:5,br:4,zstd:3" (défauts choisis pour la latence)
+    COMPRESSION_LEVELS = {
+        name.strip(): int(level)
+        for name, level in (
+            item.split(':') for item in os.getenv('COMPRESSION_LEVELS', '').split(',') if ':' in item
+        )
+    }
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # octets
+    COMPRESSION_MIMETYPES = [m.strip() for m in os.getenv(
+        'COMPRESSION_MIMETYPES', 'application/json,text/plain,text/html,text/csv,application/problem+json'
+    ).split(',') if m.strip()]
+    # Corps compressés conservés par ETag (réponses qui changent peu, ex: /api/info)
+    COMPRESSION_CACHE_SIZE = int(os.getenv('COMPRESSION_CACHE_SIZE', 256))
     
     # Upload Configuration (si nécessaire)
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     
+    # Encodeur JSON des réponses: auto (orjson > ujson > stdlib), orjson, ujson ou stdlib
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+    
+    # Délai maximal par requête (propagé aux requêtes SQL), en secondes
+    REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', 30))
+    REQUEST_TIMEOUT_MAX = float(os.getenv('REQUEST_TIMEOUT_MAX', 120))
+    REQUEST_TIMEOUT_HEADER = os.getenv('REQUEST_TIMEOUT_HEADER', 'X-Request-Timeout')
+    
+    # Contrôle d'admission (délestage de charge par worker)
+    ADMISSION_CONTROL_ENABLED = os.getenv('ADMISSION_CONTROL_ENABLED', 'True').lower() == 'true'
+    ADMISSION_MAX_CONCURRENT = int(os.getenv('ADMISSION_MAX_CONCURRENT', 64))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 0.5))  # secondes
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', 128))
+    ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', 1))
+    ADMISSION_PRIORITY_RESERVE = int(os.getenv('ADMISSION_PRIORITY_RESERVE', 4))
+    # Limites par classe de route (nom du blueprint), ex: "auth:16,users:32"
+    ADMISSION_ROUTE_LIMITS = {
+        name.strip(): int(limit)
+        for name, limit in (
+            item.split(':') for item in os.getenv('ADMISSION_ROUTE_LIMITS', '').split(',') if ':' in item
+        )
+    }
+    ADMISSION_PRIORITY_PATHS = os.getenv(
+        'ADMISSION_PRIORITY_PATHS', '/api/health,/api/auth/refresh,/api/metrics'
+    ).split(',')
+    
+    # Résolution du tenant (si TENANT_DB_URL est défini), dans l'ordre
+    TENANT_RESOLVERS = [r.strip() for r in os.getenv('TENANT_RESOLVERS', 'header,subdomain,jwt').split(',') if r.strip()]
+    TENANT_HEADER = os.getenv('TENANT_HEADER', 'X-Tenant-ID')
+    TENANT_JWT_CLAIM = os.getenv('TENANT_JWT_CLAIM', 'tenant')
+    # Domaine de base (résolution par sous-domaine): acme.example.com -> acme
+    TENANT_BASE_DOMAIN = os.getenv('TENANT_BASE_DOMAIN', '')
+    # Refuser les requêtes sans tenant (sinon: base par défaut)
+    TENANT_REQUIRED = os.getenv('TENANT_REQUIRED', 'False').lower() == 'true'
+    TENANT_EXEMPT_PATHS = os.getenv('TENANT_EXEMPT_PATHS', '/api/health,/api/info,/api/metrics').split(',')
+    
     @classmethod
     def validate(cls):
         """Valider la configuration"""
@@ -0,0 +1,387 @@
+"""
+Imports massifs de modeles depuis un flux CSV ou NDJSON
+Lecture incrementale, validation et insertion par lots (une transaction
+par lot), hachage des mots de passe en parallele, rapport d'erreurs par ligne
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from werkzeug.security import generate_password_hash
+
+from config import AppConfig
+from utils.validators import Validator
+
+logger = logging.getLogger('bmb')
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_MIMETYPES = {'text/csv': 'csv', 'application/x-ndjson': 'ndjson'}
+
+# Valeurs booleennes acceptees dans un CSV
+BOOLEANS = {'true': True, '1': True, 'oui': True, 'false': False, '0': False, 'non': False}
+
+
+class BulkImportError(ValueError):
+    """Demande d'import invalide (format, modele)"""
+
+
+# ----------------------------------------------------------------------
+# Lecture incrementale
+# ----------------------------------------------------------------------
+
+def _buffered(stream):
+    # io.TextIOWrapper exige un flux tamponne (read1)
+    return stream if hasattr(stream, 'read1') else io.BufferedReader(stream)
+
+
+def open_stream(stream, gzipped=False):
+    """Flux binaire, decompresse a la volee si gzip"""
+    stream = _buffered(stream)
+    return gzip.GzipFile(fileobj=stream) if gzipped else stream
+
+
+def parse_ndjson(stream):
+    """
+    Enregistrements d'un flux NDJSON
+
+    Yields:
+        (numero de ligne, dictionnaire ou None, erreur ou None)
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"JSON invalide: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Un objet JSON est attendu"
+            continue
+        yield line_number, row, None
+
+
+def parse_csv(stream):
+    """
+    Enregistrements d'un flux CSV (premiere ligne: noms des colonnes)
+
+    Les cellules vides valent None. Yields comme parse_ndjson.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, None, "Plus de valeurs que de colonnes"
+            continue
+        yield reader.line_num, {key: (value if value != '' else None) for key, value in row.items()}, None
+
+
+def parse_records(stream, fmt, gzipped=False):
+    """Enregistrements d'un flux au format 'csv' ou 'ndjson'"""
+    if fmt not in IMPORT_FORMATS:
+        raise BulkImportError(f"Le format doit etre parmi {', '.join(IMPORT_FORMATS)}")
+    stream = open_stream(stream, gzipped)
+    return parse_csv(stream) if fmt == 'csv' else parse_ndjson(stream)
+
+
+def import_format(requested=None, mimetype=None, filename=None):
+    """
+    Format d'un import: explicite, deduit du Content-Type ou de l'extension
+
+    Raises:
+        BulkImportError: Format inconnu
+    """
+    fmt = requested or IMPORT_MIMETYPES.get(mimetype)
+    if fmt is None and filename:
+        name = filename[:-3] if filename.endswith('.gz') else filename
+        fmt = 'csv' if name.endswith('.csv') else 'ndjson' if name.endswith(('.ndjson', '.jsonl')) else None
+    if fmt not in IMPORT_FORMATS:
+        raise BulkImportError(
+            f"Format d'import inconnu: utiliser text/csv ou application/x-ndjson (ou format={'|'.join(IMPORT_FORMATS)})"
+        )
+    return fmt
+
+
+def coerce_value(column, value):
+    """Convertir une valeur texte (CSV) selon le type Python de la colonne"""
+    if value is None or not isinstance(value, str):
+        return value
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is bool:
+        if value.lower() not in BOOLEANS:
+            raise ValueError(f"booleen attendu: {value!r}")
+        return BOOLEANS[value.lower()]
+    if python_type in (int, float):
+        return python_type(value)
+    return value
+
+
+# ----------------------------------------------------------------------
+# Rapport
+# ----------------------------------------------------------------------
+
+class ImportReport:
+    """
+    Resultat d'un import: lignes inserees, rejetees et erreurs par ligne
+
+    Args:
+        max_errors: Nombre d'erreurs detaillees conservees (les suivantes
+            sont seulement comptees)
+    """
+
+    def __init__(self, max_errors=1000):
+        self.max_errors = max_errors
+        self.inserted = 0
+        self.rejected = 0
+        self.errors = []
+        self._started = time.perf_counter()
+
+    def reject(self, line, errors):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def to_dict(self):
+        return {
+            'inserted': self.inserted,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'errors_truncated': self.rejected > len(self.errors),
+            'seconds': round(time.perf_counter() - self._started, 3),
+        }
+
+
+# ----------------------------------------------------------------------
+# Import
+# ----------------------------------------------------------------------
+
+def _session_factory():
+    from models_loader import ModelsLoader
+    return ModelsLoader.get_session()
+
+
+class BulkImporter:
+    """
+    Import par lots d'enregistrements dans un modele
+
+    Pour chaque lot de `batch_size` lignes valides:
+    1. doublons du lot et valeurs uniques deja en base rejetes (une requete)
+    2. mots de passe haches en parallele (hash_workers threads)
+    3. INSERT multi-lignes dans une transaction; si le lot echoue
+       (contrainte, insertion concurrente depuis la verification), ses
+       lignes sont reinserees une a une pour localiser les erreurs
+
+    Args:
+        model: Classe du modele
+        validate: Regles metier, fn(ligne) -> liste d'erreurs
+        unique_cols: Colonnes uniques verifiees avant insertion (ex: ['email'])
+        password_column: Colonne hachee avant insertion
+        prehashed: Mots de passe deja haches (migration), repris tels quels
+        batch_size: Lignes par lot et par transaction
+        hash_workers: Threads de hachage (defaut: nombre de coeurs)
+        hash_method: Methode werkzeug (defaut: celle de generate_password_hash)
+        max_errors: Erreurs detaillees dans le rapport
+    """
+
+    def __init__(self, model, validate=None, unique_cols=(), password_column=None, prehashed=False,
+                 batch_size=1000, hash_workers=None, hash_method=None, max_errors=1000):
+        self.model = model
+        self.table = model.__table__
+        self.validate = validate
+        self.unique_cols = list(unique_cols)
+        self.password_column = password_column
+        self.prehashed = prehashed
+        self.batch_size = batch_size
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+        self.hash_method = hash_method
+        self.max_errors = max_errors
+
+    def run(self, records):
+        """
+        Importer des enregistrements (voir parse_records)
+
+        Returns:
+            ImportReport
+        """
+        report = ImportReport(self.max_errors)
+        with ThreadPoolExecutor(self.hash_workers, thread_name_prefix='bmb-import') as executor:
+            batch = []
+            for line, row, error in records:
+                if error is None:
+                    row, errors = self.prepare(row)
+                else:
+                    errors = [error]
+                if errors:
+                    report.reject(line, errors)
+                    continue
+                batch.append((line, row))
+                if len(batch) >= self.batch_size:
+                    self._import_batch(batch, report, executor)
+                    batch = []
+            if batch:
+                self._import_batch(batch, report, executor)
+        return report
+
+    def prepare(self, row):
+        """Colonnes connues, types et regles metier d'une ligne: (valeurs, erreurs)"""
+        columns = self.table.columns
+        values = {}
+        errors = []
+        for key, value in row.items():
+            if key not in columns or key == 'id':
+                errors.append(f"Colonne inconnue: {key}")
+                continue
+            try:
+                values[key] = coerce_value(columns[key], value)
+            except (TypeError, ValueError) as e:
+                errors.append(f"Valeur invalide pour {key}: {e}")
+        if not errors and self.validate is not None:
+            errors.extend(self.validate(values))
+        return values, errors
+
+    def _import_batch(self, batch, report, executor):
+        batch = self._reject_duplicates(batch, report)
+        if not batch:
+            return
+        self._hash_passwords(batch, executor)
+
+        if getattr(self.model, '_shard_map', None) is not None:
+            # Modele shard: chaque ligne va sur son shard (identifiant alloue par shard)
+            self._insert_rows(batch, report)
+            return
+
+        try:
+            with _session_factory()() as session:
+                for rows in self._groups(batch):
+                    session.execute(insert(self.table), rows)
+                session.commit()
+            report.inserted += len(batch)
+        except (IntegrityError, DBAPIError) as e:
+            logger.info("Lot rejete (%s), insertion ligne par ligne", e.__class__.__name__)
+            self._insert_rows(batch, report)
+
+    def _groups(self, batch):
+        # executemany exige le meme jeu de colonnes pour toutes les lignes
+        groups = {}
+        for _, row in batch:
+            groups.setdefault(tuple(row), []).append(row)
+        return groups.values()
+
+    def _reject_duplicates(self, batch, report):
+        """Doublons dans le lot puis valeurs deja presentes en base"""
+        for name in self.unique_cols:
+            seen = set()
+            kept = []
+            for line, row in batch:
+                value = row.get(name)
+                if value is not None and value in seen:
+                    report.reject(line, [f"{name} en double dans le fichier"])
+                    continue
+                seen.add(value)
+                kept.append((line, row))
+            batch = kept
+
+            values = [row[name] for _, row in batch if row.get(name) is not None]
+            if not values:
+                continue
+            column = self.table.c[name]
+            existing = set(self._existing(select(column).where(column.in_(values))))
+            if existing:
+                batch = [(line, row) for line, row in batch if not self._reject_existing(line, row, name, existing, report)]
+        return batch
+
+    def _existing(self, statement):
+        shards = getattr(self.model, '_shard_map', None)
+        if shards is None:
+            with _session_factory()() as session:
+                return session.scalars(statement).all()
+        values = []
+        for shard_values in shards.fan_out(lambda session: session.scalars(statement).all()):
+            values.extend(shard_values)
+        return values
+
+    @staticmethod
+    def _reject_existing(line, row, name, existing, report):
+        if row.get(name) in existing:
+            report.reject(line, [f"{name} deja utilise"])
+            return True
+        return False
+
+    def _hash_passwords(self, batch, executor):
+        column = self.password_column
+        if column is None or self.prehashed:
+            return
+        pending = [row for _, row in batch if row.get(column) is not None]
+        for row, hashed in zip(pending, executor.map(self._hash, [row[column] for row in pending])):
+            row[column] = hashed
+
+    def _hash(self, password):
+        if self.hash_method:
+            return generate_password_hash(password, method=self.hash_method)
+        return generate_password_hash(password)
+
+    def _insert_rows(self, batch, report):
+        """Insertion ligne par ligne (lot en echec ou modele shard)"""
+        for line, row in batch:
+            try:
+                instance = self.model.insert_or_ignore(conflict_cols=self.unique_cols or None, **row)
+            except (IntegrityError, DBAPIError) as e:
+                report.reject(line, [str(e.orig)])
+                continue
+            if instance is None:
+                report.reject(line, ["Conflit d'unicite"])
+            else:
+                report.inserted += 1
+
+
+def can_import(user):
+    """
+    L'utilisateur peut-il importer via l'API ?
+
+    Creer des comptes en masse (mots de passe choisis) est reserve aux
+    administrateurs: email dans IMPORT_ADMINS ou colonne is_admin vraie.
+    """
+    if getattr(user, 'is_admin', False):
+        return True
+    email = getattr(user, 'email', None)
+    return bool(email) and email.lower() in AppConfig.IMPORT_ADMINS
+
+
+def importer_for(model, prehashed=False, **options):
+    """
+    Importeur configure depuis AppConfig
+
+    Colonnes uniques deduites du modele; pour User, memes regles que
+    l'inscription et hachage du mot de passe.
+    """
+    settings = dict(
+        batch_size=AppConfig.IMPORT_BATCH_SIZE,
+        hash_workers=AppConfig.IMPORT_HASH_WORKERS or None,
+        hash_method=AppConfig.IMPORT_HASH_METHOD or None,
+        max_errors=AppConfig.IMPORT_MAX_ERRORS,
+    )
+    settings.update(options)
+    unique_cols = [column.key for column in model.__table__.columns if column.unique and not column.primary_key]
+    if model.__name__ == 'User':
+        return BulkImporter(
+            model,
+            validate=partial(Validator.validate_user, check_password=not prehashed),
+            unique_cols=unique_cols,
+            password_column='password',
+            prehashed=prehashed,
+            **settings
+        )
+    return BulkImporter(model, unique_cols=unique_cols, **settings)
@@ -4,5 +4,23 @@ Middleware BMB
 
 from .logging import setup_logging
 from .error_handlers import register_error_handlers
+from .admission import setup_admission_control, AdmissionController
+from .deadlines import setup_request_deadlines, request_deadline
+from .consistency import setup_read_your_writes
+from .tenancy import setup_tenancy, resolve_tenant, TenantMismatch
+from .compression import setup_compression, ResponseCompressor
 
-__all__ = ['setup_logging', 'register_error_handlers']
\ No newline at end of file
+__all__ = [
+    'setup_logging',
+    'register_error_handlers',
+    'setup_admission_control',
+    'AdmissionController',
+    'setup_request_deadlines',
+    'request_deadline',
+    'setup_read_your_writes',
+    'setup_tenancy',
+    'resolve_tenant',
+    'TenantMismatch',
+    'setup_compression',
+    'ResponseCompressor'
+]
\ No newline at end of file
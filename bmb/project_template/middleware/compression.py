@@ -0,0 +1,226 @@
+"""
+Compression des reponses (zstd, brotli, gzip) negociee par Accept-Encoding
+Seuil de taille minimal, niveaux choisis pour la latence et cache des corps
+compresses par ETag pour les reponses qui changent peu
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+from config import AppConfig
+
+
+class GzipCodec:
+    """gzip (stdlib, toujours disponible)"""
+
+    name = 'gzip'
+
+    def compress(self, data, level):
+        # mtime=0: meme corps, memes octets (cache, ETag)
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class BrotliCodec:
+    """brotli (paquet brotli ou brotlicffi)"""
+
+    name = 'br'
+
+    def __init__(self):
+        try:
+            import brotli
+        except ImportError:
+            import brotlicffi as brotli
+        self._brotli = brotli
+
+    def compress(self, data, level):
+        return self._brotli.compress(data, quality=level)
+
+
+class ZstdCodec:
+    """zstd (paquet zstandard)"""
+
+    name = 'zstd'
+
+    def __init__(self):
+        import zstandard
+        self._zstandard = zstandard
+        # Un compresseur ne doit pas etre partage entre threads
+        self._local = threading.local()
+
+    def compress(self, data, level):
+        compressors = self._local.__dict__
+        if level not in compressors:
+            compressors[level] = self._zstandard.ZstdCompressor(level=level)
+        return compressors[level].compress(data)
+
+
+CODECS = {
+    'zstd': ZstdCodec,
+    'br': BrotliCodec,
+    'gzip': GzipCodec,
+}
+
+# Niveaux par defaut: l'essentiel du gain pour une fraction du temps CPU
+DEFAULT_LEVELS = {'zstd': 3, 'br': 4, 'gzip': 5}
+
+
+def load_codecs(names):
+    """Codecs disponibles parmi `names`, dans l'ordre de preference du serveur"""
+    codecs = []
+    for name in names:
+        if name not in CODECS:
+            raise ValueError(f"COMPRESSION_ALGORITHMS doit etre parmi {', '.join(CODECS)}")
+        try:
+            codecs.append(CODECS[name]())
+        except ImportError:
+            continue
+    return codecs
+
+
+class ResponseCompressor:
+    """
+    Choix du codec, compression et cache des corps compresses
+
+    Args:
+        codecs: Codecs par ordre de preference (voir load_codecs)
+        levels: Niveau par codec {nom: niveau}
+        min_size: Taille minimale du corps (octets) en dessous de laquelle
+            la compression coute plus qu'elle ne rapporte
+        mimetypes: Types de contenu compresses
+        cache_size: Corps compresses conserves, par (ETag, codec)
+    """
+
+    def __init__(self, codecs, levels=None, min_size=1024, mimetypes=('application/json',), cache_size=256):
+        self.codecs = list(codecs)
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+        self.min_size = min_size
+        self.mimetypes = frozenset(mimetypes)
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cache_hits = 0
+
+    @classmethod
+    def from_config(cls):
+        """Creer le compresseur depuis AppConfig"""
+        return cls(
+            load_codecs(AppConfig.COMPRESSION_ALGORITHMS),
+            levels=AppConfig.COMPRESSION_LEVELS,
+            min_size=AppConfig.COMPRESSION_MIN_SIZE,
+            mimetypes=AppConfig.COMPRESSION_MIMETYPES,
+            cache_size=AppConfig.COMPRESSION_CACHE_SIZE
+        )
+
+    def accepts(self, response):
+        """Reponse compressible d'apres son statut et ses en-tetes"""
+        return (
+            200 <= response.status_code < 300
+            and response.status_code not in (204, 206)
+            and 'Content-Encoding' not in response.headers
+            and response.mimetype in self.mimetypes
+            and 'no-transform' not in response.headers.get('Cache-Control', '')
+        )
+
+    def negotiate(self, accept_encodings):
+        """Codec de meilleure qualite pour le client (a egalite: preference du serveur)"""
+        best, best_quality = None, 0
+        for codec in self.codecs:
+            quality = accept_encodings[codec.name]
+            if quality > best_quality:
+                best, best_quality = codec, quality
+        return best
+
+    def apply(self, response, body, accept_encodings):
+        """
+        Compresser le corps d'une reponse si le client l'accepte
+
+        L'ETag devient faible (comme nginx): la representation compressee
+        differe octet par octet mais If-None-Match reste valide.
+        """
+        if len(body) < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+
+        codec = self.negotiate(accept_encodings)
+        if codec is None:
+            return response
+
+        etag, weak = response.get_etag()
+        data = self.compress(codec, body, etag if etag and not weak else None)
+
+        response.set_data(data)
+        response.headers['Content-Encoding'] = codec.name
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def compress(self, codec, body, etag=None):
+        """Corps compresse, depuis le cache si l'ETag est connu"""
+        key = (etag, codec.name)
+        if etag is not None:
+            with self._lock:
+                data = self._cache.get(key)
+                if data is not None:
+                    self._cache.move_to_end(key)
+                    self.cache_hits += 1
+                    self._count(body, data)
+                    return data
+
+        data = codec.compress(body, self.levels[codec.name])
+
+        with self._lock:
+            self._count(body, data)
+            if etag is not None and self.cache_size > 0:
+                self._cache[key] = data
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return data
+
+    def _count(self, body, data):
+        self.compressed += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+
+    def stats(self):
+        """Metriques de compression du worker"""
+        with self._lock:
+            return {
+                'codecs': [codec.name for codec in self.codecs],
+                'compressed': self.compressed,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'ratio': round(self.bytes_in / self.bytes_out, 2) if self.bytes_out else None,
+                'cache_hits': self.cache_hits,
+                'cache_entries': len(self._cache)
+            }
+
+
+def setup_compression(app, compressor=None):
+    """
+    Compresser les reponses selon Accept-Encoding
+
+    A enregistrer avant les autres middlewares: les after_request
+    s'executent en ordre inverse, la compression passe donc en dernier.
+    Les reponses en flux et les fichiers (send_file) ne sont pas compresses.
+    """
+    if compressor is None:
+        compressor = ResponseCompressor.from_config()
+
+    app.extensions['bmb_compression'] = compressor
+
+    @app.after_request
+    def compress_response(response):
+        """Compresser le corps de la reponse"""
+        if response.is_streamed or response.direct_passthrough or not compressor.accepts(response):
+            return response
+        return compressor.apply(response, response.get_data(), request.accept_encodings)
+
+    return compressor
@@ -0,0 +1,86 @@
+"""
+Delai maximal par requete HTTP
+Le budget est propage aux instructions SQL des modeles BMDB
+"""
+
+from flask import current_app, request
+
+from config import AppConfig
+from orm import Deadline, DeadlineExceeded
+from utils import error_response
+
+
+def request_deadline(seconds):
+    """
+    Decorateur pour surcharger le delai maximal d'une route
+
+    Usage:
+        @users_bp.route('/stats')
+        @JWTManager.token_required
+        @request_deadline(10)
+        def get_user_stats(current_user):
+            ...
+    """
+    def decorator(f):
+        f._bmb_deadline = seconds
+        return f
+    return decorator
+
+
+def resolve_deadline(view, headers):
+    """
+    Delai d'une requete: route (@request_deadline), sinon valeur par defaut
+
+    L'en-tete REQUEST_TIMEOUT_HEADER ne peut que raccourcir ce delai; les
+    valeurs invalides, nulles ou negatives sont ignorees. Partage par les
+    modes WSGI et ASGI.
+    """
+    seconds = getattr(view, '_bmb_deadline', AppConfig.REQUEST_TIMEOUT)
+
+    header = headers.get(AppConfig.REQUEST_TIMEOUT_HEADER)
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = None
+        if requested is not None and requested > 0:
+            # Sans delai serveur (0), le client reste borne par le maximum
+            limit = seconds if seconds and seconds > 0 else AppConfig.REQUEST_TIMEOUT_MAX
+            seconds = min(requested, limit)
+
+    return seconds
+
+
+def _resolve_deadline():
+    return resolve_deadline(current_app.view_functions.get(request.endpoint), request.headers)
+
+
+def _timeout_response():
+    return error_response("Delai de la requete depasse", 504)
+
+
+def setup_request_deadlines(app):
+    """Activer les delais maximaux par requete"""
+
+    @app.before_request
+    def start_deadline():
+        """Demarrer le budget de temps de la requete"""
+        Deadline.set(_resolve_deadline())
+
+    @app.after_request
+    def deadline_response(response):
+        """Convertir en 504 une requete interrompue par son echeance"""
+        if Deadline.exceeded():
+            timeout_response, status = _timeout_response()
+            timeout_response.status_code = status
+            return timeout_response
+        return response
+
+    @app.teardown_request
+    def clear_deadline(exc=None):
+        """Supprimer l'echeance a la fin de la requete"""
+        Deadline.clear()
+
+    @app.errorhandler(DeadlineExceeded)
+    def deadline_exceeded(error):
+        return _timeout_response()
@@ -0,0 +1,107 @@
+"""
+Resolution du tenant de chaque requete (en-tete, sous-domaine, claim JWT)
+Le tenant choisit la base de donnees utilisee par les modeles
+"""
+
+from flask import request
+
+from config import AppConfig
+from models_loader import ModelsLoader
+from orm import Tenant, InvalidTenant
+from utils import JWTManager, error_response
+
+
+def _from_header():
+    return request.headers.get(AppConfig.TENANT_HEADER)
+
+
+def _from_subdomain():
+    # Uniquement sous le domaine configure: acme.example.com -> acme
+    base = AppConfig.TENANT_BASE_DOMAIN.lower().strip('.')
+    host = request.host.split(':')[0].lower()
+
+    if base and host.endswith('.' + base):
+        return host[:-len(base) - 1]
+    return None
+
+
+def _from_jwt():
+    auth_header = request.headers.get('Authorization', '')
+    parts = auth_header.split(' ')
+    if len(parts) != 2:
+        return None
+    try:
+        return JWTManager.decode_token(parts[1]).get(AppConfig.TENANT_JWT_CLAIM)
+    except ValueError:
+        return None
+
+
+TENANT_RESOLVERS = {
+    'header': _from_header,
+    'subdomain': _from_subdomain,
+    'jwt': _from_jwt,
+}
+
+
+class TenantMismatch(Exception):
+    """Tenant demande (en-tete, sous-domaine) different du claim du token"""
+
+
+def resolve_tenant():
+    """
+    Tenant de la requete selon AppConfig.TENANT_RESOLVERS (None sinon)
+
+    Le claim JWT, signe, fait autorite: un en-tete ou un sous-domaine
+    qui le contredit leve TenantMismatch. Sans claim, le premier tenant
+    trouve dans l'ordre configure est retenu.
+    """
+    claimed = _from_jwt() if 'jwt' in AppConfig.TENANT_RESOLVERS else None
+    tenant = None
+    for name in AppConfig.TENANT_RESOLVERS:
+        resolver = TENANT_RESOLVERS.get(name)
+        if name == 'jwt' or resolver is None:
+            continue
+        requested = resolver()
+        if not requested:
+            continue
+        if claimed and requested != claimed:
+            raise TenantMismatch(requested)
+        tenant = tenant or requested
+    return claimed or tenant
+
+
+def setup_tenancy(app):
+    """Activer la resolution du tenant par requete"""
+
+    @app.before_request
+    def start_tenant():
+        """Associer la requete a la base de son tenant"""
+        try:
+            tenant = resolve_tenant()
+        except TenantMismatch:
+            Tenant.clear()
+            return error_response("Tenant different de celui du token", 403)
+
+        if tenant is None:
+            Tenant.clear()
+            if AppConfig.TENANT_REQUIRED and request.path not in AppConfig.TENANT_EXEMPT_PATHS:
+                return error_response("Tenant manquant", 400)
+            return None
+
+        try:
+            Tenant.set(tenant)
+        except InvalidTenant:
+            Tenant.clear()
+            return error_response("Tenant invalide", 400)
+
+        # Jamais de base creee pour une requete: tenant autorise ou provisionne
+        registry = ModelsLoader.get_tenant_registry()
+        if registry is not None and not registry.exists(tenant):
+            Tenant.clear()
+            return error_response("Tenant inconnu", 404)
+        return None
+
+    @app.teardown_request
+    def clear_tenant(exc=None):
+        """Revenir a la base par defaut a la fin de la requete"""
+        Tenant.clear()
@@ -5,7 +5,22 @@ Fonction utilitaire pour importer les modèles générés par BMDB
 
 import sys
 from importlib import import_module
-from config import BMDBConfig
+from config import AppConfig, BMDBConfig
+from orm import (
+    install_deadline_hooks,
+    install_model_extensions,
+    async_url,
+    ReplicaSet,
+    RoutingSession,
+    ReadYourWrites,
+    ShardMap,
+    TenantRegistry,
+    SQLiteProfile,
+    WriteCoordinator,
+    WriteBehindBuffer,
+    TableVersions,
+    install_serializers
+)
 
 
 class ModelsLoader:
@@ -16,6 +31,14 @@ class ModelsLoader:
     _base = None
     _engine = None
     _session_local = None
+    _replica_set = None
+    _shard_map = None
+    _tenant_registry = None
+    _sqlite_profile = None
+    _write_coordinator = None
+    _write_behind = None
+    _async_engine = None
+    _async_session_local = None
     
     @classmethod
     def load_models(cls, force_reload=False):
@@ -70,6 +93,20 @@ class ModelsLoader:
             if not cls._base or not cls._engine:
                 raise ImportError("Base ou engine introuvable dans les modèles BMDB")
             
+            cls.configure_engine(cls._engine)
+            
+            # Versions des tables communes a tous les workers (cache des reponses)
+            if AppConfig.RESPONSE_CACHE_ENABLED:
+                TableVersions.share(AppConfig.RESPONSE_CACHE_SHARED_DIR)
+            
+            # Router les lectures vers les replicas si configures
+            if BMDBConfig.DB_REPLICAS:
+                cls._session_local = cls.install_replicas(models_module)
+            
+            # Une base par tenant si configure
+            if BMDBConfig.TENANT_DB_URL:
+                cls._session_local = cls.install_tenants(models_module)
+            
             # Charger tous les modèles (classes qui héritent de Base)
             for attr_name in dir(models_module):
                 if attr_name.startswith('_'):
@@ -84,6 +121,27 @@ class ModelsLoader:
                     cls._models[attr_name] = attr
                     print(f"   📦 Modèle chargé: {attr_name}")
             
+            # Ajouter les methodes BMB (API asynchrone...) aux modeles
+            install_model_extensions(cls._models.values())
+            
+            # Colonnes lourdes non chargees par defaut
+            deferred = {}
+            for model_name, column in BMDBConfig.DB_DEFERRED_COLUMNS:
+                deferred.setdefault(model_name, []).append(column)
+            for model_name, columns in deferred.items():
+                if model_name in cls._models:
+                    cls._models[model_name].defer_columns(*columns)
+            
+            # Serialiseurs compiles une fois par modele (sans les champs sensibles)
+            install_serializers(cls._models.values(), exclude=BMDBConfig.SERIALIZER_EXCLUDE)
+            
+            # Repartir les modeles sur les shards si configures
+            if BMDBConfig.DB_SHARDS:
+                cls.install_shards(cls._models.values())
+            elif BMDBConfig.WRITE_QUEUE_ENABLED:
+                # Ecritures regroupees par un thread ecrivain unique
+                cls.install_write_queue(cls._models.values())
+            
             cls._loaded = True
             
             print(f"✅ {len(cls._models)} modèle(s) BMDB chargé(s) avec succès")
@@ -129,6 +187,237 @@ class ModelsLoader:
             cls.load_models()
         return cls._engine
     
+    @classmethod
+    def configure_engine(cls, engine):
+        """Installer les extensions BMB sur un engine (delais maximaux, profil SQLite...)"""
+        install_deadline_hooks(engine)
+        
+        pragmas = BMDBConfig.sqlite_pragmas()
+        if pragmas:
+            if cls._sqlite_profile is None:
+                cls._sqlite_profile = SQLiteProfile(
+                    pragmas,
+                    checkpoint_interval=BMDBConfig.SQLITE_WAL_CHECKPOINT_INTERVAL,
+                    checkpoint_mode=BMDBConfig.SQLITE_WAL_CHECKPOINT_MODE
+                )
+            cls._sqlite_profile.install(engine)
+        return engine
+    
+    @classmethod
+    def install_replicas(cls, models_module, urls=None):
+        """
+        Router les lectures des modeles vers les replicas
+        
+        Remplace SessionLocal dans le module genere: les methodes CRUD
+        du ModelMixin BMDB (get, all, filter, first, count) lisent alors
+        sur un replica, save et delete ecrivent sur le primaire.
+        
+        Args:
+            models_module: Module des modeles generes par BMDB
+            urls: URLs des replicas (par defaut BMDBConfig.DB_REPLICAS)
+            
+        Returns:
+            sessionmaker: Fabrique de RoutingSession
+        """
+        from sqlalchemy import create_engine
+        
+        urls = urls or BMDBConfig.DB_REPLICAS
+        engines = [cls.configure_engine(create_engine(url)) for url in urls]
+        
+        cls._replica_set = ReplicaSet(
+            engines,
+            weights=BMDBConfig.DB_REPLICA_WEIGHTS or None,
+            strategy=BMDBConfig.DB_REPLICA_STRATEGY
+        )
+        ReadYourWrites.window = BMDBConfig.READ_YOUR_WRITES_WINDOW
+        
+        print(f"   🔀 {len(engines)} replica(s) en lecture ({BMDBConfig.DB_REPLICA_STRATEGY})")
+        return cls._install_routing_session(models_module)
+    
+    @classmethod
+    def install_tenants(cls, models_module, url_template=None):
+        """
+        Une base de donnees par tenant
+        
+        Les sessions du module genere utilisent la base du tenant courant
+        (voir Tenant), creee a la demande; sans tenant, la base par defaut.
+        
+        Args:
+            models_module: Module des modeles generes par BMDB
+            url_template: Modele d'URL (par defaut BMDBConfig.TENANT_DB_URL)
+            
+        Returns:
+            sessionmaker: Fabrique de RoutingSession
+        """
+        cls._tenant_registry = TenantRegistry(
+            url_template or BMDBConfig.TENANT_DB_URL,
+            max_engines=BMDBConfig.TENANT_MAX_ENGINES,
+            idle_timeout=BMDBConfig.TENANT_IDLE_TIMEOUT,
+            configure=cls.configure_engine,
+            metadata=models_module.Base.metadata,
+            tenants=BMDBConfig.TENANTS
+        )
+        
+        print(f"   🏢 Bases par tenant: {cls._tenant_registry.url_template}")
+        return cls._install_routing_session(models_module)
+    
+    @classmethod
+    def _install_routing_session(cls, models_module):
+        """Remplacer SessionLocal du module genere par une RoutingSession"""
+        from sqlalchemy.orm import sessionmaker
+        
+        session_local = sessionmaker(
+            bind=models_module.engine,
+            class_=RoutingSession,
+            replica_set=cls._replica_set,
+            tenant_registry=cls._tenant_registry
+        )
+        models_module.SessionLocal = session_local
+        return session_local
+    
+    @classmethod
+    def get_tenant_registry(cls):
+        """Recuperer le registre des bases par tenant (None si non configure)"""
+        return cls._tenant_registry
+    
+    @classmethod
+    def get_replica_set(cls):
+        """Recuperer les replicas en lecture (None si non configures)"""
+        return cls._replica_set
+    
+    @classmethod
+    def install_shards(cls, models, urls=None):
+        """
+        Repartir les modeles sur plusieurs bases (sharding horizontal)
+        
+        get/save/delete vont au shard proprietaire, filter/all/first/count
+        interrogent les shards en parallele (voir ShardedModelMixin).
+        
+        Args:
+            models: Classes de modeles a repartir
+            urls: URLs des shards (par defaut BMDBConfig.DB_SHARDS)
+            
+        Returns:
+            ShardMap: Carte des shards
+        """
+        from sqlalchemy import create_engine
+        
+        urls = urls or BMDBConfig.DB_SHARDS
+        engines = [cls.configure_engine(create_engine(url)) for url in urls]
+        
+        cls._shard_map = ShardMap(engines, keys=BMDBConfig.DB_SHARD_KEYS)
+        cls._shard_map.install(models)
+        
+        print(f"   🧩 {len(engines)} shard(s) configure(s)")
+        return cls._shard_map
+    
+    @classmethod
+    def get_shard_map(cls):
+        """Recuperer la carte des shards (None si non configures)"""
+        return cls._shard_map
+    
+    @classmethod
+    def install_write_queue(cls, models):
+        """
+        Faire passer save/delete par un thread ecrivain (commit groupe)
+        
+        Args:
+            models: Classes de modeles concernees
+            
+        Returns:
+            WriteCoordinator: File d'ecriture
+        """
+        cls._write_coordinator = WriteCoordinator(
+            cls._session_local,
+            max_batch=BMDBConfig.WRITE_QUEUE_MAX_BATCH,
+            max_wait=BMDBConfig.WRITE_QUEUE_MAX_WAIT,
+            timeout=BMDBConfig.WRITE_QUEUE_TIMEOUT
+        )
+        cls._write_coordinator.install(models)
+        
+        print(f"   ✍️  File d'ecriture unique (lots de {BMDBConfig.WRITE_QUEUE_MAX_BATCH} max)")
+        return cls._write_coordinator
+    
+    @classmethod
+    def get_write_coordinator(cls):
+        """Recuperer la file d'ecriture (None si non configuree)"""
+        return cls._write_coordinator
+    
+    @classmethod
+    def get_write_behind(cls):
+        """Recuperer le tampon d'ecriture differee (cree a la demande)"""
+        if cls._write_behind is None:
+            cls._write_behind = WriteBehindBuffer(
+                cls.get_session,
+                flush_interval=BMDBConfig.WRITE_BEHIND_FLUSH_MS / 1000,
+                max_rows=BMDBConfig.WRITE_BEHIND_MAX_ROWS,
+                unversioned_columns=AppConfig.ETAG_IGNORE_COLUMNS
+            )
+        return cls._write_behind
+    
+    @classmethod
+    def dispose_engines(cls, close=True):
+        """
+        Liberer les pools de connexions
+        
+        Args:
+            close: False apres un fork pour abandonner les connexions heritees
+                du processus parent sans les fermer
+        """
+        # Ecrire les mises a jour differees avant de fermer les connexions
+        if cls._write_behind is not None and close:
+            cls._write_behind.flush()
+        
+        if cls._engine is not None:
+            cls._engine.dispose(close=close)
+        
+        if cls._replica_set is not None:
+            cls._replica_set.dispose(close=close)
+        
+        if cls._shard_map is not None:
+            cls._shard_map.dispose(close=close)
+        
+        if cls._tenant_registry is not None:
+            cls._tenant_registry.dispose(close=close)
+        
+        # Les connexions asyncio ne se ferment que depuis leur boucle
+        # d'evenements (voir dispose_async_engine): on les abandonne
+        if cls._async_engine is not None:
+            cls._async_engine.sync_engine.dispose(close=False)
+    
+    @classmethod
+    def get_async_engine(cls):
+        """
+        Recuperer l'engine asyncio (aiosqlite, asyncpg...)
+        
+        Cree a la demande a partir de l'URL de l'engine synchrone.
+        """
+        if cls._async_engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            
+            cls._async_engine = create_async_engine(async_url(cls.get_engine().url))
+            cls.configure_engine(cls._async_engine.sync_engine)
+        return cls._async_engine
+    
+    @classmethod
+    def get_async_session(cls):
+        """Recuperer la fabrique de sessions asyncio (AsyncSession)"""
+        if cls._async_session_local is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+            
+            # expire_on_commit=False: pas de chargement implicite apres commit
+            cls._async_session_local = async_sessionmaker(
+                cls.get_async_engine(),
+                expire_on_commit=False
+            )
+        return cls._async_session_local
+    
+    @classmethod
+    async def dispose_async_engine(cls):
+        """Fermer le pool de l'engine asyncio (a l'arret de la boucle)"""
+        if cls._async_engine is not None:
+            await cls._async_engine.dispose()
+    
     @classmethod
     def get_session(cls):
         """Récupérer SessionLocal"""
@@ -144,6 +433,8 @@ class ModelsLoader:
         
         try:
             cls._base.metadata.create_all(cls._engine)
+            if cls._shard_map is not None:
+                cls._shard_map.create_all(cls._base.metadata)
             print("✅ Tables créées avec succès")
             return True
         except Exception as e:
@@ -0,0 +1,128 @@
+"""
+Suivi des tables modifiees par les transactions validees
+Chaque commit qui ecrit dans une table incremente sa version: un cache
+compare les versions relevees avant calcul aux versions courantes.
+Les versions peuvent etre partagees entre processus (workers) par un dossier
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de verrou entre processus
+    fcntl = None
+
+logger = logging.getLogger('bmb')
+
+
+class TableVersions:
+    """
+    Versions des tables du processus (incrementees apres commit)
+
+    Les ecritures sont relevees par session (flush et INSERT/UPDATE/DELETE
+    executes via session.execute) et publiees au commit; un rollback les
+    abandonne. Les ecritures hors session (SQL brut sur une connexion) ne
+    sont pas vues.
+
+    Avec share(dossier), chaque table a un compteur dans un fichier du
+    dossier, incremente sous verrou par tous les processus: un commit
+    d'un worker invalide les caches des autres workers.
+    """
+
+    _lock = threading.Lock()
+    _versions = {}
+    _shared_dir = None
+
+    @classmethod
+    def share(cls, directory):
+        """Partager les versions entre processus via un dossier (None: versions du processus)"""
+        if directory:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+        cls._shared_dir = directory or None
+
+    @classmethod
+    def get(cls, tables):
+        """Versions courantes d'un ensemble de tables (tuple dans l'ordre donne)"""
+        if cls._shared_dir is not None:
+            return tuple(cls._read_shared(table) for table in tables)
+        versions = cls._versions
+        return tuple(versions.get(table, 0) for table in tables)
+
+    @classmethod
+    def bump(cls, tables):
+        """Signaler une modification des tables (apres commit)"""
+        with cls._lock:
+            for table in tables:
+                cls._versions[table] = cls._versions.get(table, 0) + 1
+            if cls._shared_dir is not None:
+                cls._bump_shared(tables)
+
+    @classmethod
+    def _read_shared(cls, table):
+        try:
+            return int((cls._shared_dir / table).read_bytes() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    @classmethod
+    def _bump_shared(cls, tables):
+        directory = cls._shared_dir
+        try:
+            with open(directory / '.lock', 'a') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                for table in tables:
+                    # Remplacement atomique: un lecteur voit l'ancienne ou la nouvelle valeur
+                    tmp = directory / f'.{table}.{os.getpid()}'
+                    tmp.write_bytes(str(cls._read_shared(table) + 1).encode())
+                    os.replace(tmp, directory / table)
+        except OSError as e:
+            logger.error(f"❌ Versions partagees des tables indisponibles: {e}")
+
+    @classmethod
+    def snapshot(cls):
+        """Copie de toutes les versions (metriques, tests)"""
+        with cls._lock:
+            return dict(cls._versions)
+
+
+def _touched(session):
+    return session.info.setdefault('bmb_touched_tables', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flush(session, flush_context):
+    touched = None
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(type(instance), '__table__', None)
+        if table is not None:
+            touched = touched if touched is not None else _touched(session)
+            touched.add(table.name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _record_statement(orm_context):
+    if orm_context.is_insert or orm_context.is_update or orm_context.is_delete:
+        table = getattr(orm_context.statement, 'table', None)
+        name = getattr(table, 'name', None)
+        if name is not None:
+            _touched(orm_context.session).add(name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_changes(session):
+    touched = session.info.pop('bmb_touched_tables', None)
+    if touched:
+        TableVersions.bump(touched)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('bmb_touched_tables', None)
@@ -0,0 +1,396 @@
+"""
+Requetes de lecture economes: existence, comptage borne, projection
+de colonnes, lignes brutes (sans construction d'objets ORM), relations
+chargees par lot et lecture en flux a memoire constante
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from sqlalchemy import func, inspect, literal, select
+from sqlalchemy.orm import defer as defer_column, load_only, selectinload
+
+from .serializers import serializer_for
+
+
+def filter_criteria(model, filters):
+    """Criteres d'egalite (les champs inconnus sont ignores, comme ModelMixin)"""
+    return [getattr(model, key) == value for key, value in filters.items() if hasattr(model, key)]
+
+
+def exists_statement(model, filters):
+    """SELECT EXISTS (SELECT 1 FROM ... WHERE ... LIMIT 1)"""
+    probe = select(literal(1)).select_from(model).where(*filter_criteria(model, filters)).limit(1)
+    return select(probe.exists())
+
+
+def count_statement(model, filters, limit=None):
+    """
+    SELECT count(*), borne a `limit` lignes si demande
+
+    Avec limit, la base s'arrete des la limite atteinte:
+    SELECT count(*) FROM (SELECT 1 FROM ... WHERE ... LIMIT n)
+    """
+    criteria = filter_criteria(model, filters)
+    if limit is None:
+        return select(func.count()).select_from(model).where(*criteria)
+    capped = select(literal(1)).select_from(model).where(*criteria).limit(limit).subquery()
+    return select(func.count()).select_from(capped)
+
+
+def _columns(model, names):
+    columns = model.__table__.columns
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ValueError(f"Colonnes inconnues pour {model.__name__}: {', '.join(unknown)}")
+    return [getattr(model, name) for name in names]
+
+
+def load_options(model, only=None, defer=None):
+    """
+    Options de chargement des colonnes
+
+    Args:
+        only: Colonnes a charger (la cle primaire est toujours chargee)
+        defer: Colonnes a ne pas charger (defaut: colonnes differees du modele)
+    """
+    if only is not None:
+        return [load_only(*_columns(model, only))]
+    if defer is None:
+        defer = getattr(model, '_deferred_columns', ())
+    return [defer_column(column) for column in _columns(model, defer)]
+
+
+def select_statement(model, filters, only=None, defer=None):
+    """SELECT du modele filtre, avec projection des colonnes"""
+    return select(model).where(*filter_criteria(model, filters)).options(*load_options(model, only, defer))
+
+
+# Formes des lignes retournees par Model.rows
+ROW_RESULTS = ('dict', 'tuple', 'record')
+
+
+@lru_cache(maxsize=None)
+def record_class(model, names):
+    """Classe de ligne legere (namedtuple, __slots__ vide) par modele et colonnes"""
+    base = namedtuple(f'{model.__name__}Row', names)
+    return type(base.__name__, (base,), {
+        '__slots__': (),
+        'to_dict': lambda self: dict(zip(self._fields, self))
+    })
+
+
+def row_columns(model, columns=None, defer=None):
+    """
+    Colonnes lues par rows(): columns, ou toutes sauf les colonnes differees
+
+    Sans columns, les champs exclus du serialiseur (ex: password) ne sont
+    jamais lus, comme pour to_dict().
+    """
+    if columns is not None:
+        _columns(model, columns)
+        return tuple(columns)
+    if defer is None:
+        defer = getattr(model, '_deferred_columns', ())
+    _columns(model, defer)
+    hidden = {*defer, *getattr(model, '_serializer_exclude', ())}
+    return tuple(name for name in model.__table__.columns.keys() if name not in hidden)
+
+
+def paginate(statement, model, limit=None, offset=None, order_by='id', desc=False):
+    """Trier (id en departage) et paginer en SQL"""
+    table = model.__table__
+    _columns(model, [order_by])
+    order = [table.c[order_by], table.c.id]
+    statement = statement.order_by(*[column.desc() for column in order] if desc else order)
+    if limit is not None:
+        statement = statement.limit(limit)
+    if offset and offset > 0:
+        statement = statement.offset(offset)
+    return statement
+
+
+def rows_statement(model, filters, names, limit=None, offset=None, order_by='id', desc=False):
+    """SELECT Core des colonnes demandees, trie et pagine en SQL"""
+    table = model.__table__
+    statement = select(*[table.c[name] for name in names]).where(*filter_criteria(model, filters))
+    return paginate(statement, model, limit, offset, order_by, desc)
+
+
+def _relationships(model, include):
+    relationships = inspect(model).relationships
+    unknown = [name for name in include if name not in relationships]
+    if unknown:
+        raise ValueError(f"Relations inconnues pour {model.__name__}: {', '.join(unknown)}")
+    return [(name, relationships[name]) for name in include]
+
+
+def relation_options(model, include):
+    """
+    Chargement par lot des relations (selectinload)
+
+    Une requete SELECT ... WHERE cle IN (...) par relation, au lieu d'un
+    chargement paresseux par ligne. Les champs exclus du serialiseur du
+    modele lie (ex: password) ne sont pas lus.
+    """
+    options = []
+    for name, relationship in _relationships(model, include):
+        target = relationship.mapper.class_
+        option = selectinload(getattr(model, name))
+        hidden = [column for column in getattr(target, '_serializer_exclude', ()) if column in target.__table__.columns]
+        if hidden:
+            option = option.options(*[defer_column(column) for column in _columns(target, hidden)])
+        options.append(option)
+    return options
+
+
+def entities_statement(model, filters, names, include, limit=None, offset=None, order_by='id', desc=False):
+    """SELECT ORM des colonnes demandees et des relations incluses, trie et pagine en SQL"""
+    # Les cles etrangeres des relations sont lues meme hors projection
+    keys = [column.key for _, relationship in _relationships(model, include) for column in relationship.local_columns]
+    loaded = _columns(model, list(dict.fromkeys((*names, *keys))))
+    statement = (
+        select(model)
+        .where(*filter_criteria(model, filters))
+        .options(load_only(*loaded), *relation_options(model, include))
+    )
+    return paginate(statement, model, limit, offset, order_by, desc)
+
+
+def embed_rows(model, names, include, instances):
+    """Dictionnaires des colonnes demandees, relations incluses serialisees"""
+    serialize = serializer_for(model, include=names, exclude=()).serialize
+    relations = [
+        (name, relationship.uselist, serializer_for(relationship.mapper.class_))
+        for name, relationship in _relationships(model, include)
+    ]
+    data = []
+    for instance in instances:
+        row = serialize(instance)
+        for name, uselist, serializer in relations:
+            value = getattr(instance, name)
+            if uselist:
+                row[name] = serializer.serialize_many(value)
+            else:
+                row[name] = None if value is None else serializer.serialize(value)
+        data.append(row)
+    return data
+
+
+def shape_rows(model, names, rows, result='dict'):
+    """Convertir des tuples en dictionnaires, tuples ou records"""
+    if result == 'dict':
+        return [dict(zip(names, row)) for row in rows]
+    if result == 'tuple':
+        return [tuple(row) for row in rows]
+    if result == 'record':
+        make = record_class(model, names)._make
+        return [make(row) for row in rows]
+    raise ValueError(f"result doit etre parmi {', '.join(ROW_RESULTS)}")
+
+
+def check_embed(result):
+    if result != 'dict':
+        raise ValueError("include n'est disponible qu'avec result='dict'")
+
+
+def row_shaper(model, names, result='dict'):
+    """Fonction de conversion d'une ligne (dict, tuple ou record)"""
+    if result == 'dict':
+        return lambda row: dict(zip(names, row))
+    if result == 'tuple':
+        return tuple
+    if result == 'record':
+        return record_class(model, names)._make
+    raise ValueError(f"result doit etre parmi {', '.join(ROW_RESULTS)}")
+
+
+# Lignes lues par lot par stream() (yield_per: curseur cote serveur si le pilote le permet)
+STREAM_BATCH_SIZE = 1000
+
+
+def partition_rows(model, names, cursor, result='dict'):
+    """Lignes d'un resultat ouvert, converties lot par lot"""
+    for partition in cursor.partitions():
+        yield from shape_rows(model, names, partition, result)
+
+
+def close_all(resources):
+    """Fermer des ressources sans masquer l'erreur en cours"""
+    for resource in reversed(resources):
+        try:
+            resource.close()
+        except Exception:
+            pass
+
+
+class RowStream:
+    """
+    Iterateur de lignes adosse a des ressources ouvertes (sessions, curseurs)
+
+    Les ressources sont liberees a l'epuisement de l'iterateur, a la
+    premiere erreur ou a l'appel de close() (client deconnecte).
+    """
+
+    def __init__(self, rows, resources):
+        self._rows = iter(rows)
+        self._resources = list(resources)
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise StopIteration
+        try:
+            return next(self._rows)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Liberer curseurs et sessions (dans l'ordre inverse d'ouverture)"""
+        if self.closed:
+            return
+        self.closed = True
+        close_all(self._resources)
+
+
+def _session_factory():
+    from models_loader import ModelsLoader
+    return ModelsLoader.get_session()
+
+
+class QueryMixin:
+    """Lectures economes ajoutees aux modeles BMDB par ModelsLoader"""
+
+    # Colonnes lourdes non chargees par defaut (DB_DEFERRED_COLUMNS)
+    _deferred_columns = ()
+
+    @classmethod
+    def defer_columns(cls, *names):
+        """Ne plus charger ces colonnes par defaut (filter/first/all)"""
+        _columns(cls, names)
+        cls._deferred_columns = tuple(names)
+
+    @classmethod
+    def all(cls, only=None, defer=None):
+        """Recuperer tous les enregistrements (voir filter pour only/defer)"""
+        return cls.filter(only=only, defer=defer)
+
+    @classmethod
+    def filter(cls, only=None, defer=None, **kwargs):
+        """
+        Filtrer les enregistrements par valeur de champs
+
+        Usage:
+            User.filter(age=25, only=['id', 'name'])
+            User.filter(defer=['password'])
+
+        Args:
+            only: Colonnes a charger
+            defer: Colonnes a ne pas charger (defer=[] charge aussi les
+                colonnes differees par defaut)
+        """
+        with _session_factory()() as session:
+            return session.scalars(select_statement(cls, kwargs, only, defer)).all()
+
+    @classmethod
+    def first(cls, only=None, defer=None, **kwargs):
+        """Premier enregistrement correspondant aux filtres (voir filter)"""
+        with _session_factory()() as session:
+            return session.scalars(select_statement(cls, kwargs, only, defer).limit(1)).first()
+
+    @classmethod
+    def exists(cls, **kwargs):
+        """
+        Tester l'existence d'un enregistrement sans le charger
+
+        Usage:
+            if User.exists(email='alice@example.com'):
+                ...
+        """
+        with _session_factory()() as session:
+            return bool(session.scalar(exists_statement(cls, kwargs)))
+
+    @classmethod
+    def count(cls, limit=None, **kwargs):
+        """
+        Compter les enregistrements correspondant aux filtres
+
+        Args:
+            limit: Borne du comptage (count(limit=1000) retourne au plus 1000)
+        """
+        with _session_factory()() as session:
+            return session.scalar(count_statement(cls, kwargs, limit))
+
+    @classmethod
+    def rows(cls, columns=None, defer=None, limit=None, offset=None, order_by='id',
+             desc=False, result='dict', include=None, **kwargs):
+        """
+        Lignes brutes (SELECT Core), sans objets ORM ni identity map
+
+        Pour les listes en lecture seule: nettement moins couteux que
+        filter() suivi de to_dict().
+
+        Usage:
+            User.rows(age=25, columns=['id', 'name'], limit=20, offset=40)
+            Post.rows(columns=['id', 'title'], include=['author'], limit=20)
+
+        Args:
+            columns: Colonnes a lire (defaut: toutes sauf les colonnes differees
+                et les champs exclus du serialiseur)
+            defer: Colonnes a ne pas lire
+            limit / offset: Pagination SQL
+            order_by / desc: Tri (id en departage)
+            result: 'dict' (defaut), 'tuple' ou 'record' (namedtuple par modele)
+            include: Relations a inclure (relationship() du modele), chargees
+                par lot; les lignes sont alors des dictionnaires
+        """
+        names = row_columns(cls, columns, defer)
+        if include:
+            check_embed(result)
+            statement = entities_statement(cls, kwargs, names, include, limit, offset, order_by, desc)
+            with _session_factory()() as session:
+                return embed_rows(cls, names, include, session.scalars(statement).all())
+        statement = rows_statement(cls, kwargs, names, limit, offset, order_by, desc)
+        with _session_factory()() as session:
+            return shape_rows(cls, names, session.execute(statement).all(), result)
+
+    @classmethod
+    def stream(cls, columns=None, defer=None, order_by='id', desc=False, result='dict',
+               batch_size=STREAM_BATCH_SIZE, **kwargs):
+        """
+        Lignes brutes en flux, a memoire constante (exports, reponses NDJSON)
+
+        La requete est executee immediatement, dans le contexte courant
+        (tenant, echeance); les lignes sont ensuite lues par lots de
+        batch_size. La session reste ouverte jusqu'a l'epuisement de
+        l'iterateur ou l'appel de close().
+
+        Usage:
+            with User.stream(defer=['password']) as rows:
+                for row in rows:
+                    ...
+
+        Args:
+            columns / defer / order_by / desc / result: Voir rows()
+            batch_size: Lignes lues par aller-retour avec la base
+        """
+        names = row_columns(cls, columns, defer)
+        row_shaper(cls, names, result)
+        statement = rows_statement(cls, kwargs, names, order_by=order_by, desc=desc)
+        session = _session_factory()()
+        try:
+            cursor = session.execute(statement, execution_options={'yield_per': batch_size})
+        except BaseException:
+            session.close()
+            raise
+        return RowStream(partition_rows(cls, names, cursor, result), [session, cursor])
@@ -0,0 +1,202 @@
+"""
+Routage des lectures vers des replicas avec coherence lecture-apres-ecriture
+Les lectures (get, all, filter, first, count) vont aux replicas,
+les ecritures (save, delete) et les lectures qui suivent une ecriture au primaire
+"""
+
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from .tenancy import Tenant
+
+
+class _Stickiness:
+    """Etat lecture-apres-ecriture du contexte courant (mutable, voir _Budget)"""
+
+    __slots__ = ('primary_until', 'wrote')
+
+    def __init__(self, primary_until=0.0):
+        self.primary_until = primary_until
+        self.wrote = False
+
+
+_stickiness = ContextVar('bmb_read_your_writes', default=None)
+
+
+class ReadYourWrites:
+    """
+    Coherence lecture-apres-ecriture
+
+    Apres une ecriture, les lectures du meme contexte (requete HTTP, tache)
+    restent sur le primaire pendant `window` secondes. L'echeance peut etre
+    transmise au client (cookie) pour couvrir ses requetes suivantes.
+    """
+
+    window = 5.0
+
+    @staticmethod
+    def begin(primary_until=0.0):
+        """Demarrer un nouveau contexte (debut de requete)"""
+        _stickiness.set(_Stickiness(primary_until or 0.0))
+
+    @staticmethod
+    def mark_write():
+        """Signaler une ecriture: coller au primaire pendant la fenetre"""
+        state = _stickiness.get()
+        if state is None:
+            state = _Stickiness()
+            _stickiness.set(state)
+        state.wrote = True
+        state.primary_until = max(state.primary_until, time.time() + ReadYourWrites.window)
+
+    @staticmethod
+    def sticky():
+        """True si les lectures doivent aller au primaire"""
+        state = _stickiness.get()
+        return state is not None and state.primary_until > time.time()
+
+    @staticmethod
+    def wrote():
+        """True si le contexte courant a ecrit"""
+        state = _stickiness.get()
+        return state is not None and state.wrote
+
+    @staticmethod
+    def primary_until():
+        """Echeance (timestamp) de la fenetre de coherence"""
+        state = _stickiness.get()
+        return state.primary_until if state is not None else 0.0
+
+
+class ReplicaSet:
+    """
+    Ensemble de replicas en lecture
+
+    Strategies:
+        - 'weighted': tirage aleatoire pondere
+        - 'least_connections': replica avec le moins de connexions en cours
+          (rapportees a son poids)
+    """
+
+    STRATEGIES = ('weighted', 'least_connections')
+
+    def __init__(self, engines, weights=None, strategy='weighted'):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Strategie de replica inconnue: {strategy}")
+
+        self.engines = list(engines)
+        self.weights = list(weights) if weights else [1] * len(self.engines)
+        if len(self.weights) != len(self.engines):
+            raise ValueError("Il faut un poids par replica")
+
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._in_use = {id(engine): 0 for engine in self.engines}
+        self._reads = {id(engine): 0 for engine in self.engines}
+
+        for engine in self.engines:
+            event.listen(engine, 'checkout', self._on_checkout(engine))
+            event.listen(engine, 'checkin', self._on_checkin(engine))
+
+    def _on_checkout(self, engine):
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self._in_use[id(engine)] += 1
+        return checkout
+
+    def _on_checkin(self, engine):
+        def checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self._in_use[id(engine)] = max(0, self._in_use[id(engine)] - 1)
+        return checkin
+
+    def choose(self):
+        """Choisir le replica qui servira la prochaine lecture"""
+        if self.strategy == 'least_connections':
+            with self._lock:
+                engine = min(
+                    zip(self.engines, self.weights),
+                    key=lambda item: self._in_use[id(item[0])] / item[1]
+                )[0]
+        else:
+            engine = random.choices(self.engines, weights=self.weights)[0]
+
+        with self._lock:
+            self._reads[id(engine)] += 1
+        return engine
+
+    def dispose(self, close=True):
+        """Liberer les pools des replicas"""
+        for engine in self.engines:
+            engine.dispose(close=close)
+
+    def stats(self):
+        """Metriques par replica"""
+        with self._lock:
+            return [
+                {
+                    'url': engine.url.render_as_string(hide_password=True),
+                    'weight': weight,
+                    'in_use': self._in_use[id(engine)],
+                    'reads': self._reads[id(engine)]
+                }
+                for engine, weight in zip(self.engines, self.weights)
+            ]
+
+
+class RoutingSession(Session):
+    """
+    Session qui route les requetes vers la bonne base
+
+    - tenant courant defini (voir Tenant): base du tenant
+    - sinon les lectures vont aux replicas, et au primaire: flush,
+      INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, toute lecture d'une
+      session qui a deja ecrit et toute lecture dans la fenetre
+      lecture-apres-ecriture du contexte courant.
+    """
+
+    def __init__(self, *args, replica_set=None, tenant_registry=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_set = replica_set
+        self.tenant_registry = tenant_registry
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.tenant_registry is not None:
+            tenant = Tenant.current()
+            if tenant is not None:
+                return self.tenant_registry.get_engine(tenant)
+
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+        if self.replica_set is None or self._flushing or self.info.get('bmb_wrote'):
+            return primary
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return primary
+        if ReadYourWrites.sticky():
+            return primary
+
+        return self.replica_set.choose()
+
+
+def _record_write(session):
+    session.info['bmb_wrote'] = True
+    ReadYourWrites.mark_write()
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        _record_write(session)
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _after_bulk_write(orm_context):
+    if orm_context.is_insert or orm_context.is_update or orm_context.is_delete:
+        _record_write(orm_context.session)
+
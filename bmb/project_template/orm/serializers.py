@@ -0,0 +1,171 @@
+"""
+Serialiseurs compiles par modele (remplacent ModelMixin.to_dict)
+Colonnes, encodeurs et champs exclus sont resolus une seule fois par modele
+"""
+
+import datetime
+import decimal
+from functools import lru_cache
+from operator import itemgetter
+
+from sqlalchemy import inspect
+
+
+def _encode_decimal(value):
+    return str(value)
+
+
+def _encode_isoformat(value):
+    return value.isoformat()
+
+
+# Encodeurs JSON par type Python de colonne (les autres valeurs passent telles quelles)
+ENCODERS = {
+    datetime.datetime: _encode_isoformat,
+    datetime.date: _encode_isoformat,
+    datetime.time: _encode_isoformat,
+    decimal.Decimal: _encode_decimal,
+}
+
+
+def _column_encoder(column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    return ENCODERS.get(python_type)
+
+
+def column_encoders(model, names):
+    """Encodeurs a appliquer par position de colonne: [(index, encodeur)]"""
+    columns = model.__table__.columns
+    return tuple(
+        (index, encoder)
+        for index, encoder in enumerate(_column_encoder(columns[name]) for name in names)
+        if encoder is not None
+    )
+
+
+class Serializer:
+    """
+    Serialiseur d'un modele pour un jeu de champs donne
+
+    Les valeurs sont lues directement dans l'etat de l'instance
+    (itemgetter sur __dict__) puis encodees par type de colonne.
+    Les colonnes non chargees (only=/defer=) sont omises.
+
+    Args:
+        model: Classe du modele
+        include: Champs a serialiser (defaut: toutes les colonnes)
+        exclude: Champs a omettre
+    """
+
+    def __init__(self, model, include=None, exclude=None):
+        columns = model.__table__.columns
+        names = [column.key for column in columns]
+        if include is not None:
+            unknown = [name for name in include if name not in columns]
+            if unknown:
+                raise ValueError(f"Champs inconnus pour {model.__name__}: {', '.join(unknown)}")
+            names = [name for name in names if name in include]
+        if exclude:
+            names = [name for name in names if name not in exclude]
+
+        self.model = model
+        self.names = tuple(names)
+        self._getter = itemgetter(*self.names) if len(self.names) > 1 else None
+        self._encoders = column_encoders(model, self.names)
+
+    def _encode(self, names, values):
+        values = list(values)
+        for index, encoder in self._encoders:
+            if values[index] is not None:
+                values[index] = encoder(values[index])
+        return dict(zip(names, values))
+
+    def serialize(self, instance):
+        """Convertir une instance en dictionnaire"""
+        state = instance.__dict__
+        try:
+            if self._getter is not None:
+                values = self._getter(state)
+            else:
+                values = tuple(state[name] for name in self.names)
+        except KeyError:
+            return self._serialize_partial(instance)
+        if not self._encoders:
+            return dict(zip(self.names, values))
+        return self._encode(self.names, values)
+
+    def _serialize_partial(self, instance):
+        """Instance incomplete: colonnes non chargees omises, autres lues normalement"""
+        info = inspect(instance)
+        unloaded = info.unloaded if info.has_identity else ()
+        data = {}
+        encoders = dict(self._encoders)
+        for index, name in enumerate(self.names):
+            if name in unloaded:
+                continue
+            value = getattr(instance, name)
+            encoder = encoders.get(index)
+            data[name] = encoder(value) if encoder is not None and value is not None else value
+        return data
+
+    def serialize_many(self, instances):
+        """Convertir une liste d'instances"""
+        serialize = self.serialize
+        return [serialize(instance) for instance in instances]
+
+
+@lru_cache(maxsize=256)
+def _custom_serializer(model, include, exclude):
+    return Serializer(model, include, exclude)
+
+
+def serializer_for(model, include=None, exclude=None):
+    """Serialiseur du modele: celui compile au chargement, ou un serialiseur en cache"""
+    if include is None and exclude is None and getattr(model, '_serializer', None) is not None:
+        return model._serializer
+    if exclude is None:
+        exclude = getattr(model, '_serializer_exclude', ())
+    return _custom_serializer(
+        model,
+        None if include is None else frozenset(include),
+        frozenset(exclude)
+    )
+
+
+def install_serializers(models, exclude=()):
+    """
+    Compiler le serialiseur de chaque modele
+
+    Args:
+        models: Iterable de classes de modeles
+        exclude: Champs jamais serialises par defaut (ex: password)
+    """
+    for model in models:
+        model._serializer_exclude = frozenset(name for name in exclude if name in model.__table__.columns)
+        model._serializer = Serializer(model, exclude=model._serializer_exclude)
+    return models
+
+
+class SerializerMixin:
+    """to_dict / to_dicts compiles ajoutes aux modeles BMDB par ModelsLoader"""
+
+    _serializer = None
+    _serializer_exclude = frozenset()
+
+    def to_dict(self, include=None, exclude=None):
+        """
+        Convertir l'instance en dictionnaire
+
+        Usage:
+            user.to_dict()
+            user.to_dict(include=['id', 'name'])
+        """
+        return serializer_for(type(self), include, exclude).serialize(self)
+
+    @classmethod
+    def to_dicts(cls, instances, include=None, exclude=None):
+        """Convertir une liste d'instances (serialiseur resolu une seule fois)"""
+        return serializer_for(cls, include, exclude).serialize_many(instances)
@@ -0,0 +1,449 @@
+"""
+Sharding horizontal des modeles BMDB sur plusieurs bases
+get/save/delete vont au shard proprietaire, filter/all/first/count
+interrogent tous les shards en parallele et fusionnent les resultats
+Les methodes asynchrones (aget, arows...) ne sont pas disponibles
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from operator import itemgetter
+
+from sqlalchemy import Column, Integer, MetaData, Table, UniqueConstraint
+from sqlalchemy.orm import sessionmaker
+
+from .aio import AsyncModelMixin
+from .queries import (
+    STREAM_BATCH_SIZE, RowStream, check_embed, close_all, count_statement, embed_rows,
+    entities_statement, exists_statement, filter_criteria, load_options, row_columns,
+    row_shaper, rows_statement, shape_rows
+)
+
+# SGBD dont l'ORDER BY croissant place les NULL apres les valeurs
+# (SQLite, MySQL: avant); la fusion des shards suit le meme ordre
+NULLS_LAST_DIALECTS = ('postgresql', 'oracle')
+
+# Sequence d'identifiants propre a chaque shard:
+# id = sequence locale * nombre de shards + index du shard
+_sequence_metadata = MetaData()
+shard_sequence = Table(
+    'bmb_shard_sequence',
+    _sequence_metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    sqlite_autoincrement=True
+)
+
+
+class ShardMap:
+    """
+    Carte des shards: engines, cle de sharding par modele, fan-out parallele
+
+    La cle par defaut est l'id (id % nombre de shards). Une autre colonne
+    (ex: email) peut servir a placer les nouveaux enregistrements: l'id
+    alloue encode toujours le shard, get(id) reste donc direct.
+    """
+
+    def __init__(self, engines, keys=None, max_workers=None):
+        self.engines = list(engines)
+        if not self.engines:
+            raise ValueError("Il faut au moins un shard")
+
+        self.keys = keys or {}
+        self.sessions = [sessionmaker(bind=engine) for engine in self.engines]
+        self.max_workers = max_workers or len(self.engines)
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+
+    def __len__(self):
+        return len(self.engines)
+
+    @property
+    def nulls_first(self):
+        """Les NULL precedent-ils les valeurs en ordre croissant sur ces shards ?"""
+        return self.engines[0].dialect.name not in NULLS_LAST_DIALECTS
+
+    # ------------------------------------------------------------------
+    # Placement
+    # ------------------------------------------------------------------
+
+    def key_for(self, model):
+        """Colonne servant de cle de sharding pour un modele"""
+        return self.keys.get(model.__name__, 'id')
+
+    def shard_for_id(self, id):
+        """Shard proprietaire d'un identifiant"""
+        return int(id) % len(self)
+
+    def shard_for_value(self, value):
+        """Shard d'une valeur de cle (hash stable entre processus)"""
+        if isinstance(value, int):
+            return value % len(self)
+        return zlib.crc32(str(value).encode('utf-8')) % len(self)
+
+    def shard_for(self, instance):
+        """Shard d'une instance (existante ou a creer)"""
+        if instance.id is not None:
+            return self.shard_for_id(instance.id)
+
+        key = self.key_for(type(instance))
+        if key == 'id':
+            return next(self._round_robin) % len(self)
+        return self.shard_for_value(getattr(instance, key))
+
+    def next_id(self, shard):
+        """Allouer un identifiant global sur un shard"""
+        with self.engines[shard].begin() as conn:
+            sequence = conn.execute(shard_sequence.insert()).inserted_primary_key[0]
+            # Ne conserver que la derniere valeur de la sequence
+            conn.execute(shard_sequence.delete().where(shard_sequence.c.id < sequence))
+        return sequence * len(self) + shard
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _get_executor(self):
+        # Les threads ne survivent pas a un fork (workers gunicorn)
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='bmb-shard'
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def run(self, shard, fn):
+        """Executer fn(session) sur un shard"""
+        with self.sessions[shard]() as session:
+            return fn(session)
+
+    def fan_out(self, fn):
+        """
+        Executer fn(session) sur tous les shards en parallele
+
+        Le contexte (echeance de la requete...) est copie dans chaque thread.
+
+        Returns:
+            list: Resultats dans l'ordre des shards
+        """
+        if len(self) == 1:
+            return [self.run(0, fn)]
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(contextvars.copy_context().run, self.run, shard, fn)
+            for shard in range(len(self))
+        ]
+        return [future.result() for future in futures]
+
+    def create_all(self, metadata):
+        """Creer les tables (et la sequence d'identifiants) sur chaque shard"""
+        for engine in self.engines:
+            metadata.create_all(engine)
+            _sequence_metadata.create_all(engine)
+
+    def dispose(self, close=True):
+        """Liberer les pools des shards"""
+        for engine in self.engines:
+            engine.dispose(close=close)
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def install(self, models):
+        """Router les methodes CRUD des modeles vers les shards"""
+        for model in models:
+            for name, member in vars(ShardedModelMixin).items():
+                if not name.startswith('__'):
+                    setattr(model, name, member)
+            model._shard_map = self
+        return models
+
+
+def _ordered_query(session, model, filters, order_by, desc, limit=None, options=()):
+    column = getattr(model, order_by)
+    query = session.query(model).filter(*filter_criteria(model, filters)).options(*options)
+    query = query.order_by(column.desc() if desc else column, model.id.desc() if desc else model.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def merge_key(value, id, nulls_first=True):
+    """Cle de fusion d'une ligne: place des NULL du SGBD, valeur, id en departage"""
+    return ((value is not None) if nulls_first else (value is None), value, id)
+
+
+def merge_ordered(results, order_by='id', desc=False, nulls_first=True):
+    """Fusion k-voies de listes deja triees par shard"""
+    def sort_key(item):
+        return merge_key(getattr(item, order_by), item.id, nulls_first)
+    return list(heapq.merge(*results, key=sort_key, reverse=desc))
+
+
+def unique_column_sets(model):
+    """Jeux de colonnes uniques du modele (colonnes, contraintes et index uniques)"""
+    table = model.__table__
+    sets = [(column.key,) for column in table.columns if column.unique]
+    sets += [
+        tuple(column.key for column in constraint.columns)
+        for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+    ]
+    sets += [tuple(column.key for column in index.columns) for index in table.indexes if index.unique]
+    return list(dict.fromkeys(sets))
+
+
+def _sync_only(name):
+    def method(*args, **kwargs):
+        raise NotImplementedError(f"{name}: les modeles shardes ne sont accessibles qu'en synchrone")
+    method.__name__ = name
+    return method
+
+
+class ShardedModelMixin:
+    """Methodes CRUD shardees, remplacent celles du ModelMixin BMDB"""
+
+    _shard_map = None
+
+    @classmethod
+    def _target_shard(cls, filters):
+        """Shard unique si les filtres portent sur la cle de sharding"""
+        shards = cls._shard_map
+        key = shards.key_for(cls)
+        # L'id encode toujours le shard proprietaire
+        if filters.get('id') is not None:
+            return shards.shard_for_id(filters['id'])
+        if key != 'id' and key in filters:
+            return shards.shard_for_value(filters[key])
+        return None
+
+    @classmethod
+    def get(cls, id):
+        """Recuperer un enregistrement par ID (shard proprietaire)"""
+        shards = cls._shard_map
+        return shards.run(shards.shard_for_id(id), lambda session: session.get(cls, id))
+
+    @classmethod
+    def all(cls, only=None, defer=None):
+        """Recuperer tous les enregistrements, tries par id"""
+        return cls.filter(only=only, defer=defer)
+
+    @classmethod
+    def filter(cls, only=None, defer=None, **kwargs):
+        """Filtrer les enregistrements sur tous les shards, tries par id"""
+        options = load_options(cls, only, defer)
+
+        def query(session):
+            return _ordered_query(session, cls, kwargs, 'id', False, options=options)
+
+        shard = cls._target_shard(kwargs)
+        if shard is not None:
+            return cls._shard_map.run(shard, query)
+        return merge_ordered(cls._shard_map.fan_out(query), nulls_first=cls._shard_map.nulls_first)
+
+    @classmethod
+    def first(cls, only=None, defer=None, **kwargs):
+        """Premier enregistrement (plus petit id) correspondant aux filtres"""
+        options = load_options(cls, only, defer)
+
+        def query(session):
+            return _ordered_query(session, cls, kwargs, 'id', False, 1, options)
+
+        shard = cls._target_shard(kwargs)
+        if shard is not None:
+            rows = cls._shard_map.run(shard, query)
+        else:
+            rows = merge_ordered(cls._shard_map.fan_out(query), nulls_first=cls._shard_map.nulls_first)
+        return rows[0] if rows else None
+
+    @classmethod
+    def count(cls, limit=None, **kwargs):
+        """Compter les enregistrements (somme des shards, bornee a limit)"""
+        def query(session):
+            return session.scalar(count_statement(cls, kwargs, limit))
+
+        shard = cls._target_shard(kwargs)
+        if shard is not None:
+            return cls._shard_map.run(shard, query)
+        total = sum(cls._shard_map.fan_out(query))
+        return total if limit is None else min(total, limit)
+
+    @classmethod
+    def exists(cls, **kwargs):
+        """Tester l'existence d'un enregistrement (shard cible ou tous les shards)"""
+        def query(session):
+            return bool(session.scalar(exists_statement(cls, kwargs)))
+
+        shard = cls._target_shard(kwargs)
+        if shard is not None:
+            return cls._shard_map.run(shard, query)
+        return any(cls._shard_map.fan_out(query))
+
+    @classmethod
+    def paginate(cls, page=1, page_size=20, order_by='id', desc=False, **filters):
+        """
+        Page d'enregistrements triee sur l'ensemble des shards
+
+        Chaque shard renvoie ses `page * page_size` premieres lignes triees,
+        fusionnees ensuite dans l'ordre global.
+
+        Returns:
+            tuple: (enregistrements de la page, total)
+        """
+        offset = (page - 1) * page_size
+        limit = offset + page_size
+
+        results = cls._shard_map.fan_out(
+            lambda session: _ordered_query(session, cls, filters, order_by, desc, limit)
+        )
+        items = merge_ordered(results, order_by, desc, cls._shard_map.nulls_first)[offset:limit]
+        return items, cls.count(**filters)
+
+    @classmethod
+    def rows(cls, columns=None, defer=None, limit=None, offset=None, order_by='id',
+             desc=False, result='dict', include=None, **kwargs):
+        """
+        Lignes brutes fusionnees dans l'ordre global (voir QueryMixin.rows)
+
+        Les relations incluses sont chargees par lot sur chaque shard: les
+        lignes liees doivent se trouver sur le shard de la ligne.
+        """
+        names = row_columns(cls, columns, defer)
+        # Colonnes de tri necessaires a la fusion, retirees ensuite
+        fetched = names + tuple(name for name in dict.fromkeys((order_by, 'id')) if name not in names)
+        position = {name: index for index, name in enumerate(fetched)}
+        end = None if limit is None else (offset or 0) + limit
+        nulls_first = cls._shard_map.nulls_first
+
+        if include:
+            check_embed(result)
+            statement = entities_statement(cls, kwargs, fetched, include, end, None, order_by, desc)
+
+            def query(session):
+                instances = session.scalars(statement).all()
+                keys = [merge_key(getattr(instance, order_by), instance.id, nulls_first) for instance in instances]
+                return list(zip(keys, embed_rows(cls, names, include, instances)))
+        else:
+            statement = rows_statement(cls, kwargs, fetched, end, None, order_by, desc)
+
+            def query(session):
+                rows = session.execute(statement).all()
+                return [(merge_key(row[position[order_by]], row[position['id']], nulls_first), row) for row in rows]
+
+        shard = cls._target_shard(kwargs)
+        if shard is not None:
+            merged = cls._shard_map.run(shard, query)
+        else:
+            merged = list(heapq.merge(*cls._shard_map.fan_out(query), key=itemgetter(0), reverse=desc))
+
+        merged = [row for _, row in merged[offset or 0:end]]
+        if include:
+            return merged
+        return shape_rows(cls, names, [row[:len(names)] for row in merged], result)
+
+    @classmethod
+    def stream(cls, columns=None, defer=None, order_by='id', desc=False, result='dict',
+               batch_size=STREAM_BATCH_SIZE, **kwargs):
+        """
+        Lignes brutes en flux, fusionnees a la volee dans l'ordre global
+        (un curseur ouvert par shard, voir QueryMixin.stream)
+        """
+        names = row_columns(cls, columns, defer)
+        shape = row_shaper(cls, names, result)
+        fetched = names + tuple(name for name in dict.fromkeys((order_by, 'id')) if name not in names)
+        position = {name: index for index, name in enumerate(fetched)}
+        statement = rows_statement(cls, kwargs, fetched, order_by=order_by, desc=desc)
+
+        shard = cls._target_shard(kwargs)
+        shards = [shard] if shard is not None else range(len(cls._shard_map))
+        resources = []
+        cursors = []
+        try:
+            for index in shards:
+                session = cls._shard_map.sessions[index]()
+                resources.append(session)
+                cursor = session.execute(statement, execution_options={'yield_per': batch_size})
+                resources.append(cursor)
+                cursors.append(cursor)
+        except BaseException:
+            close_all(resources)
+            raise
+
+        nulls_first = cls._shard_map.nulls_first
+
+        def sort_key(row):
+            return merge_key(row[position[order_by]], row[position['id']], nulls_first)
+
+        width = len(names)
+        merged = heapq.merge(*cursors, key=sort_key, reverse=desc)
+        return RowStream((shape(row[:width]) for row in merged), resources)
+
+    def _check_unique_across_shards(self):
+        """
+        Unicite hors cle de shard verifiee sur tous les shards
+
+        L'index unique n'existe que dans chaque shard (voir insert_or_ignore):
+        verifier puis ecrire, course possible entre deux shards.
+        """
+        model = type(self)
+        key = self._shard_map.key_for(model)
+        for names in unique_column_sets(model):
+            if key in names:
+                continue
+            values = {name: getattr(self, name) for name in names}
+            # NULL n'entre pas en conflit
+            if any(value is None for value in values.values()):
+                continue
+            if any(row[0] != self.id for row in model.rows(columns=['id'], result='tuple', **values)):
+                raise ValueError(f"{model.__name__}: {', '.join(names)} deja utilise sur un autre shard")
+
+    def save(self):
+        """Creer ou mettre a jour cette instance sur son shard"""
+        shards = self._shard_map
+        key = shards.key_for(type(self))
+        self._check_unique_across_shards()
+
+        if self.id is None:
+            shard = shards.shard_for(self)
+            self.id = shards.next_id(shard)
+        else:
+            shard = shards.shard_for_id(self.id)
+            if key != 'id' and shards.shard_for_value(getattr(self, key)) != shard:
+                raise ValueError(f"La cle de sharding '{key}' ne peut pas etre modifiee")
+
+        with shards.sessions[shard]() as session:
+            try:
+                session.add(self)
+                session.commit()
+                session.refresh(self)
+                return self
+            except Exception:
+                session.rollback()
+                raise
+
+    def delete(self):
+        """Supprimer cette instance de son shard"""
+        shards = self._shard_map
+        with shards.sessions[shards.shard_for_id(self.id)]() as session:
+            try:
+                session.delete(self)
+                session.commit()
+                return True
+            except Exception:
+                session.rollback()
+                raise
+
+
+# Sessions asyncio sur une seule base: pas de routage par shard
+for _name in vars(AsyncModelMixin):
+    if not _name.startswith('_'):
+        setattr(ShardedModelMixin, _name, _sync_only(_name))
@@ -0,0 +1,252 @@
+"""
+Multi-tenant: une base de donnees par client
+Le tenant courant est porte par le contexte (requete HTTP, tache) et les
+engines sont crees a la demande, avec un plafond LRU et une liberation
+des pools inactifs. Seuls les tenants connus (liste autorisee ou base
+existante) sont servis; la creation d'une base est explicite (provision)
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+# Identifiant de tenant: insere dans l'URL de connexion, donc restreint
+TENANT_ID_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,62}$')
+
+_tenant = ContextVar('bmb_tenant', default=None)
+
+
+class InvalidTenant(ValueError):
+    """Identifiant de tenant invalide"""
+
+
+class UnknownTenant(InvalidTenant):
+    """Tenant valide mais ni autorise ni provisionne"""
+
+
+class Tenant:
+    """Tenant du contexte courant"""
+
+    @staticmethod
+    def validate(tenant_id):
+        """Verifier un identifiant de tenant (lettres, chiffres, - et _)"""
+        if not isinstance(tenant_id, str) or not TENANT_ID_PATTERN.match(tenant_id):
+            raise InvalidTenant(f"Identifiant de tenant invalide: {tenant_id!r}")
+        return tenant_id
+
+    @staticmethod
+    def set(tenant_id):
+        """Definir le tenant du contexte courant (None pour la base par defaut)"""
+        if tenant_id is not None:
+            Tenant.validate(tenant_id)
+        _tenant.set(tenant_id)
+
+    @staticmethod
+    def current():
+        """Tenant du contexte courant (None si aucun)"""
+        return _tenant.get()
+
+    @staticmethod
+    def clear():
+        """Revenir a la base par defaut"""
+        _tenant.set(None)
+
+    @staticmethod
+    @contextmanager
+    def scope(tenant_id):
+        """
+        Executer un bloc pour un tenant (taches, scripts)
+
+        Usage:
+            with Tenant.scope('acme'):
+                users = User.all()
+        """
+        Tenant.validate(tenant_id)
+        token = _tenant.set(tenant_id)
+        try:
+            yield
+        finally:
+            _tenant.reset(token)
+
+
+class TenantRegistry:
+    """
+    Registre des engines par tenant
+
+    - creation a la demande a partir d'un modele d'URL ("{tenant}")
+    - au plus `max_engines` pools ouverts (le moins recemment utilise est libere)
+    - les pools inutilises depuis `idle_timeout` secondes sont liberes
+    - tenants connus: ceux de `tenants` si la liste est fournie, sinon les
+      bases SQLite deja presentes sur disque (UnknownTenant pour les autres)
+    - aucune base ni table n'est creee a l'usage: voir provision()
+    """
+
+    def __init__(self, url_template, max_engines=64, idle_timeout=300,
+                 configure=None, metadata=None, engine_options=None, tenants=None):
+        if '{tenant}' not in url_template:
+            raise ValueError("Le modele d'URL doit contenir {tenant}")
+
+        self.url_template = url_template
+        self.max_engines = max_engines
+        self.idle_timeout = idle_timeout
+        self.configure = configure
+        self.metadata = metadata
+        self.engine_options = engine_options or {}
+        self.tenants = frozenset(tenants) if tenants else None
+
+        self._engines = OrderedDict()  # tenant -> [engine, dernier usage]
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self._created = 0
+        self._evicted = 0
+
+    def url_for(self, tenant_id):
+        """URL de connexion d'un tenant"""
+        return self.url_template.format(tenant=Tenant.validate(tenant_id))
+
+    def _sqlite_path(self, tenant_id):
+        """Fichier de la base SQLite du tenant (None pour un autre SGBD)"""
+        url = make_url(self.url_for(tenant_id))
+        if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+            return None
+        return Path(url.database)
+
+    def exists(self, tenant_id):
+        """
+        Le tenant est-il connu ?
+
+        Avec une liste `tenants`: appartenance a la liste. Sans liste: base
+        SQLite deja presente (les autres SGBD exigent la liste).
+        """
+        Tenant.validate(tenant_id)
+        if self.tenants is not None:
+            return tenant_id in self.tenants
+        if tenant_id in self._engines:
+            return True
+        path = self._sqlite_path(tenant_id)
+        return path is not None and path.is_file()
+
+    def get_engine(self, tenant_id):
+        """
+        Engine du tenant (cree a la demande)
+
+        Raises:
+            UnknownTenant: Tenant ni autorise ni provisionne
+        """
+        engine = self._lookup(tenant_id)
+        if engine is not None:
+            return engine
+        if not self.exists(tenant_id):
+            raise UnknownTenant(f"Tenant inconnu: {tenant_id!r}")
+        # Creation hors verrou: les autres tenants ne sont pas bloques
+        return self._register(tenant_id, self._create_engine(tenant_id))
+
+    def provision(self, tenant_id):
+        """
+        Creer la base du tenant et ses tables (scripts, bmb create-tenant)
+
+        Jamais appele pour une requete HTTP. Avec une liste `tenants`, le
+        tenant doit y figurer.
+        """
+        Tenant.validate(tenant_id)
+        if self.tenants is not None and tenant_id not in self.tenants:
+            raise UnknownTenant(f"Tenant absent de la liste autorisee: {tenant_id!r}")
+
+        path = self._sqlite_path(tenant_id)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        engine = self._lookup(tenant_id)
+        if engine is None:
+            engine = self._register(tenant_id, self._create_engine(tenant_id))
+        if self.metadata is not None:
+            self.metadata.create_all(engine)
+        return engine
+
+    def _register(self, tenant_id, created):
+        evicted = []
+
+        with self._lock:
+            entry = self._engines.get(tenant_id)
+            if entry is not None:
+                # Cree en parallele par un autre thread: garder le premier
+                evicted.append(created)
+                engine = entry[0]
+            else:
+                engine = created
+                self._engines[tenant_id] = [engine, time.monotonic()]
+                self._created += 1
+                while len(self._engines) > self.max_engines:
+                    evicted.append(self._engines.popitem(last=False)[1][0])
+                    self._evicted += 1
+
+        self._dispose(evicted)
+        return engine
+
+    def _lookup(self, tenant_id):
+        now = time.monotonic()
+        evicted = []
+
+        with self._lock:
+            if now - self._last_sweep >= min(self.idle_timeout, 60):
+                evicted = self._pop_idle(now)
+
+            entry = self._engines.get(tenant_id)
+            if entry is not None:
+                entry[1] = now
+                self._engines.move_to_end(tenant_id)
+
+        self._dispose(evicted)
+        return entry[0] if entry is not None else None
+
+    def _create_engine(self, tenant_id):
+        engine = create_engine(self.url_for(tenant_id), **self.engine_options)
+        if self.configure is not None:
+            self.configure(engine)
+        return engine
+
+    def _pop_idle(self, now):
+        self._last_sweep = now
+        idle = [t for t, (_, last_used) in self._engines.items() if now - last_used >= self.idle_timeout]
+        self._evicted += len(idle)
+        return [self._engines.pop(t)[0] for t in idle]
+
+    def _dispose(self, engines):
+        # Les connexions en cours d'utilisation sont fermees a leur restitution
+        for engine in engines:
+            engine.dispose()
+
+    def evict_idle(self):
+        """Liberer les pools inactifs"""
+        with self._lock:
+            evicted = self._pop_idle(time.monotonic())
+        self._dispose(evicted)
+        return len(evicted)
+
+    def dispose(self, close=True):
+        """Liberer tous les pools"""
+        with self._lock:
+            engines = [engine for engine, _ in self._engines.values()]
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose(close=close)
+
+    def __contains__(self, tenant_id):
+        return tenant_id in self._engines
+
+    def stats(self):
+        """Metriques du registre"""
+        with self._lock:
+            return {
+                'open': len(self._engines),
+                'max_engines': self.max_engines,
+                'created': self._created,
+                'evicted': self._evicted
+            }
@@ -0,0 +1,196 @@
+"""
+Insertions atomiques en cas de conflit (INSERT ... ON CONFLICT)
+Une seule instruction au lieu de "verifier puis inserer" (sans course)
+"""
+
+from sqlalchemy import select
+
+from .updates import check_columns
+
+
+def _dialect_insert(dialect):
+    """insert() du dialecte (ON CONFLICT / ON DUPLICATE KEY)"""
+    if dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect.name in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        raise NotImplementedError(f"Upsert non supporte pour le dialecte '{dialect.name}'")
+    return insert
+
+
+def insert_or_ignore_statement(dialect, model, values, conflict_cols=None):
+    """INSERT ignore si une contrainte d'unicite (conflict_cols) est violee"""
+    statement = _dialect_insert(dialect)(model).values(**values)
+    if dialect.name in ('mysql', 'mariadb'):
+        # Pas d'INSERT IGNORE: il ignore aussi NOT NULL, troncatures et cles
+        # etrangeres; seule une cle dupliquee doit etre ignoree (id = id)
+        table = model.__table__
+        return statement.on_duplicate_key_update(
+            {column.key: column for column in table.primary_key.columns}
+        )
+    return statement.on_conflict_do_nothing(index_elements=conflict_cols)
+
+
+def was_inserted(dialect, result):
+    """
+    L'INSERT sans RETURNING a-t-il insere une ligne ?
+
+    MySQL: ON DUPLICATE KEY UPDATE sans effet compte une ligne avec
+    CLIENT_FOUND_ROWS (defaut des pilotes de SQLAlchemy); seul un INSERT
+    renseigne l'identifiant insere.
+    """
+    if dialect.name in ('mysql', 'mariadb'):
+        return bool(result.lastrowid)
+    return result.rowcount != 0
+
+
+def upsert_statement(dialect, model, values, conflict_cols, update_cols=None):
+    """INSERT, ou mise a jour de update_cols si conflict_cols existe deja"""
+    if update_cols is None:
+        update_cols = [name for name in values if name not in conflict_cols and name != 'id']
+    # Rien a mettre a jour: reecrire la cle pour que RETURNING renvoie la ligne
+    update_cols = update_cols or list(conflict_cols)
+
+    statement = _dialect_insert(dialect)(model).values(**values)
+    if dialect.name in ('mysql', 'mariadb'):
+        return statement.on_duplicate_key_update(
+            {name: statement.inserted[name] for name in update_cols}
+        )
+    return statement.on_conflict_do_update(
+        index_elements=conflict_cols,
+        set_={name: statement.excluded[name] for name in update_cols}
+    )
+
+
+def lookup_statement(model, values, conflict_cols):
+    """Relire la ligne par ses colonnes de conflit (dialectes sans RETURNING)"""
+    return select(model).where(*[getattr(model, name) == values[name] for name in conflict_cols])
+
+
+def check_conflict_cols(model, values, conflict_cols):
+    """Les colonnes de conflit doivent etre connues et renseignees"""
+    missing = [name for name in conflict_cols if name not in values]
+    if missing:
+        raise ValueError(f"Colonnes de conflit sans valeur pour {model.__name__}: {', '.join(missing)}")
+
+
+def _session_factory():
+    from models_loader import ModelsLoader
+    return ModelsLoader.get_session()
+
+
+class UpsertMixin:
+    """Insertions atomiques ajoutees aux modeles BMDB par ModelsLoader"""
+
+    @classmethod
+    def _insert_session(cls, values):
+        """Fabrique de sessions et valeurs (id alloue sur le shard proprietaire)"""
+        shards = getattr(cls, '_shard_map', None)
+        if shards is None:
+            return _session_factory(), values
+
+        shard = shards.shard_for(cls(**values))
+        if values.get('id') is None:
+            values = dict(values, id=shards.next_id(shard))
+        return shards.sessions[shard], values
+
+    @classmethod
+    def _conflict_spans_shards(cls, conflict_cols):
+        """
+        True si la contrainte d'unicite ne contient pas la cle de shard
+
+        L'index unique n'existe alors que dans chaque shard: deux shards
+        peuvent accepter la meme valeur, ON CONFLICT ne suffit pas.
+        """
+        shards = getattr(cls, '_shard_map', None)
+        return shards is not None and bool(conflict_cols) and shards.key_for(cls) not in conflict_cols
+
+    @classmethod
+    def _execute_insert(cls, build, values, conflict_cols, ignore):
+        factory, values = cls._insert_session(values)
+        with factory(expire_on_commit=False) as session:
+            try:
+                dialect = session.connection().dialect
+                statement = build(dialect, values)
+                if dialect.insert_returning:
+                    instance = session.scalars(statement.returning(cls)).first()
+                else:
+                    # MySQL: INSERT puis relecture de la ligne
+                    result = session.execute(statement)
+                    if ignore and not was_inserted(dialect, result):
+                        instance = None
+                    elif conflict_cols:
+                        instance = session.scalars(lookup_statement(cls, values, conflict_cols)).first()
+                    else:
+                        instance = session.get(cls, result.inserted_primary_key[0])
+                session.commit()
+                return instance
+            except Exception:
+                session.rollback()
+                raise
+
+    @classmethod
+    def insert_or_ignore(cls, conflict_cols=None, **values):
+        """
+        Inserer un enregistrement sauf s'il viole une contrainte d'unicite
+
+        Usage:
+            user = User.insert_or_ignore(conflict_cols=['email'], name='Alice', email='a@b.c')
+            if user is None:
+                ...  # email deja utilise
+
+        Returns:
+            Instance inseree, ou None en cas de conflit
+        """
+        check_columns(cls, {name: value for name, value in values.items() if name != 'id'})
+        if conflict_cols:
+            check_conflict_cols(cls, values, conflict_cols)
+
+        # Unicite hors cle de shard: verifier d'abord sur tous les shards
+        # (verifier puis inserer, comme avant ON CONFLICT: course possible
+        # entre deux shards, pas dans un meme shard)
+        if cls._conflict_spans_shards(conflict_cols):
+            if cls.exists(**{name: values[name] for name in conflict_cols}):
+                return None
+
+        return cls._execute_insert(
+            lambda dialect, values: insert_or_ignore_statement(dialect, cls, values, conflict_cols),
+            values,
+            conflict_cols,
+            ignore=True
+        )
+
+    @classmethod
+    def upsert(cls, conflict_cols, update_cols=None, **values):
+        """
+        Inserer ou mettre a jour un enregistrement en une instruction
+
+        Usage:
+            User.upsert(['email'], update_cols=['name'], email='a@b.c', name='Alice')
+
+        Args:
+            conflict_cols: Colonnes de la contrainte d'unicite
+            update_cols: Colonnes mises a jour en cas de conflit
+                (defaut: toutes les valeurs hors conflict_cols)
+
+        Returns:
+            Instance inseree ou mise a jour
+        """
+        check_columns(cls, {name: value for name, value in values.items() if name != 'id'})
+        check_columns(cls, update_cols or [])
+        check_conflict_cols(cls, values, conflict_cols)
+        if cls._conflict_spans_shards(conflict_cols):
+            raise ValueError(
+                f"upsert de {cls.__name__}: conflict_cols doit contenir la cle de shard "
+                f"'{cls._shard_map.key_for(cls)}'"
+            )
+
+        return cls._execute_insert(
+            lambda dialect, values: upsert_statement(dialect, cls, values, conflict_cols, update_cols),
+            values,
+            conflict_cols,
+            ignore=False
+        )
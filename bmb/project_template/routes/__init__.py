@@ -4,6 +4,7 @@ Enregistrement des routes
 from routes.auth import auth_bp
 from routes.users import users_bp
 from routes.health import health_bp
+from routes.exports import exports_bp
 
 
 def register_routes(app):
@@ -14,6 +15,7 @@ def register_routes(app):
         (auth_bp, '/api/auth'),
         (users_bp, '/api/users'),
         (health_bp, '/api'),
+        (exports_bp, '/api/exports'),
     ]
     
     print("\n✅ Enregistrement des routes:")
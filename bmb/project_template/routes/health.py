@@ -2,12 +2,12 @@
 Routes de santé et monitoring
 """
 
-from flask import Blueprint
+from flask import Blueprint, Response, current_app, request
 import datetime
 
 from database import Database
 from models_loader import ModelsLoader
-from utils import success_response, error_response
+from utils import success_response, error_response, conditional, cached_response, get_response_cache
 from config.bmdb_config import BMDBConfig
 
 health_bp = Blueprint('health', __name__)
@@ -74,6 +74,8 @@ def health_check():
 
 
 @health_bp.route('/info', methods=['GET'])
+@conditional('public, max-age=60')
+@cached_response(ttl=60)
 def app_info():
     """Informations sur l'application"""
     from . import __version__
@@ -99,4 +101,35 @@ def app_info():
         ]
     }
     
-    return success_response(data=info)
\ No newline at end of file
+    return success_response(data=info)
+
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Metriques du worker (controle d'admission, compression, replicas, tenants, file d'ecriture)
+    
+    Query params:
+        - format: 'json' (defaut) ou 'prometheus'
+    """
+    controller = current_app.extensions.get('bmb_admission')
+    compressor = current_app.extensions.get('bmb_compression')
+    
+    if request.args.get('format') == 'prometheus':
+        body = controller.prometheus() if controller else ''
+        return Response(body, mimetype='text/plain; version=0.0.4')
+    
+    replica_set = ModelsLoader.get_replica_set()
+    tenant_registry = ModelsLoader.get_tenant_registry()
+    write_coordinator = ModelsLoader.get_write_coordinator()
+    write_behind = ModelsLoader._write_behind
+    
+    return success_response(data={
+        'admission': controller.stats() if controller else None,
+        'compression': compressor.stats() if compressor else None,
+        'response_cache': get_response_cache().stats(),
+        'replicas': replica_set.stats() if replica_set else None,
+        'tenants': tenant_registry.stats() if tenant_registry else None,
+        'write_queue': write_coordinator.stats() if write_coordinator else None,
+        'write_behind': write_behind.stats() if write_behind else None
+    })
\ No newline at end of file
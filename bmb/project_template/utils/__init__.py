@@ -5,11 +5,28 @@ Utilitaires BMB
 from .jwt_utils import JWTManager
 from .validators import Validator
 from .responses import api_response, error_response, success_response
+from .json_provider import install_json_provider
+from .streaming import stream_format, stream_requested, stream_response
+from .conditional import conditional, instance_etag, not_modified, use_etag
+from .response_cache import cached_response, get_response_cache
+from .fieldsets import requested_fields, requested_includes
 
 __all__ = [
     'JWTManager',
     'Validator',
     'api_response',
     'error_response',
-    'success_response'
+    'success_response',
+    'install_json_provider',
+    'stream_format',
+    'stream_requested',
+    'stream_response',
+    'conditional',
+    'instance_etag',
+    'not_modified',
+    'use_etag',
+    'cached_response',
+    'get_response_cache',
+    'requested_fields',
+    'requested_includes'
 ]
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Requetes conditionnelles (ETag, If-None-Match -> 304) et Cache-Control
+Les clients qui interrogent une ressource en boucle recoivent une reponse
+vide tant qu'elle n'a pas change
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import g, make_response, request
+
+from config import AppConfig
+
+
+def make_etag(*parts):
+    """ETag fort a partir de valeurs quelconques (repr stable: int, str, datetime...)"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def body_etag(body):
+    """ETag fort du corps d'une reponse (apres serialisation)"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def version_column(model):
+    """Premiere colonne de version du modele (ETAG_VERSION_COLUMNS), None sinon"""
+    columns = model.__table__.columns
+    for name in AppConfig.ETAG_VERSION_COLUMNS:
+        if name in columns:
+            return name
+    return None
+
+
+def instance_etag(instance):
+    """
+    ETag d'un enregistrement sans le serialiser
+
+    - colonne de version (version_id, version, updated_at): table, cle et version
+    - sinon: valeurs brutes des colonnes exposees (hors SERIALIZER_EXCLUDE
+      et ETAG_IGNORE_COLUMNS, ex: last_seen mis a jour a chaque requete)
+    """
+    model = type(instance)
+    table = model.__table__
+    version = version_column(model)
+    if version is not None:
+        return make_etag(table.name, instance.id, getattr(instance, version))
+    exclude = {*getattr(model, '_serializer_exclude', ()), *AppConfig.ETAG_IGNORE_COLUMNS}
+    return make_etag(table.name, *[getattr(instance, column.key) for column in table.columns if column.key not in exclude])
+
+
+def cache_control_for(endpoint, default):
+    """Politique Cache-Control d'une route: CACHE_CONTROL_ROUTES, sinon celle du decorateur"""
+    return AppConfig.CACHE_CONTROL_ROUTES.get(endpoint, default)
+
+
+def etag_matches(etag, if_none_match):
+    """If-None-Match (comparaison faible, '*' compris) designe-t-il cet ETag ?"""
+    return bool(if_none_match) and if_none_match.contains_weak(etag)
+
+
+def _cacheable(response):
+    # GET/HEAD, 200 et corps deja en memoire (pas de flux)
+    return request.method in ('GET', 'HEAD') and response.status_code == 200 and not response.is_streamed
+
+
+def use_etag(etag):
+    """
+    Annoncer l'ETag de la reponse avant de la construire
+
+    L'ETag final combine `etag` avec la route et les parametres de requete
+    (une meme ligne a une representation par route et par parametres).
+
+    Returns:
+        True si le client a deja cette version: renvoyer not_modified()
+        sans serialiser la ressource
+
+    Usage:
+        if use_etag(instance_etag(user)):
+            return not_modified()
+    """
+    g.bmb_etag = make_etag(request.endpoint, request.query_string, etag)
+    return etag_matches(g.bmb_etag, request.if_none_match)
+
+
+def not_modified():
+    """Reponse 304 vide (ETag et Cache-Control ajoutes par @conditional)"""
+    response = make_response('', 304)
+    response.set_etag(g.bmb_etag)
+    return response
+
+
+def conditional(cache_control='private, no-cache'):
+    """
+    Decorateur: ETag fort, reponses 304 et Cache-Control pour une route GET
+
+    L'ETag est celui annonce par use_etag(), sinon l'empreinte du corps
+    (le 304 economise alors la bande passante, pas la serialisation).
+    Placer sous @JWTManager.token_required: l'authentification passe avant le 304.
+
+    Args:
+        cache_control: Politique par defaut (surchargeable par CACHE_CONTROL_ROUTES)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 304 and not _cacheable(response):
+                return response
+            response.headers['Cache-Control'] = cache_control_for(request.endpoint, cache_control)
+            if response.status_code == 304:
+                return response
+
+            etag = g.get('bmb_etag') or body_etag(response.get_data())
+            response.set_etag(etag)
+            return response.make_conditional(request)
+
+        return decorated
+    return decorator
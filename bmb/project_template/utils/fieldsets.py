@@ -0,0 +1,55 @@
+"""
+Champs et relations demandes par le client (?fields=, ?include=)
+Les champs sont projetes en SQL et les relations chargees par lot
+(voir Model.rows(columns=..., include=...))
+"""
+
+from sqlalchemy import inspect
+
+
+def _names(request, param):
+    """Noms separes par des virgules, sans doublons ni vides"""
+    value = request.args.get(param, '')
+    return tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+
+
+def requested_fields(request, model, hidden=()):
+    """
+    Colonnes demandees par ?fields=id,name (None: colonnes par defaut)
+
+    Les champs exclus du serialiseur du modele (ex: password) et `hidden`
+    sont refuses comme des champs inconnus.
+
+    Raises:
+        ValueError: Champ inconnu ou masque
+    """
+    names = _names(request, 'fields')
+    if not names:
+        return None
+    hidden = {*hidden, *getattr(model, '_serializer_exclude', ())}
+    columns = model.__table__.columns
+    unknown = [name for name in names if name not in columns or name in hidden]
+    if unknown:
+        raise ValueError(f"Champs inconnus dans 'fields': {', '.join(unknown)}")
+    return names
+
+
+def requested_includes(request, model, allowed=None):
+    """
+    Relations demandees par ?include=author,tags (relationship() du modele)
+
+    Args:
+        allowed: Relations autorisees (defaut: toutes celles du modele)
+
+    Raises:
+        ValueError: Relation inconnue ou non autorisee
+    """
+    names = _names(request, 'include')
+    relationships = inspect(model).relationships
+    unknown = [
+        name for name in names
+        if name not in relationships or (allowed is not None and name not in allowed)
+    ]
+    if unknown:
+        raise ValueError(f"Relations inconnues dans 'include': {', '.join(unknown)}")
+    return names
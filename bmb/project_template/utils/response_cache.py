@@ -0,0 +1,313 @@
+"""
+Cache des reponses GET en memoire, invalide par les commits des modeles
+Stale-while-revalidate: a l'expiration, une seule requete recalcule
+l'entree pendant que les autres recoivent la version precedente
+Les entrees sont propres a chaque worker; les versions des tables sont
+partagees (RESPONSE_CACHE_SHARED_DIR) pour qu'un commit les invalide toutes
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from config import AppConfig
+from orm import Deadline, Tenant
+from orm.changes import TableVersions
+
+# En-tetes propres a une reponse, jamais rejoues depuis le cache
+UNCACHED_HEADERS = frozenset(('set-cookie', 'content-length', 'x-cache', 'age'))
+
+
+class CacheEntry:
+    """Reponse en cache et versions des tables dont elle depend"""
+
+    __slots__ = ('body', 'status', 'headers', 'versions', 'created', 'fresh_until', 'stale_until')
+
+    def __init__(self, body, status, headers, versions, ttl, stale_ttl):
+        self.body = body
+        self.status = status
+        self.headers = headers
+        self.versions = versions
+        self.created = time.monotonic()
+        self.fresh_until = self.created + ttl
+        self.stale_until = self.fresh_until + stale_ttl
+
+    def headers_for(self, state):
+        return self.headers + [('X-Cache', state), ('Age', str(int(time.monotonic() - self.created)))]
+
+
+class ResponseCache:
+    """
+    Entrees par cle (tenant, chemin, variantes), LRU borne
+
+    Une entree est valide tant que les versions des tables dont elle depend
+    n'ont pas change (voir orm.changes.TableVersions). Entre `ttl` et
+    `ttl + stale_ttl`, elle est servie perimee pendant qu'une seule requete
+    la recalcule.
+
+    Args:
+        max_entries: Nombre maximal d'entrees
+        max_body: Taille maximale d'un corps mis en cache (octets)
+    """
+
+    def __init__(self, max_entries=1024, max_body=1024 * 1024):
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self._entries = OrderedDict()
+        self._refreshing = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(self, key, tables):
+        """
+        Chercher une entree
+
+        Returns:
+            (entree, etat): etat 'fresh', 'stale' ou 'miss' (entree None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.versions != TableVersions.get(tables):
+                # Une table dependante a change depuis le calcul
+                del self._entries[key]
+                self.invalidations += 1
+                entry = None
+            now = time.monotonic()
+            if entry is not None and now >= entry.stale_until:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, 'miss'
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self.hits += 1
+                return entry, 'fresh'
+            return entry, 'stale'
+
+    def claim(self, key):
+        """
+        Reserver le calcul d'une entree (une seule requete a la fois)
+
+        Returns:
+            None si la requete courante calcule (appeler release ensuite),
+            sinon l'evenement signale a la fin du calcul en cours
+        """
+        with self._lock:
+            event = self._refreshing.get(key)
+            if event is not None:
+                return event
+            self._refreshing[key] = threading.Event()
+            return None
+
+    def release(self, key):
+        """Fin du calcul: reveiller les requetes en attente"""
+        with self._lock:
+            event = self._refreshing.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def served_stale(self):
+        with self._lock:
+            self.stale_hits += 1
+
+    def store(self, key, body, status, headers, versions, ttl, stale_ttl):
+        """Enregistrer une reponse calculee avec les versions relevees avant le calcul"""
+        if len(body) > self.max_body:
+            return None
+        entry = CacheEntry(body, status, headers, versions, ttl, stale_ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Metriques du cache du worker"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Cache des reponses du processus (cree a la demande depuis AppConfig)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                max_entries=AppConfig.RESPONSE_CACHE_MAX_ENTRIES,
+                max_body=AppConfig.RESPONSE_CACHE_MAX_BODY
+            )
+        return _cache
+
+
+def dependency_tables(depends_on):
+    """Tables des modeles dependants (classes ou noms de modeles charges)"""
+    from models_loader import load_models
+    models = load_models()
+    tables = []
+    for model in depends_on:
+        if isinstance(model, str):
+            if model not in models:
+                raise ValueError(f"Modele inconnu pour le cache: {model}")
+            model = models[model]
+        tables.append(model.__table__.name)
+    return tuple(tables)
+
+
+def cache_key(request, vary_on, view_args):
+    """
+    Cle d'une requete: tenant, chemin et variantes demandees
+
+    vary_on:
+        - 'args': tous les parametres de requete
+        - 'user': utilisateur authentifie (premier argument de la vue
+          sous token_required)
+        - 'header:<Nom>': valeur d'un en-tete
+    """
+    parts = [Tenant.current(), request.path]
+    for item in vary_on:
+        if item == 'args':
+            parts.append(tuple(sorted(request.args.items(multi=True))))
+        elif item == 'user':
+            parts.append(getattr(view_args[0], 'id', None) if view_args else None)
+        elif item.startswith('header:'):
+            parts.append(request.headers.get(item[len('header:'):]))
+        else:
+            raise ValueError(f"vary_on inconnu: {item}")
+    return tuple(parts)
+
+
+def storable(response):
+    """Reponse 200 sans cookie ni no-store, calculee dans les delais (corps en memoire: voir l'appelant)"""
+    return (
+        response.status_code == 200
+        and 'Set-Cookie' not in response.headers
+        and 'no-store' not in response.headers.get('Cache-Control', '')
+        and not Deadline.exceeded()
+    )
+
+
+def cached_headers(response):
+    return [(name, value) for name, value in response.headers.items() if name.lower() not in UNCACHED_HEADERS]
+
+
+class CachePolicy:
+    """Parametres d'une route en cache (tables resolues au premier appel)"""
+
+    def __init__(self, ttl, vary_on, depends_on, stale_ttl, unless):
+        self.ttl = ttl
+        self.vary_on = tuple(vary_on)
+        self.depends_on = tuple(depends_on)
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self.unless = unless
+        self._tables = None
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            self._tables = dependency_tables(self.depends_on)
+        return self._tables
+
+    def bypass(self, request):
+        return (
+            not AppConfig.RESPONSE_CACHE_ENABLED
+            or request.method not in ('GET', 'HEAD')
+            or (self.unless is not None and self.unless())
+        )
+
+
+def cached_response(ttl=60, vary_on=('args', 'user'), depends_on=(), stale_ttl=None, unless=None):
+    """
+    Decorateur: reponse GET en cache, invalidee par les commits des modeles
+
+    Placer sous @JWTManager.token_required (l'authentification passe avant le
+    cache) et sous @conditional (l'ETag est calcule sur le corps en cache).
+
+    Usage:
+        @users_bp.route('/stats')
+        @JWTManager.token_required
+        @cached_response(ttl=30, depends_on=['User'])
+        def get_user_stats(current_user):
+            ...
+
+    Args:
+        ttl: Duree de fraicheur (secondes)
+        vary_on: Variantes de la cle ('args', 'user', 'header:<Nom>'); par
+            defaut une entree par utilisateur, retirer 'user' seulement si
+            la reponse ne depend pas de current_user
+        depends_on: Modeles (noms ou classes) dont un commit invalide l'entree
+        stale_ttl: Duree pendant laquelle une entree expiree est encore servie
+            pendant son recalcul (defaut: ttl)
+        unless: fn() -> bool, True pour ne pas utiliser le cache
+    """
+    policy = CachePolicy(ttl, vary_on, depends_on, stale_ttl, unless)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if policy.bypass(request):
+                return f(*args, **kwargs)
+
+            cache = get_response_cache()
+            tables = policy.tables
+            key = cache_key(request, policy.vary_on, args)
+
+            entry, state = cache.lookup(key, tables)
+            if state == 'fresh':
+                return _replay(entry, 'HIT')
+
+            event = cache.claim(key)
+            if event is not None:
+                # Calcul deja en cours: version perimee, sinon attendre son resultat
+                if state == 'stale':
+                    cache.served_stale()
+                    return _replay(entry, 'STALE')
+                event.wait(AppConfig.RESPONSE_CACHE_WAIT)
+                entry, state = cache.lookup(key, tables)
+                if state == 'fresh':
+                    return _replay(entry, 'HIT')
+                return f(*args, **kwargs)
+
+            try:
+                # Versions relevees avant le calcul: un commit pendant le calcul invalide l'entree
+                versions = TableVersions.get(tables)
+                response = make_response(f(*args, **kwargs))
+                if not response.is_streamed and not response.direct_passthrough and storable(response):
+                    cache.store(
+                        key, response.get_data(), response.status_code, cached_headers(response),
+                        versions, policy.ttl, policy.stale_ttl
+                    )
+            finally:
+                cache.release(key)
+
+            response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return decorated
+    return decorator
+
+
+def _replay(entry, state):
+    return current_app.response_class(entry.body, status=entry.status, headers=entry.headers_for(state))
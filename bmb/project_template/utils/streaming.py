@@ -0,0 +1,202 @@
+"""
+Reponses JSON en flux pour les grandes collections
+NDJSON (un enregistrement par ligne) ou tableau JSON envoye par morceaux
+"""
+
+import logging
+from itertools import islice
+
+from flask import Response, current_app
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_FORMATS = ('ndjson', 'json')
+
+logger = logging.getLogger('bmb')
+
+# Pas de mise en tampon par un proxy (nginx) ni de mise en cache
+STREAM_HEADERS = {'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'}
+
+
+def stream_format(request):
+    """
+    Format de flux demande par le client, None pour une reponse paginee
+
+    - ?stream=ndjson ou ?stream=json
+    - Accept: application/x-ndjson (prefere a application/json)
+
+    Raises:
+        ValueError: Format inconnu
+    """
+    requested = request.args.get('stream')
+    if requested:
+        if requested not in STREAM_FORMATS:
+            raise ValueError(f"Le parametre 'stream' doit etre parmi {', '.join(STREAM_FORMATS)}")
+        return requested
+
+    accept = request.accept_mimetypes
+    if accept.quality(NDJSON_MIMETYPE) > accept.quality('application/json'):
+        return 'ndjson'
+    return None
+
+
+def stream_requested(request):
+    """True si le client demande un flux (reponse a ne pas mettre en cache)"""
+    try:
+        return stream_format(request) is not None
+    except ValueError:
+        return True
+
+
+def json_dumps_bytes(app):
+    """Encodeur en octets de l'application (fournisseur BMB ou app.json standard)"""
+    dumps_bytes = getattr(app.json, 'dumps_bytes', None)
+    if dumps_bytes is not None:
+        return dumps_bytes
+    dumps = app.json.dumps
+    return lambda obj: dumps(obj).encode('utf-8')
+
+
+class ChunkEncoder:
+    """
+    Encodage des lots d'enregistrements en morceaux d'octets
+
+    Args:
+        fmt: 'ndjson' ou 'json' (tableau)
+        dumps_bytes: Encodeur JSON d'un objet en octets
+    """
+
+    def __init__(self, fmt, dumps_bytes):
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Format de flux inconnu: {fmt}")
+        self.fmt = fmt
+        self.mimetype = NDJSON_MIMETYPE if fmt == 'ndjson' else 'application/json'
+        self._dumps = dumps_bytes
+        self._first = True
+
+    def head(self):
+        return b'' if self.fmt == 'ndjson' else b'['
+
+    def batch(self, rows):
+        dumps = self._dumps
+        if self.fmt == 'ndjson':
+            return b''.join([dumps(row) + b'\n' for row in rows])
+        body = b','.join([dumps(row) for row in rows])
+        if not self._first:
+            body = b',' + body
+        self._first = False
+        return body
+
+    def tail(self):
+        return b'' if self.fmt == 'ndjson' else b']'
+
+    def error(self, error):
+        """
+        Fin de flux sur erreur: les en-tetes (200) sont deja envoyes
+
+        NDJSON: derniere ligne {"error": ...}. Tableau JSON: pas de crochet
+        fermant, le document tronque est invalide pour le client.
+        """
+        if self.fmt == 'ndjson':
+            return self._dumps({'error': f"Flux interrompu: {error}"}) + b'\n'
+        return b''
+
+
+def batches(rows, size):
+    """Regrouper un iterateur de lignes en listes de `size` lignes"""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+async def abatches(rows, size):
+    """Version asynchrone de batches"""
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_stream(rows, encoder, batch_size):
+    """Morceaux d'octets d'un flux de lignes (un morceau par lot)"""
+    head = encoder.head()
+    if head:
+        yield head
+    try:
+        for batch in batches(rows, batch_size):
+            yield encoder.batch(batch)
+    except Exception as e:
+        logger.warning(f"⚠️  Flux interrompu: {e}")
+        yield encoder.error(e)
+        return
+    yield encoder.tail()
+
+
+async def aencode_stream(rows, encoder, batch_size):
+    """Version asynchrone de encode_stream"""
+    head = encoder.head()
+    if head:
+        yield head
+    try:
+        async for batch in abatches(rows, batch_size):
+            yield encoder.batch(batch)
+    except Exception as e:
+        logger.warning(f"⚠️  Flux interrompu: {e}")
+        yield encoder.error(e)
+        return
+    yield encoder.tail()
+
+
+class AsyncChunks:
+    """
+    Corps de reponse asynchrone qui libere aussi le flux de lignes
+
+    Quart appelle aclose() en fin d'envoi ou a la deconnexion du client,
+    meme si l'envoi n'a pas commence.
+    """
+
+    def __init__(self, chunks, rows):
+        self._chunks = chunks
+        self._rows = rows
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._chunks.__anext__()
+
+    async def aclose(self):
+        try:
+            await self._chunks.aclose()
+        finally:
+            await self._rows.aclose()
+
+
+def stream_response(rows, fmt='ndjson', batch_size=1000):
+    """
+    Reponse Flask en flux (memoire constante, premier octet immediat)
+
+    Le flux de lignes (Model.stream) est ferme en fin de reponse ou a la
+    deconnexion du client (Response.close).
+
+    Args:
+        rows: Iterateur de lignes, de preference Model.stream(...)
+        fmt: 'ndjson' ou 'json'
+        batch_size: Lignes par morceau envoye
+    """
+    encoder = ChunkEncoder(fmt, json_dumps_bytes(current_app))
+    response = Response(
+        encode_stream(rows, encoder, batch_size),
+        mimetype=encoder.mimetype,
+        headers=STREAM_HEADERS
+    )
+    close = getattr(rows, 'close', None)
+    if close is not None:
+        response.call_on_close(close)
+    return response
@@ -29,4 +29,31 @@ class Validator:
         if missing_fields:
             return False, f"Champs manquants: {', '.join(missing_fields)}"
         
-        return True, "Tous les champs requis sont présents"
\ No newline at end of file
+        return True, "Tous les champs requis sont présents"
+    
+    @staticmethod
+    def validate_user(data, check_password=True):
+        """
+        Valider un utilisateur (mêmes règles que l'inscription)
+        
+        Args:
+            data: Champs de l'utilisateur
+            check_password: Vérifier la longueur du mot de passe (False s'il est déjà haché)
+        
+        Returns:
+            list: Messages d'erreur (vide si valide)
+        """
+        is_valid, message = Validator.validate_required_fields(data, ['name', 'email', 'password'])
+        if not is_valid:
+            return [message]
+        
+        errors = []
+        if not isinstance(data['email'], str) or not Validator.validate_email(data['email']):
+            errors.append("Format d'email invalide")
+        if not isinstance(data['password'], str):
+            errors.append("Le mot de passe doit être une chaîne")
+        elif check_password:
+            is_valid, message = Validator.validate_password(data['password'])
+            if not is_valid:
+                errors.append(message)
+        return errors
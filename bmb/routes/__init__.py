@@ -7,13 +7,16 @@ def register_routes(app):
     from .auth import auth_bp
     from .users import users_bp
     from .health import health_bp
+    from .exports import exports_bp
     
     # Enregistrer les blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(health_bp, url_prefix='/api')
+    app.register_blueprint(exports_bp, url_prefix='/api/exports')
     
     print("✅ Routes enregistrées:")
     print("   - /api/auth/*")
     print("   - /api/users/*")
-    print("   - /api/health")
\ No newline at end of file
+    print("   - /api/health")
+    print("   - /api/exports/*")
\ No newline at end of file
@@ -6,7 +6,9 @@ from flask import Blueprint, request
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from ..models_loader import load_models
-from ..utils import JWTManager, Validator, success_response, error_response
+from ..utils import (
+    JWTManager, Validator, success_response, error_response, conditional, instance_etag, not_modified, use_etag
+)
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -54,24 +56,20 @@ def register():
         if not User:
             return error_response("Modèle User introuvable", 500)
         
-        # Vérifier si l'email existe déjà
-        existing_user = User.first(email=data['email'])
-        if existing_user:
-            return error_response("Cet email est déjà utilisé", 409)
-        
         # Hasher le mot de passe
         hashed_password = generate_password_hash(data['password'])
         
-        # Créer le nouvel utilisateur
-        new_user = User(
+        # Créer l'utilisateur en une requête atomique (INSERT ... ON CONFLICT DO NOTHING):
+        # deux inscriptions simultanées ne peuvent pas passer toutes les deux
+        saved_user = User.insert_or_ignore(
+            conflict_cols=['email'],
             name=data['name'],
             email=data['email'],
             password=hashed_password,
             age=data.get('age')
         )
-        
-        # Sauvegarder avec BMDB save()
-        saved_user = new_user.save()
+        if saved_user is None:
+            return error_response("Cet email est déjà utilisé", 409)
         
         # Générer le token JWT
         token = JWTManager.generate_token(saved_user.id)
@@ -118,8 +116,8 @@ def login():
         models = load_models()
         User = models.get('User')
         
-        # Trouver l'utilisateur avec BMDB first()
-        user = User.first(email=data['email'])
+        # Trouver l'utilisateur avec BMDB first() (avec le hash, même si différé)
+        user = User.first(email=data['email'], defer=[])
         
         if not user:
             return error_response("Email ou mot de passe incorrect", 401)
@@ -145,9 +143,13 @@ def login():
 
 @auth_bp.route('/me', methods=['GET'])
 @JWTManager.token_required
+@conditional()
 def get_current_user(current_user):
-    """Récupérer les informations de l'utilisateur connecté"""
+    """Récupérer les informations de l'utilisateur connecté (304 si inchangées)"""
     try:
+        if use_etag(instance_etag(current_user)):
+            return not_modified()
+        
         return success_response(
             data={'user': current_user.to_dict()},
             message="Profil récupéré"
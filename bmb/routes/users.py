@@ -4,10 +4,17 @@ Utilise toutes les methodes BMDB: get, all, filter, first, count, save, delete
 """
 
 from flask import Blueprint, request
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.security import generate_password_hash
 
 from ..models_loader import load_models
-from ..utils import JWTManager, Validator, success_response, error_response
+from ..imports import BulkImportError, can_import, import_format, importer_for, parse_records
+from ..orm import Deadline
+from ..utils import (
+    JWTManager, Validator, success_response, error_response, stream_format, stream_response,
+    conditional, instance_etag, not_modified, use_etag, cached_response, stream_requested,
+    requested_fields, requested_includes
+)
 from ..config import AppConfig
 
 users_bp = Blueprint('users', __name__)
@@ -15,6 +22,7 @@ users_bp = Blueprint('users', __name__)
 
 @users_bp.route('', methods=['GET'])
 @JWTManager.token_required
+@cached_response(ttl=5, vary_on=('args',), depends_on=['User'], unless=lambda: stream_requested(request))
 def get_users(current_user):
     """
     Recuperer tous les utilisateurs avec filtres et pagination
@@ -25,6 +33,10 @@ def get_users(current_user):
         - email: string (filtre par email)
         - page: int (numero de page, defaut: 1)
         - page_size: int (taille de page, defaut: 20, max: 100)
+        - stream: ndjson ou json (tous les resultats en flux, sans pagination;
+          aussi avec l'en-tete Accept: application/x-ndjson)
+        - fields: colonnes a retourner, lues seules en SQL (ex: id,name)
+        - include: relations a inclure, chargees par lot (pas en flux)
     """
     try:
         models = load_models()
@@ -44,6 +56,26 @@ def get_users(current_user):
         if request.args.get('email'):
             filters['email'] = request.args.get('email')
         
+        # Projection (?fields=) et relations incluses (?include=)
+        try:
+            fields = requested_fields(request, User)
+            includes = requested_includes(request, User)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        # Flux sans limite de taille: NDJSON ou tableau JSON par morceaux
+        try:
+            fmt = stream_format(request)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        if fmt:
+            if includes:
+                return error_response("Le parametre 'include' n'est pas disponible en flux", 400)
+            rows = User.stream(
+                columns=fields, defer=['password'], batch_size=AppConfig.STREAM_BATCH_SIZE, **filters
+            )
+            return stream_response(rows, fmt, AppConfig.STREAM_BATCH_SIZE)
+
         # Pagination
         try:
             page = int(request.args.get('page', 1))
@@ -54,23 +86,22 @@ def get_users(current_user):
         except ValueError:
             return error_response("Parametres de pagination invalides", 400)
         
-        # Utiliser BMDB filter() ou all()
-        if filters:
-            users = User.filter(**filters)
-        else:
-            users = User.all()
+        # Lignes brutes paginees en SQL (sans objets ORM ni mot de passe)
+        users = User.rows(
+            columns=fields,
+            defer=['password'],
+            include=includes,
+            limit=page_size,
+            offset=(page - 1) * page_size,
+            **filters
+        )
         
         # Compter avec BMDB count()
         total_count = User.count(**filters) if filters else User.count()
         
-        # Pagination manuelle (ou implementer dans BMDB)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_users = users[start:end]
-        
         return success_response(
             data={
-                'users': [user.to_dict() for user in paginated_users],
+                'users': users,
                 'pagination': {
                     'page': page,
                     'page_size': page_size,
@@ -86,10 +117,14 @@ def get_users(current_user):
 
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @JWTManager.token_required
+@conditional()
 def get_user(current_user, user_id):
     """
     Recuperer un utilisateur par ID
     Utilise BMDB get()
+    
+    Headers:
+        - If-None-Match: ETag deja recu (304 si l'utilisateur n'a pas change)
     """
     try:
         models = load_models()
@@ -101,6 +136,10 @@ def get_user(current_user, user_id):
         if not user:
             return error_response("Utilisateur introuvable", 404)
         
+        # ETag calcule sur la ligne: pas de serialisation si le client est a jour
+        if use_etag(instance_etag(user)):
+            return not_modified()
+        
         return success_response(
             data={'user': user.to_dict()}
         )
@@ -114,7 +153,7 @@ def get_user(current_user, user_id):
 def update_user(current_user, user_id):
     """
     Mettre à jour un utilisateur
-    Utilise BMDB get() et save()
+    Une seule requete UPDATE avec Model.update()
     
     Body:
         {
@@ -132,18 +171,15 @@ def update_user(current_user, user_id):
         models = load_models()
         User = models.get('User')
         
-        # Recuperer l'utilisateur avec BMDB get()
-        user = User.get(user_id)
-        if not user:
-            return error_response("Utilisateur introuvable", 404)
-        
         data = request.get_json()
         if not data:
             return error_response("Corps de requete manquant", 400)
         
-        # Mettre à jour les champs
+        # Champs à mettre à jour
+        fields = {}
+        
         if 'name' in data:
-            user.name = data['name']
+            fields['name'] = data['name']
         
         if 'email' in data:
             # Valider l'email
@@ -151,15 +187,14 @@ def update_user(current_user, user_id):
                 return error_response("Format d'email invalide", 400)
             
             # Verifier si l'email est dejà utilise
-            existing = User.first(email=data['email'])
-            if existing and existing.id != user_id:
+            if data['email'] != current_user.email and User.exists(email=data['email']):
                 return error_response("Cet email est dejà utilise", 409)
             
-            user.email = data['email']
+            fields['email'] = data['email']
         
         if 'age' in data:
             try:
-                user.age = int(data['age'])
+                fields['age'] = int(data['age'])
             except (ValueError, TypeError):
                 return error_response("L'âge doit etre un entier", 400)
         
@@ -169,10 +204,12 @@ def update_user(current_user, user_id):
             if not is_valid:
                 return error_response(message, 400)
             
-            user.password = generate_password_hash(data['password'])
+            fields['password'] = generate_password_hash(data['password'])
         
-        # Sauvegarder avec BMDB save()
-        updated_user = user.save()
+        # UPDATE ... WHERE id = ? RETURNING * (sans SELECT prealable)
+        updated_user = User.update(user_id, **fields)
+        if not updated_user:
+            return error_response("Utilisateur introuvable", 404)
         
         return success_response(
             data={'user': updated_user.to_dict()},
@@ -236,7 +273,7 @@ def search_user(current_user):
         User = models.get('User')
         
         # Utiliser BMDB first()
-        user = User.first(email=email)
+        user = User.first(email=email, defer=['password'])
         
         if not user:
             return error_response("Utilisateur introuvable", 404)
@@ -251,6 +288,7 @@ def search_user(current_user):
 
 @users_bp.route('/stats', methods=['GET'])
 @JWTManager.token_required
+@cached_response(ttl=30, vary_on=('args',), depends_on=['User'])
 def get_user_stats(current_user):
     """
     Statistiques des utilisateurs
@@ -264,7 +302,7 @@ def get_user_stats(current_user):
         total_users = User.count()
         
         # Recuperer tous les utilisateurs pour les stats detaillees
-        all_users = User.all()
+        all_users = User.all(only=['age'])
         
         # Calculer des statistiques
         ages = [user.age for user in all_users if user.age is not None]
@@ -299,4 +337,50 @@ def get_user_stats(current_user):
         return success_response(data={'stats': stats})
         
     except Exception as e:
-        return error_response(f"Erreur: {str(e)}", 500)
\ No newline at end of file
+        return error_response(f"Erreur: {str(e)}", 500)
+
+
+@users_bp.route('/import', methods=['POST'])
+@JWTManager.token_required
+def import_users(current_user):
+    """
+    Importer des utilisateurs en masse (corps lu en flux, insertion par lots)
+    
+    Body:
+        CSV (en-tete: name,email,password,age) ou NDJSON (un objet par ligne)
+    
+    Headers:
+        - Content-Type: text/csv ou application/x-ndjson (ou ?format=csv|ndjson)
+        - Content-Encoding: gzip (optionnel)
+    
+    Returns:
+        Rapport: lignes inserees, rejetees et erreurs par numero de ligne
+        (403 hors administrateurs, voir IMPORT_ADMINS)
+    """
+    if not can_import(current_user):
+        return error_response("Import reserve aux administrateurs", 403)
+    
+    try:
+        fmt = import_format(request.args.get('format'), request.mimetype)
+    except BulkImportError as e:
+        return error_response(str(e), 400)
+    
+    try:
+        User = load_models().get('User')
+        
+        # Corps volumineux lu en flux: limite propre a cette route
+        request.max_content_length = AppConfig.IMPORT_MAX_CONTENT_LENGTH
+        gzipped = request.headers.get('Content-Encoding', '').lower() == 'gzip'
+        
+        # Echeance propre a l'import (IMPORT_TIMEOUT, 0 = aucune)
+        with Deadline.scope(AppConfig.IMPORT_TIMEOUT):
+            report = importer_for(User).run(parse_records(request.stream, fmt, gzipped))
+        
+        return success_response(data={'import': report.to_dict()}, message="Import termine")
+    
+    except (EOFError, OSError, UnicodeDecodeError) as e:
+        return error_response(f"Corps de requete illisible: {str(e)}", 400)
+    except RequestEntityTooLarge:
+        return error_response("Fichier trop volumineux (IMPORT_MAX_CONTENT_LENGTH)", 413)
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
@@ -0,0 +1,215 @@
+"""
+Serveur de production BMB
+Lance l'application sous un serveur WSGI multi-processus (gunicorn),
+ou waitress lorsque gunicorn n'est pas disponible (Windows)
+"""
+
+import ast
+import multiprocessing
+import sys
+from importlib import import_module
+from pathlib import Path
+
+from .config import AppConfig
+
+
+def default_workers():
+    """Nombre de workers par defaut: 2 x coeurs + 1"""
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def default_threads():
+    """Nombre de threads par worker par defaut (requetes majoritairement I/O)"""
+    return 4
+
+
+def defines_name(path, name):
+    """
+    True si le module `path` definit `name` au premier niveau
+
+    Lecture statique (ast): le module n'est pas importe, un app.py d'une
+    autre application ne s'execute donc pas.
+    """
+    try:
+        tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return False
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.name == name:
+            return True
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if any((alias.asname or alias.name) == name for alias in node.names):
+                return True
+        if isinstance(node, ast.Assign):
+            if any(isinstance(target, ast.Name) and target.id == name for target in node.targets):
+                return True
+    return False
+
+
+def resolve_app_factory(app_path=None):
+    """
+    Resoudre la factory de l'application
+
+    Args:
+        app_path: Chemin 'module:factory' (defaut: app:create_app si app.py
+            la definit, comme dans un projet genere, sinon bmb:create_app)
+
+    Returns:
+        callable: La factory create_app
+    """
+    if app_path is None:
+        app_path = 'app:create_app' if defines_name(Path.cwd() / 'app.py', 'create_app') else 'bmb:create_app'
+
+    module_name, _, factory_name = app_path.partition(':')
+    project_root = str(Path.cwd())
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+    module = import_module(module_name)
+    return getattr(module, factory_name or 'create_app')
+
+
+def build_options(host=None, port=None, workers=None, threads=None, preload=None,
+                  timeout=None, graceful_timeout=None, max_requests=None):
+    """
+    Construire les options du serveur a partir des arguments et de AppConfig
+
+    Returns:
+        dict: Options au format gunicorn
+    """
+    workers = workers or AppConfig.SERVER_WORKERS or default_workers()
+    threads = threads or AppConfig.SERVER_THREADS or default_threads()
+    max_requests = AppConfig.SERVER_MAX_REQUESTS if max_requests is None else max_requests
+
+    return {
+        'bind': f"{host or AppConfig.HOST}:{port or AppConfig.PORT}",
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': AppConfig.SERVER_PRELOAD if preload is None else preload,
+        'timeout': timeout or AppConfig.SERVER_TIMEOUT,
+        'graceful_timeout': graceful_timeout or AppConfig.SERVER_GRACEFUL_TIMEOUT,
+        # Recycler les workers progressivement (fuites memoire, fragmentation)
+        'max_requests': max_requests,
+        'max_requests_jitter': max(1, max_requests // 10) if max_requests else 0,
+        'post_fork': _post_fork,
+        'worker_exit': _worker_exit,
+    }
+
+
+def _loaded_model_loaders():
+    """ModelsLoader deja importes (package bmb ou projet genere)"""
+    for module_name in ('bmb.models_loader', 'models_loader'):
+        module = sys.modules.get(module_name)
+        loader = getattr(module, 'ModelsLoader', None)
+        if loader is not None and hasattr(loader, 'dispose_engines'):
+            yield loader
+
+
+def _post_fork(server, worker):
+    """Apres le fork: ne jamais partager les connexions du processus maitre"""
+    for loader in _loaded_model_loaders():
+        loader.dispose_engines(close=False)
+
+
+def _worker_exit(server, worker):
+    """Fermer proprement les connexions du worker a l'arret"""
+    for loader in _loaded_model_loaders():
+        loader.dispose_engines()
+
+
+def serve(app_path=None, **kwargs):
+    """
+    Lancer l'application en production
+
+    Usage:
+        from bmb.server import serve
+        serve(workers=4, threads=8)
+
+    SIGTERM: gunicorn arrete d'accepter les connexions et laisse les
+    requetes en cours se terminer pendant graceful_timeout secondes.
+    SIGHUP: redemarrage progressif des workers.
+    """
+    options = build_options(**kwargs)
+    factory = resolve_app_factory(app_path)
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        return _serve_waitress(factory, options)
+
+    class BMBApplication(BaseApplication):
+        """Application gunicorn embarquee"""
+
+        def __init__(self, factory, options):
+            self.factory = factory
+            self.options = options
+            self.application = None
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            # Avec preload_app, appele une seule fois dans le maitre:
+            # modeles et engine sont charges avant le fork
+            if self.application is None:
+                self.application = self.factory()
+            return self.application
+
+    print(f"🚀 BMB: {options['workers']} worker(s) x {options['threads']} thread(s) "
+          f"sur {options['bind']}")
+    BMBApplication(factory, options).run()
+
+
+def _serve_waitress(factory, options):
+    """Serveur de repli mono-processus multi-threads (Windows)"""
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        raise RuntimeError(
+            "Aucun serveur de production installe.\n"
+            "Installez-en un avec: pip install bmb[server]"
+        )
+
+    host, _, port = options['bind'].rpartition(':')
+    threads = options['workers'] * options['threads']
+
+    print(f"🚀 BMB (waitress): {threads} thread(s) sur {options['bind']}")
+    waitress_serve(factory(), host=host, port=int(port), threads=threads)
+
+
+def serve_asgi(app_path=None, host=None, port=None, workers=None, graceful_timeout=None, **kwargs):
+    """
+    Lancer l'application en mode ASGI (hypercorn, une boucle d'evenements par worker)
+
+    Args:
+        app_path: Chemin 'module:factory()' (defaut: asgi:create_asgi_app() dans un
+            projet genere, sinon bmb.asgi:create_asgi_app())
+    """
+    try:
+        from hypercorn.config import Config
+        from hypercorn.run import run
+    except ImportError:
+        raise RuntimeError(
+            "Le mode ASGI necessite hypercorn et quart.\n"
+            "Installez-les avec: pip install bmb[asgi]"
+        )
+
+    if app_path is None:
+        app_path = ('asgi:create_asgi_app()'
+                    if defines_name(Path.cwd() / 'asgi' / '__init__.py', 'create_asgi_app')
+                    else 'bmb.asgi:create_asgi_app()')
+
+    config = Config()
+    config.application_path = app_path
+    config.bind = [f"{host or AppConfig.HOST}:{port or AppConfig.PORT}"]
+    # Une boucle d'evenements par coeur suffit: les attentes I/O ne bloquent pas
+    config.workers = workers or AppConfig.SERVER_WORKERS or multiprocessing.cpu_count()
+    config.graceful_timeout = graceful_timeout or AppConfig.SERVER_GRACEFUL_TIMEOUT
+
+    print(f"🚀 BMB (ASGI): {config.workers} worker(s) sur {config.bind[0]}")
+    run(config)
@@ -0,0 +1,193 @@
+"""
+Fournisseurs JSON rapides pour les reponses API (Flask et Quart)
+orjson ou ujson si installes, sinon json (stdlib)
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+import weakref
+
+from flask.json.provider import JSONProvider
+
+
+def default(obj):
+    """Types non natifs JSON: dates ISO 8601, UUID et Decimal en chaine, modeles via to_dict"""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (uuid.UUID, decimal.Decimal)):
+        return str(obj)
+    if isinstance(obj, tuple):
+        # Lignes record (namedtuple): tableaux, comme json et ujson
+        return list(obj)
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"Objet de type {type(obj).__name__} non serialisable en JSON")
+
+
+def stdlib_dumps(obj, **kwargs):
+    """json (stdlib) avec les options de l'appelant (indent, sort_keys, separators...)"""
+    kwargs.setdefault('default', default)
+    kwargs.setdefault('ensure_ascii', False)
+    return json.dumps(obj, **kwargs)
+
+
+class BaseJSONProvider(JSONProvider):
+    """
+    app.json de Flask et de Quart (JSONProvider, reexporte par Quart)
+
+    Les sous-classes implementent dumps_bytes et loads. Comme
+    DefaultJSONProvider, sort_keys trie les cles et compact=False (ou None
+    en mode debug) indente les reponses.
+    """
+
+    name = None
+    mimetype = 'application/json'
+    sort_keys = False
+    compact = None
+
+    def __init__(self, app=None):
+        # Sans application: encodage seul (exports, taches de fond)
+        self._app = weakref.proxy(app) if app is not None else None
+
+    def dumps_bytes(self, obj):
+        raise NotImplementedError
+
+    def dumps(self, obj, **kwargs):
+        """Serialiser en chaine (options non gerees par l'encodeur: json stdlib)"""
+        if kwargs:
+            return stdlib_dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        raise NotImplementedError
+
+    def response(self, *args, **kwargs):
+        """Reponse JSON (utilisee par jsonify), corps en octets sans re-encodage"""
+        obj = self._prepare_response_obj(args, kwargs)
+        options = {}
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options['indent'] = 2
+        if self.sort_keys:
+            options['sort_keys'] = True
+        body = self.dumps(obj, **options) if options else self.dumps_bytes(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class OrjsonProvider(BaseJSONProvider):
+    """orjson: datetime, date, UUID et dataclasses natifs"""
+
+    name = 'orjson'
+
+    def __init__(self, app=None):
+        import orjson
+        super().__init__(app)
+        self._orjson = orjson
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        """indent=2 et sort_keys via les options orjson, le reste via json stdlib"""
+        if set(kwargs) - {'indent', 'sort_keys'} or kwargs.get('indent') not in (None, 2):
+            return super().dumps(obj, **kwargs)
+        option = self._option
+        if kwargs.get('indent'):
+            option |= self._orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys'):
+            option |= self._orjson.OPT_SORT_KEYS
+        return self._orjson.dumps(obj, default=default, option=option).decode('utf-8')
+
+    def dumps_bytes(self, obj):
+        return self._orjson.dumps(obj, default=default, option=self._option)
+
+    def loads(self, s, **kwargs):
+        return self._orjson.loads(s)
+
+
+class UjsonProvider(BaseJSONProvider):
+    """ujson"""
+
+    name = 'ujson'
+
+    def __init__(self, app=None):
+        import ujson
+        super().__init__(app)
+        self._ujson = ujson
+
+    def dumps(self, obj, **kwargs):
+        """indent et sort_keys natifs ujson, le reste via json stdlib"""
+        if set(kwargs) - {'indent', 'sort_keys'}:
+            return super().dumps(obj, **kwargs)
+        return self._ujson.dumps(obj, ensure_ascii=False, default=default, **kwargs)
+
+    def dumps_bytes(self, obj):
+        return self.dumps(obj).encode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return self._ujson.loads(s)
+
+
+class StdlibJSONProvider(BaseJSONProvider):
+    """json (stdlib), sortie compacte"""
+
+    name = 'stdlib'
+
+    def __init__(self, app=None):
+        super().__init__(app)
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=default)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return stdlib_dumps(obj, **kwargs)
+        return self._encoder.encode(obj)
+
+    def dumps_bytes(self, obj):
+        return self._encoder.encode(obj).encode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return json.loads(s, **kwargs)
+
+
+JSON_PROVIDERS = {
+    'orjson': OrjsonProvider,
+    'ujson': UjsonProvider,
+    'stdlib': StdlibJSONProvider,
+}
+
+# Ordre de preference pour JSON_PROVIDER=auto
+AUTO_ORDER = ('orjson', 'ujson', 'stdlib')
+
+
+def create_json_provider(name='auto', app=None):
+    """
+    Instancier un fournisseur JSON (le premier disponible en mode auto)
+
+    Args:
+        name: 'auto', 'orjson', 'ujson' ou 'stdlib'
+        app: Application Flask ou Quart (None pour encoder hors requete)
+    """
+    if name != 'auto' and name not in JSON_PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER doit etre parmi auto, {', '.join(JSON_PROVIDERS)}")
+
+    for candidate in (AUTO_ORDER if name == 'auto' else (name,)):
+        try:
+            return JSON_PROVIDERS[candidate](app)
+        except ImportError:
+            if name != 'auto':
+                raise
+
+
+def install_json_provider(app, name='auto'):
+    """
+    Installer le fournisseur JSON de l'application (app.json)
+
+    Args:
+        app: Application Flask ou Quart
+        name: 'auto', 'orjson', 'ujson' ou 'stdlib'
+
+    Returns:
+        Le fournisseur installe
+    """
+    app.json = create_json_provider(name, app)
+    return app.json
@@ -8,6 +8,7 @@ from functools import wraps
 from flask import request, jsonify
 from ..config import AppConfig
 from ..models_loader import load_models
+from ..orm import Tenant
 
 
 class JWTManager:
@@ -25,6 +26,11 @@ class JWTManager:
             'iat': datetime.datetime.utcnow()
         }
         
+        # Lier le token au tenant courant (multi-tenant)
+        tenant = Tenant.current()
+        if tenant is not None:
+            payload[AppConfig.TENANT_JWT_CLAIM] = tenant
+        
         return jwt.encode(payload, AppConfig.JWT_SECRET_KEY, algorithm=AppConfig.JWT_ALGORITHM)
     
     @staticmethod
@@ -41,6 +47,15 @@ class JWTManager:
         except jwt.InvalidTokenError:
             raise ValueError("Token invalide")
     
+    @staticmethod
+    def touch_last_seen(User, user):
+        """
+        Mettre à jour User.last_seen en écriture différée (si la colonne existe)
+        Ajouter `last_seen: DateTime` au modèle User dans models.bmdb pour l'activer
+        """
+        if 'last_seen' in User.__table__.columns:
+            User.defer_update(user.id, last_seen=datetime.datetime.utcnow())
+    
     @staticmethod
     def token_required(f):
         """Décorateur pour protéger les routes"""
@@ -62,7 +77,12 @@ class JWTManager:
             try:
                 # Décoder le token
                 data = JWTManager.decode_token(token)
-                
+
+                # Un token n'est valable que pour le tenant qui l'a émis
+                # (un token sans claim reste limité à la base par défaut)
+                if data.get(AppConfig.TENANT_JWT_CLAIM) != Tenant.current():
+                    return jsonify({'error': 'Token émis pour un autre tenant'}), 401
+
                 # Charger le modèle User
                 models = load_models()
                 User = models.get('User')
@@ -76,6 +96,8 @@ class JWTManager:
                 if not current_user:
                     return jsonify({'error': 'Utilisateur introuvable'}), 401
                 
+                JWTManager.touch_last_seen(User, current_user)
+                
             except ValueError as e:
                 return jsonify({'error': str(e)}), 401
             except Exception as e:
@@ -15,6 +15,7 @@ if __name__ == '__main__':
     print("🗄️  Base de données: Connectée via BMDB")
     print("🔐 JWT: Configuré")
     print(f"📊 Modèles disponibles: {', '.join(app.bmdb_models.get('models', {}).keys())}")
+    print("🏭 Production: bmb serve")
     print("="*60 + "\n")
     
     app.run(
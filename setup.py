@@ -52,6 +52,20 @@ setup(
         ],
         "postgresql": ["psycopg2-binary>=2.9.0"],
         "mysql": ["pymysql>=1.1.0"],
+        "json": ["orjson>=3.9.0"],
+        "compression": ["brotli>=1.1.0", "zstandard>=0.22.0"],
+        "async": ["SQLAlchemy[asyncio]>=2.0.0", "aiosqlite>=0.19.0", "asyncpg>=0.29.0"],
+        "asgi": [
+            "quart>=0.19.0",
+            "hypercorn>=0.16.0",
+            "SQLAlchemy[asyncio]>=2.0.0",
+            "aiosqlite>=0.19.0",
+            "asyncpg>=0.29.0",
+        ],
+        "server": [
+            "gunicorn>=22.0.0; platform_system != 'Windows'",
+            "waitress>=3.0.0; platform_system == 'Windows'",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -30,10 +30,13 @@ def app():
     
     yield app
     
-    # Cleanup: supprimer la DB de test
-    test_db = Path('./test.db')
-    if test_db.exists():
-        test_db.unlink()
+    # Cleanup: fermer les connexions puis supprimer la DB de test (et le journal WAL)
+    from bmb.models_loader import ModelsLoader
+    ModelsLoader.dispose_engines()
+    for path in ('./test.db', './test.db-wal', './test.db-shm'):
+        test_db = Path(path)
+        if test_db.exists():
+            test_db.unlink()
 
 
 @pytest.fixture(scope='function')
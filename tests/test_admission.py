@@ -0,0 +1,104 @@
+"""
+Tests pour le controle d'admission
+"""
+
+import threading
+
+from flask import Flask
+
+from bmb.middleware.admission import AdmissionGate, AdmissionController, setup_admission_control
+
+
+class TestAdmissionGate:
+    """Tests du limiteur de concurrence"""
+
+    def test_acquire_within_limit(self):
+        """Les requetes sous la limite sont admises immediatement"""
+        gate = AdmissionGate('test', limit=2)
+
+        assert gate.acquire()
+        assert gate.acquire()
+        assert gate.stats()['in_flight'] == 2
+
+    def test_shed_when_full(self):
+        """Une requete est delestee apres le delai d'attente"""
+        gate = AdmissionGate('test', limit=1)
+        assert gate.acquire()
+
+        assert not gate.acquire(timeout=0.01)
+        stats = gate.stats()
+        assert stats['shed'] == 1
+        assert stats['timeouts'] == 1
+        assert stats['queue_depth'] == 0
+
+    def test_waiter_admitted_on_release(self):
+        """Une requete en attente est admise quand une place se libere"""
+        gate = AdmissionGate('test', limit=1)
+        assert gate.acquire()
+
+        result = {}
+        waiter = threading.Thread(target=lambda: result.update(ok=gate.acquire(timeout=2)))
+        waiter.start()
+        gate.release()
+        waiter.join()
+
+        assert result['ok'] is True
+
+    def test_priority_reserve(self):
+        """Les requetes prioritaires utilisent la reserve"""
+        gate = AdmissionGate('test', limit=1, priority_reserve=1)
+        assert gate.acquire()
+
+        assert not gate.acquire(priority=0, timeout=0)
+        assert gate.acquire(priority=1, timeout=0.01)
+
+
+class TestAdmissionMiddleware:
+    """Tests du middleware Flask"""
+
+    def _make_app(self, controller):
+        app = Flask(__name__)
+        setup_admission_control(app, controller)
+
+        @app.route('/api/health')
+        def health():
+            return 'ok'
+
+        @app.route('/api/slow')
+        def slow():
+            return 'ok'
+
+        return app
+
+    def test_shed_returns_503(self):
+        """Les requetes excedentaires recoivent 503 avec Retry-After"""
+        controller = AdmissionController(max_concurrent=1, queue_timeout=0, priority_reserve=1,
+                                         priority_paths=['/api/health'])
+        app = self._make_app(controller)
+        client = app.test_client()
+
+        # Occuper l'unique place
+        assert controller.worker_gate.acquire()
+
+        response = client.get('/api/slow')
+        assert response.status_code == 503
+        assert 'Retry-After' in response.headers
+
+        # Le health check passe grace a la priorite
+        response = client.get('/api/health')
+        assert response.status_code == 200
+
+        controller.worker_gate.release()
+        assert client.get('/api/slow').status_code == 200
+        assert controller.stats()['worker']['in_flight'] == 0
+
+    def test_metrics_endpoint(self, client):
+        """Les metriques d'admission sont exposees"""
+        response = client.get('/api/metrics')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert 'worker' in data['data']['admission']
+
+        response = client.get('/api/metrics?format=prometheus')
+        assert b'bmb_admission_shed' in response.data
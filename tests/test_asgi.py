@@ -0,0 +1,95 @@
+"""
+Tests pour le mode ASGI (Quart)
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('quart')
+
+from bmb.asgi import create_asgi_app  # noqa: E402
+from bmb.models_loader import ModelsLoader  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def asgi_app(app):
+    """Application ASGI partageant la base de test"""
+    return create_asgi_app()
+
+
+def run(coro):
+    """Executer un scenario et fermer le pool asyncio dans la meme boucle"""
+    async def scenario():
+        try:
+            return await coro
+        finally:
+            await ModelsLoader.dispose_async_engine()
+    return asyncio.run(scenario())
+
+
+class TestASGI:
+    """Tests des blueprints asynchrones"""
+
+    def test_health_check(self, asgi_app):
+        """Le health check repond en mode ASGI"""
+        async def scenario():
+            client = asgi_app.test_client()
+            response = await client.get('/api/health')
+            return response.status_code, await response.get_json()
+
+        status, data = run(scenario())
+
+        assert status == 200
+        assert data['data']['components']['api']['mode'] == 'asgi'
+
+    def test_register_login_me(self, asgi_app):
+        """Inscription, connexion et profil via les routes asynchrones"""
+        async def scenario():
+            client = asgi_app.test_client()
+            response = await client.post('/api/auth/register', json={
+                'name': 'Async User',
+                'email': 'async@example.com',
+                'password': 'async123'
+            })
+            assert response.status_code == 201
+
+            response = await client.post('/api/auth/login', json={
+                'email': 'async@example.com',
+                'password': 'async123'
+            })
+            assert response.status_code == 200
+            token = (await response.get_json())['data']['token']
+
+            response = await client.get('/api/auth/me', headers={
+                'Authorization': f'Bearer {token}'
+            })
+            return response.status_code, await response.get_json()
+
+        status, data = run(scenario())
+
+        assert status == 200
+        assert data['data']['user']['email'] == 'async@example.com'
+
+    def test_protected_route_without_token(self, asgi_app):
+        """Les routes protegees exigent un token"""
+        async def scenario():
+            client = asgi_app.test_client()
+            response = await client.get('/api/users')
+            return response.status_code
+
+        assert run(scenario()) == 401
+
+
+@pytest.mark.parametrize('name, value', [
+    ('DB_REPLICAS', ['sqlite:///./replica.db']),
+    ('DB_SHARDS', ['sqlite:///./shard0.db', 'sqlite:///./shard1.db']),
+    ('WRITE_QUEUE_ENABLED', True),
+])
+def test_asgi_refuses_sync_only_routing(app, monkeypatch, name, value):
+    """Replicas, shards et file d'ecriture non routes en asyncio: demarrage refuse"""
+    from bmb.config import BMDBConfig
+
+    monkeypatch.setattr(BMDBConfig, name, value)
+    with pytest.raises(RuntimeError, match=name):
+        create_asgi_app()
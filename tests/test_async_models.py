@@ -0,0 +1,61 @@
+"""
+Tests pour l'API asynchrone des modeles
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+
+from bmb.models_loader import ModelsLoader  # noqa: E402
+from bmb.orm import async_url  # noqa: E402
+
+
+def run(coro):
+    """Executer un scenario et fermer le pool dans la meme boucle"""
+    async def scenario():
+        try:
+            return await coro
+        finally:
+            await ModelsLoader.dispose_async_engine()
+    return asyncio.run(scenario())
+
+
+class TestAsyncModels:
+    """Tests de aget/afilter/afirst/acount/asave/adelete"""
+    
+    def test_async_url(self):
+        """Conversion des URLs vers les pilotes asyncio"""
+        assert async_url('sqlite:///./db.sqlite') == 'sqlite+aiosqlite:///./db.sqlite'
+        assert async_url('postgresql+psycopg2://u:p@h/db') == 'postgresql+asyncpg://u:p@h/db'
+    
+    def test_async_crud(self, app):
+        """Cycle complet create/read/count/delete en asynchrone"""
+        User = ModelsLoader.get_model('User')
+        
+        async def scenario():
+            user = await User(name='Async', email='acrud@example.com', password='x', age=40).asave()
+            assert user.id is not None
+            
+            fetched = await User.aget(user.id)
+            assert fetched.email == 'acrud@example.com'
+            
+            assert (await User.afirst(email='acrud@example.com')).id == user.id
+            assert [u.id for u in await User.afilter(age=40, email='acrud@example.com')] == [user.id]
+            assert await User.acount(email='acrud@example.com') == 1
+            
+            assert await fetched.adelete() is True
+            return await User.aget(user.id)
+        
+        assert run(scenario()) is None
+    
+    def test_concurrent_reads(self, app):
+        """Plusieurs lectures concurrentes sur la meme boucle"""
+        User = ModelsLoader.get_model('User')
+        
+        async def scenario():
+            return await asyncio.gather(*(User.acount() for _ in range(10)))
+        
+        counts = run(scenario())
+        assert len(set(counts)) == 1
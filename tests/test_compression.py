@@ -0,0 +1,159 @@
+"""
+Tests pour la compression des reponses (Accept-Encoding)
+"""
+
+import asyncio
+import gzip
+import json
+import uuid
+
+import pytest
+from werkzeug.http import parse_accept_header
+
+from bmb.middleware.compression import GzipCodec, ResponseCompressor, load_codecs
+from bmb.models_loader import load_models
+from bmb.utils import JWTManager
+
+
+class FakeCodec:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def compress(self, data, level):
+        self.calls += 1
+        return self.name.encode() + data[:1]
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def users(User):
+    tag = uuid.uuid4().hex
+    users = [User(name=tag, email=f'{tag}-{i}@example.com', password='x', age=i).save() for i in range(30)]
+    yield users
+    for user in users:
+        user.delete()
+
+
+@pytest.fixture
+def headers(users):
+    return {'Authorization': f'Bearer {JWTManager.generate_token(users[0].id)}'}
+
+
+@pytest.fixture
+def compressor(app, monkeypatch):
+    compressor = app.extensions['bmb_compression']
+    monkeypatch.setattr(compressor, '_cache', type(compressor._cache)())
+    return compressor
+
+
+class TestResponseCompressor:
+    """Tests de la negociation et du cache"""
+
+    @pytest.mark.parametrize('header, expected', [
+        ('gzip, br', 'br'),                  # a egalite: preference du serveur
+        ('gzip, br;q=0.5', 'gzip'),          # qualite du client d'abord
+        ('*', 'br'),
+        ('identity', None),
+        ('br;q=0, gzip;q=0', None),
+    ])
+    def test_negotiate(self, header, expected):
+        compressor = ResponseCompressor([FakeCodec('br'), FakeCodec('gzip')])
+        codec = compressor.negotiate(parse_accept_header(header))
+        assert (codec.name if codec else None) == expected
+
+    def test_cache_by_etag(self):
+        codec = FakeCodec('gzip')
+        compressor = ResponseCompressor([codec], cache_size=1)
+
+        assert compressor.compress(codec, b'abc', 'v1') == compressor.compress(codec, b'abc', 'v1')
+        assert codec.calls == 1
+        compressor.compress(codec, b'xyz', 'v2')
+        compressor.compress(codec, b'abc', 'v1')
+        assert codec.calls == 3  # v1 evince par v2
+        assert compressor.stats()['cache_hits'] == 1
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            load_codecs(['lzma'])
+
+    def test_missing_optional_codecs_are_skipped(self):
+        assert [codec.name for codec in load_codecs(['gzip'])] == ['gzip']
+        assert 'gzip' in [codec.name for codec in load_codecs(['zstd', 'br', 'gzip'])]
+
+
+class TestCompressionMiddleware:
+    """Tests des reponses compressees"""
+
+    def test_users_page_gzip(self, client, users, headers, compressor):
+        """Page JSON au-dessus du seuil: gzip, Vary et corps identique une fois decompresse"""
+        url = f'/api/users?name={users[0].name}&page_size=30'
+        plain = client.get(url, headers=headers)
+        response = client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'})
+
+        assert plain.headers.get('Content-Encoding') is None
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert int(response.headers['Content-Length']) == len(response.data) < len(plain.data)
+        assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+
+    def test_small_responses_untouched(self, client, compressor):
+        response = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+        assert len(response.data) < compressor.min_size
+        assert 'Content-Encoding' not in response.headers
+
+    def test_etag_cache_and_not_modified(self, client, users, headers, compressor, monkeypatch):
+        """Corps compresse reutilise par ETag; l'ETag faible reste valide pour If-None-Match"""
+        monkeypatch.setattr(compressor, 'min_size', 0)
+        request_headers = {**headers, 'Accept-Encoding': 'gzip'}
+
+        first = client.get(f'/api/users/{users[0].id}', headers=request_headers)
+        hits = compressor.cache_hits
+        second = client.get(f'/api/users/{users[0].id}', headers=request_headers)
+
+        assert first.headers['ETag'].startswith('W/')
+        assert second.data == first.data
+        assert compressor.cache_hits == hits + 1
+
+        response = client.get(
+            f'/api/users/{users[0].id}', headers={**request_headers, 'If-None-Match': first.headers['ETag']}
+        )
+        assert response.status_code == 304
+
+    def test_streams_are_not_buffered(self, client, users, headers, compressor):
+        response = client.get(
+            f'/api/users?name={users[0].name}&stream=ndjson',
+            headers={**headers, 'Accept-Encoding': 'gzip'}
+        )
+        assert 'Content-Encoding' not in response.headers
+        assert len(response.data.splitlines()) == 30
+
+    def test_asgi_gzip(self, app, users, headers):
+        """Meme compression en mode ASGI"""
+        pytest.importorskip('quart')
+        from bmb.asgi import create_asgi_app
+        from bmb.models_loader import ModelsLoader
+
+        async def run():
+            try:
+                response = await create_asgi_app().test_client().get(
+                    f'/api/users?name={users[0].name}&page_size=30',
+                    headers={**headers, 'Accept-Encoding': 'gzip'}
+                )
+                return response.headers.get('Content-Encoding'), await response.get_data()
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        encoding, body = asyncio.run(run())
+
+        assert encoding == 'gzip'
+        assert len(json.loads(gzip.decompress(body))['data']['users']) == 30
+
+
+def test_gzip_is_deterministic():
+    codec = GzipCodec()
+    assert codec.compress(b'x' * 100, 5) == codec.compress(b'x' * 100, 5)
@@ -0,0 +1,139 @@
+"""
+Tests pour les requetes conditionnelles (ETag, 304, Cache-Control)
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from bmb.config import AppConfig
+from bmb.models_loader import ModelsLoader, load_models
+from bmb.orm import TableVersions
+from bmb.utils import JWTManager, instance_etag
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def user(User):
+    tag = uuid.uuid4().hex
+    user = User(name=tag, email=f'{tag}@example.com', password='secret', age=30).save()
+    yield user
+    user.delete()
+
+
+@pytest.fixture
+def headers(user):
+    return {'Authorization': f'Bearer {JWTManager.generate_token(user.id)}'}
+
+
+class TestInstanceEtag:
+    """Tests de l'ETag calcule sur la ligne"""
+
+    def test_changes_with_exposed_columns_only(self, User, user):
+        etag = instance_etag(user)
+        assert instance_etag(User.get(user.id)) == etag
+
+        user.password = 'autre'
+        assert instance_etag(user) == etag
+
+        user.age = 31
+        assert instance_etag(user) != etag
+
+
+class TestConditionalRoutes:
+    """Tests de If-None-Match sur les routes de lecture"""
+
+    def test_user_not_modified(self, client, user, headers):
+        """Deuxieme requete avec l'ETag: 304 sans corps"""
+        response = client.get(f'/api/users/{user.id}', headers=headers)
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+
+        response = client.get(f'/api/users/{user.id}', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    def test_user_modified(self, client, User, user, headers):
+        etag = client.get(f'/api/users/{user.id}', headers=headers).headers['ETag']
+        User.update(user.id, age=99)
+
+        response = client.get(f'/api/users/{user.id}', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['data']['user']['age'] == 99
+        assert response.headers['ETag'] != etag
+
+    def test_me_skips_serialization(self, client, user, headers, monkeypatch):
+        """ETag de ligne: to_dict n'est pas appele pour un 304"""
+        etag = client.get('/api/auth/me', headers=headers).headers['ETag']
+        monkeypatch.setattr(type(user), 'to_dict', lambda self, *a, **kw: pytest.fail('serialise'))
+
+        response = client.get('/api/auth/me', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_not_modified_after_tracking_flush(self, client, User, user, headers, monkeypatch):
+        """L'ecriture differee de la colonne de suivi ne change ni l'ETag ni le cache"""
+        # 'age' joue le role de last_seen (absent du schema de test)
+        monkeypatch.setattr(AppConfig, 'ETAG_IGNORE_COLUMNS', ['age'])
+        monkeypatch.setattr(
+            JWTManager, 'touch_last_seen', staticmethod(lambda model, u: model.defer_update(u.id, age=u.age + 1))
+        )
+        buffer = ModelsLoader.get_write_behind()
+        monkeypatch.setattr(buffer, 'unversioned_columns', frozenset({'age'}))
+        table = (User.__table__.name,)
+
+        etag = client.get('/api/auth/me', headers=headers).headers['ETag']
+        before = TableVersions.get(table)
+        assert buffer.flush() == 1
+        assert User.get(user.id).age == 31
+        assert TableVersions.get(table) == before
+
+        response = client.get('/api/auth/me', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        buffer.flush()
+
+    def test_authentication_before_304(self, client, user, headers):
+        etag = client.get('/api/auth/me', headers=headers).headers['ETag']
+        assert client.get('/api/auth/me', headers={'If-None-Match': etag}).status_code == 401
+
+    def test_info_body_etag_and_route_policy(self, client, monkeypatch):
+        """ETag du corps; Cache-Control surcharge par CACHE_CONTROL_ROUTES"""
+        response = client.get('/api/info')
+        assert response.headers['Cache-Control'] == 'public, max-age=60'
+        assert client.get('/api/info', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+        monkeypatch.setattr(AppConfig, 'CACHE_CONTROL_ROUTES', {'health.app_info': 'no-store'})
+        assert client.get('/api/info').headers['Cache-Control'] == 'no-store'
+
+    def test_errors_are_not_tagged(self, client, headers):
+        response = client.get('/api/users/999999999', headers=headers)
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
+
+    def test_asgi_not_modified(self, app, user, headers):
+        """Memes reponses conditionnelles en mode ASGI"""
+        pytest.importorskip('quart')
+        from bmb.asgi import create_asgi_app
+        from bmb.models_loader import ModelsLoader
+
+        async def run():
+            try:
+                client = create_asgi_app().test_client()
+                first = await client.get(f'/api/users/{user.id}', headers=headers)
+                second = await client.get(
+                    f'/api/users/{user.id}', headers={**headers, 'If-None-Match': first.headers['ETag']}
+                )
+                info = await client.get('/api/info')
+                cached = await client.get('/api/info', headers={'If-None-Match': info.headers['ETag']})
+                return first.status_code, second.status_code, await second.get_data(), cached.status_code
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        assert asyncio.run(run()) == (200, 304, b'', 304)
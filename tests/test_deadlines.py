@@ -0,0 +1,136 @@
+"""
+Tests pour les delais maximaux propages aux requetes SQL
+"""
+
+import asyncio
+import time
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from bmb.middleware.deadlines import setup_request_deadlines, request_deadline
+from bmb.orm import Deadline, DeadlineExceeded, install_deadline_hooks
+from bmb.utils import error_response
+
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    install_deadline_hooks(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestDeadline:
+    """Tests de l'interruption des requetes SQL"""
+
+    def test_sqlite_statement_interrupted(self, engine):
+        """Une requete SQLite trop longue est interrompue"""
+        with Deadline.scope(0.05):
+            with pytest.raises(DeadlineExceeded):
+                with engine.connect() as conn:
+                    conn.execute(SLOW_QUERY)
+
+        # La connexion reste utilisable sans echeance
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    def test_expired_deadline_fails_fast(self, engine):
+        """Aucune instruction n'est executee apres l'echeance"""
+        with Deadline.scope(0.001):
+            time.sleep(0.01)
+            with pytest.raises(DeadlineExceeded):
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            assert Deadline.exceeded()
+
+    def test_install_is_idempotent(self, engine):
+        """Installer deux fois les hooks ne les duplique pas"""
+        install_deadline_hooks(engine)
+
+        with Deadline.scope(5):
+            with engine.connect() as conn:
+                assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+class TestDeadlineMiddleware:
+    """Tests de la conversion en 504"""
+
+    def _make_app(self, engine):
+        app = Flask(__name__)
+        setup_request_deadlines(app)
+
+        @app.route('/slow')
+        @request_deadline(0.05)
+        def slow():
+            # Les routes BMB capturent les exceptions et renvoient 500
+            try:
+                with engine.connect() as conn:
+                    conn.execute(SLOW_QUERY)
+            except Exception as e:
+                return error_response(f"Erreur: {str(e)}", 500)
+            return 'done'
+
+        @app.route('/budget')
+        @request_deadline(10)
+        def budget():
+            return str(Deadline.remaining())
+
+        @app.route('/fast')
+        def fast():
+            with engine.connect() as conn:
+                return str(conn.execute(text("SELECT 1")).scalar())
+
+        return app
+
+    def test_route_deadline_returns_504(self, engine):
+        """Une route interrompue par son echeance renvoie 504"""
+        client = self._make_app(engine).test_client()
+
+        response = client.get('/slow')
+
+        assert response.status_code == 504
+
+    @pytest.mark.parametrize('header, low, high', [
+        ('2', 1, 2),          # raccourci
+        ('100', 9, 10),       # plafonne au delai de la route
+        ('0', 9, 10),         # ignore: ne desactive pas le delai
+        ('-5', 9, 10),
+        ('abc', 9, 10),
+    ])
+    def test_header_can_only_shorten_deadline(self, engine, header, low, high):
+        """X-Request-Timeout ne peut que raccourcir le delai de la route"""
+        client = self._make_app(engine).test_client()
+
+        response = client.get('/budget', headers={'X-Request-Timeout': header})
+
+        assert low < float(response.data) <= high
+
+    def test_asgi_uses_same_resolution(self, monkeypatch):
+        """Meme resolution en mode ASGI (delai de route, en-tete borne)"""
+        pytest.importorskip('quart')
+        from quart import Quart
+        from bmb.asgi.app import _setup_deadlines
+
+        app = Quart(__name__)
+        _setup_deadlines(app)
+
+        @app.route('/budget')
+        @request_deadline(10)
+        async def budget():
+            return str(Deadline.remaining())
+
+        async def run(header):
+            response = await app.test_client().get('/budget', headers={'X-Request-Timeout': header})
+            return float(await response.get_data())
+
+        assert 9 < asyncio.run(run('0')) <= 10
+        assert 9 < asyncio.run(run('500')) <= 10
+        assert asyncio.run(run('1')) <= 1
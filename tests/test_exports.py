@@ -0,0 +1,237 @@
+"""
+Tests pour les exports massifs (CSV / NDJSON, jobs en arriere-plan)
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import pytest
+
+import bmb.exports
+from bmb.cli import BMBCLI
+from bmb.exports import ExportError, ExportManager
+from bmb.models_loader import load_models
+from bmb.utils import JWTManager
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def users(User):
+    tag = uuid.uuid4().hex
+    users = [User(name=tag, email=f'{tag}-{i}@example.com', password='secret', age=20 + i).save() for i in range(5)]
+    yield users
+    for user in users:
+        user.delete()
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Gestionnaire d'exports dans un dossier temporaire"""
+    manager = ExportManager(tmp_path / 'exports', batch_size=2)
+    monkeypatch.setattr(bmb.exports, '_manager', manager)
+    yield manager
+    manager.shutdown()
+
+
+def wait_for(manager, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("Export non termine")
+
+
+class TestExportManager:
+    """Tests du gestionnaire d'exports"""
+
+    def test_csv_gzip_export(self, manager, User, users):
+        """CSV compresse, en-tete et toutes les lignes, sans mot de passe"""
+        job = manager.create(User, filters={'name': users[0].name})
+        job = manager.run(User, job)
+
+        assert job['status'] == 'done'
+        assert job['rows'] == 5
+        with gzip.open(manager.file_path(job), 'rt', newline='') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ['id', 'name', 'email', 'age']
+        assert [row[2] for row in rows[1:]] == [user.email for user in users]
+        assert manager.get(job['id'])['bytes'] == os.path.getsize(manager.file_path(job))
+
+    def test_ndjson_export(self, manager, User, users):
+        """NDJSON non compresse, colonnes choisies"""
+        job = manager.create(User, fmt='ndjson', columns=['id', 'age'], filters={'name': users[0].name}, compress=False)
+        job = manager.run(User, job)
+
+        lines = manager.file_path(job).read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [{'id': user.id, 'age': user.age} for user in users]
+
+    @pytest.mark.parametrize('kwargs', [
+        {'fmt': 'xlsx'},
+        {'columns': ['nope']},
+        {'columns': ['id', 'password']},
+        {'filters': {'nope': 1}},
+    ])
+    def test_invalid_requests(self, manager, User, kwargs):
+        with pytest.raises(ExportError):
+            manager.create(User, **kwargs)
+
+    def test_failure_leaves_no_partial_file(self, manager, User, users, monkeypatch):
+        """Echec: job failed, fichier partiel supprime"""
+        def broken_stream(**kwargs):
+            raise RuntimeError('base indisponible')
+        monkeypatch.setattr(User, 'stream', broken_stream)
+
+        job = manager.run(User, manager.create(User))
+
+        assert job['status'] == 'failed'
+        assert 'base indisponible' in job['error']
+        assert not any(path.name.endswith('.part') for path in manager.directory.iterdir())
+
+    def test_background_job(self, manager, User, users):
+        """start() rend la main immediatement, le job s'execute dans le pool d'exports"""
+        job = manager.start(User, filters={'name': users[0].name})
+        assert job['status'] == 'pending'
+
+        assert wait_for(manager, job['id'])['rows'] == 5
+
+    def test_purge_expired_exports(self, manager, User, users):
+        job = manager.run(User, manager.create(User, filters={'name': users[0].name}))
+        manager.ttl = 1
+        old = time.time() - 10
+        os.utime(manager.directory / f"{job['id']}.json", (old, old))
+
+        assert manager.purge() == 1
+        assert manager.get(job['id']) is None
+        assert not manager.file_path(job).exists()
+
+    def test_orphaned_jobs_fail(self, manager, User):
+        """Un job dont le worker a disparu ou qui ne progresse plus passe en echec"""
+        dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+        dead.wait()
+
+        gone = manager.create(User)
+        gone.update(status='running', pid=dead.pid)
+        manager._save(gone)
+        (manager.directory / f"{gone['file']}.part").write_bytes(b'partial')
+
+        stalled = manager.create(User)
+        stalled.update(status='running', heartbeat=time.time() - manager.heartbeat_timeout - 1)
+        manager._save(stalled)
+
+        queued = manager.create(User)
+
+        job = manager.get(gone['id'])
+        assert job['status'] == 'failed' and 'interrompu' in job['error']
+        assert not (manager.directory / f"{gone['file']}.part").exists()
+        assert manager.recover() == 1
+        assert manager.get(stalled['id'])['status'] == 'failed'
+        assert manager.get(queued['id'])['status'] == 'pending'
+
+    def test_unknown_job_ids(self, manager):
+        assert manager.get('../../etc/passwd') is None
+        assert manager.get(uuid.uuid4().hex) is None
+
+
+class TestExportRoutes:
+    """Tests de /api/exports"""
+
+    def test_export_lifecycle(self, client, manager, users):
+        """POST 202, suivi de l'etat, telechargement complet puis partiel (Range)"""
+        headers = {'Authorization': f'Bearer {JWTManager.generate_token(users[0].id)}'}
+        response = client.post('/api/exports', headers=headers, json={
+            'model': 'User',
+            'format': 'ndjson',
+            'filters': {'name': users[0].name}
+        })
+        assert response.status_code == 202
+        job_id = response.get_json()['data']['export']['id']
+        assert response.headers['Location'].endswith(f'/api/exports/{job_id}')
+        assert 'owner' not in response.get_json()['data']['export']
+
+        wait_for(manager, job_id)
+        status = client.get(f'/api/exports/{job_id}', headers=headers).get_json()['data']['export']
+        assert status['status'] == 'done' and status['rows'] == 5
+
+        response = client.get(status['download_url'], headers=headers)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/gzip'
+        body = response.data
+        rows = [json.loads(line) for line in gzip.decompress(body).splitlines()]
+        assert [row['email'] for row in rows] == [user.email for user in users]
+
+        response = client.get(status['download_url'], headers={**headers, 'Range': 'bytes=10-'})
+        assert response.status_code == 206
+        assert response.data == body[10:]
+
+    def test_jobs_are_private(self, client, manager, users):
+        """Un autre utilisateur ne voit pas l'export"""
+        owner = {'Authorization': f'Bearer {JWTManager.generate_token(users[0].id)}'}
+        other = {'Authorization': f'Bearer {JWTManager.generate_token(users[1].id)}'}
+        job_id = client.post('/api/exports', headers=owner, json={'model': 'User'}).get_json()['data']['export']['id']
+        wait_for(manager, job_id)
+
+        assert client.get(f'/api/exports/{job_id}', headers=other).status_code == 404
+        assert client.get(f'/api/exports/{job_id}/download', headers=other).status_code == 404
+
+    def test_rejected_requests(self, client, manager, users):
+        headers = {'Authorization': f'Bearer {JWTManager.generate_token(users[0].id)}'}
+        assert client.post('/api/exports', headers=headers, json={'model': 'Secret'}).status_code == 400
+        assert client.post('/api/exports', headers=headers, json={
+            'model': 'User', 'columns': ['password']
+        }).status_code == 400
+
+    def test_asgi_export(self, app, manager, users):
+        """Memes routes en mode ASGI"""
+        pytest.importorskip('quart')
+        from bmb.asgi import create_asgi_app
+        from bmb.models_loader import ModelsLoader
+
+        headers = {'Authorization': f'Bearer {JWTManager.generate_token(users[0].id)}'}
+
+        async def run():
+            try:
+                client = create_asgi_app().test_client()
+                response = await client.post('/api/exports', headers=headers, json={
+                    'model': 'User', 'filters': {'name': users[0].name}
+                })
+                job_id = (await response.get_json())['data']['export']['id']
+                await asyncio.to_thread(wait_for, manager, job_id)
+                download = await client.get(f'/api/exports/{job_id}/download', headers=headers)
+                return response.status_code, download.status_code, await download.get_data()
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        created, downloaded, body = asyncio.run(run())
+
+        assert (created, downloaded) == (202, 200)
+        assert len(gzip.decompress(body).splitlines()) == 6
+
+
+class TestExportCommand:
+    """Tests de bmb export"""
+
+    def test_cli_export(self, manager, users, tmp_path):
+        output = tmp_path / 'users.csv'
+        assert BMBCLI().export(
+            'User', where=[f'name={users[0].name}', 'age=22'], output=output, compress=False
+        )
+
+        rows = list(csv.DictReader(io.StringIO(output.read_text())))
+        assert [row['email'] for row in rows] == [users[2].email]
+
+    def test_cli_unknown_model(self, manager):
+        assert not BMBCLI().export('Nope')
@@ -0,0 +1,159 @@
+"""
+Tests pour les champs et relations demandes (?fields=, ?include=)
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from flask import Flask
+from sqlalchemy import Column, ForeignKey, Integer, String, Text, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+
+from bmb.models_loader import load_models
+from bmb.orm import aio, install_model_extensions, install_serializers, queries
+from bmb.utils import JWTManager, requested_fields, requested_includes
+
+Base = declarative_base()
+
+
+class Author(Base):
+    __tablename__ = 'authors'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    password = Column(String)
+    posts = relationship('Post', back_populates='author')
+
+
+class Post(Base):
+    __tablename__ = 'posts'
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    body = Column(Text)
+    author_id = Column(Integer, ForeignKey('authors.id'))
+    author = relationship('Author', back_populates='posts')
+
+
+install_model_extensions([Author, Post])
+install_serializers([Author, Post], exclude=['password'])
+
+
+@pytest.fixture
+def blog(tmp_path, monkeypatch):
+    """Base sqlite avec 2 auteurs et 4 articles; requetes SQL relevees"""
+    engine = create_engine(f'sqlite:///{tmp_path / "blog.db"}')
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        alice, bob = Author(id=1, name='alice', password='s1'), Author(id=2, name='bob', password='s2')
+        session.add_all([alice, bob])
+        session.add_all([
+            Post(id=i, title=f't{i}', body='x' * 100, author=alice if i % 2 else bob) for i in range(1, 5)
+        ])
+        session.commit()
+
+    executed = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    monkeypatch.setattr(queries, '_session_factory', lambda: factory)
+    yield executed
+    engine.dispose()
+
+
+class TestRowsInclude:
+    """Tests de Model.rows(columns=..., include=...)"""
+
+    def test_columns_are_projected(self, blog):
+        assert Post.rows(columns=['id', 'title'], limit=2) == [{'id': 1, 'title': 't1'}, {'id': 2, 'title': 't2'}]
+        assert 'body' not in blog[-1]
+
+    def test_many_to_one_batched(self, blog):
+        """Une requete pour les articles, une seule pour leurs auteurs (sans mot de passe)"""
+        rows = Post.rows(columns=['id', 'title'], include=['author'])
+
+        assert len(blog) == 2
+        assert 'IN' in blog[1] and 'password' not in blog[1]
+        assert 'body' not in blog[0]
+        assert rows[0] == {'id': 1, 'title': 't1', 'author': {'id': 1, 'name': 'alice'}}
+        assert [row['author']['name'] for row in rows] == ['alice', 'bob', 'alice', 'bob']
+
+    def test_one_to_many_batched(self, blog):
+        rows = Author.rows(columns=['name'], include=['posts'], desc=True)
+
+        assert len(blog) == 2
+        assert rows[0]['name'] == 'bob'
+        assert [post['id'] for post in rows[0]['posts']] == [2, 4]
+        assert set(rows[0]) == {'name', 'posts'}
+
+    def test_unknown_relation(self, blog):
+        with pytest.raises(ValueError):
+            Post.rows(include=['comments'])
+        with pytest.raises(ValueError):
+            Post.rows(include=['author'], result='tuple')
+
+    def test_async_include(self, tmp_path, blog, monkeypatch):
+        pytest.importorskip('aiosqlite')
+        engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "blog.db"}')
+        monkeypatch.setattr(aio, '_async_session', lambda: async_sessionmaker(engine)())
+
+        async def run():
+            try:
+                return await Post.arows(columns=['id'], include=['author'], limit=1, author_id=2)
+            finally:
+                await engine.dispose()
+
+        assert asyncio.run(run()) == [{'id': 2, 'author': {'id': 2, 'name': 'bob'}}]
+
+
+class TestRequestHelpers:
+    """Tests de l'analyse des parametres"""
+
+    def test_fields(self):
+        with Flask(__name__).test_request_context('/?fields=id, title,id'):
+            from flask import request
+            assert requested_fields(request, Post) == ('id', 'title')
+
+        with Flask(__name__).test_request_context('/?fields=id,password'):
+            from flask import request
+            with pytest.raises(ValueError, match='password'):
+                requested_fields(request, Author)
+
+    def test_includes(self):
+        with Flask(__name__).test_request_context('/?include=author'):
+            from flask import request
+            assert requested_includes(request, Post) == ('author',)
+            with pytest.raises(ValueError):
+                requested_includes(request, Post, allowed=())
+            assert requested_fields(request, Post) is None
+
+
+class TestUsersRoute:
+    """Tests de ?fields= et ?include= sur GET /api/users"""
+
+    @pytest.fixture
+    def user(self, app):
+        User = load_models()['User']
+        tag = uuid.uuid4().hex
+        user = User(name=tag, email=f'{tag}@example.com', password='secret', age=30).save()
+        yield user
+        user.delete()
+
+    @pytest.fixture
+    def headers(self, user):
+        return {'Authorization': f'Bearer {JWTManager.generate_token(user.id)}'}
+
+    def test_sparse_fields(self, client, user, headers):
+        response = client.get(f'/api/users?name={user.name}&fields=id,name', headers=headers)
+        assert response.get_json()['data']['users'] == [{'id': user.id, 'name': user.name}]
+
+    def test_invalid_parameters(self, client, user, headers):
+        assert client.get('/api/users?fields=password', headers=headers).status_code == 400
+        assert client.get('/api/users?include=posts', headers=headers).status_code == 400
+
+    def test_stream_fields(self, client, user, headers):
+        response = client.get(f'/api/users?name={user.name}&fields=email&stream=ndjson', headers=headers)
+        assert response.data.decode().strip() == f'{{"email":"{user.email}"}}'
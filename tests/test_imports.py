@@ -0,0 +1,232 @@
+"""
+Tests pour les imports massifs (CSV / NDJSON, insertion par lots)
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import uuid
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from bmb.cli import BMBCLI
+from bmb.config import AppConfig
+from bmb.imports import BulkImportError, BulkImporter, import_format, importer_for, parse_records
+from bmb.models_loader import load_models
+from bmb.utils import JWTManager
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture(autouse=True)
+def fast_import(monkeypatch):
+    """Petits lots et hachage rapide pour les tests"""
+    monkeypatch.setattr(AppConfig, 'IMPORT_BATCH_SIZE', 2)
+    monkeypatch.setattr(AppConfig, 'IMPORT_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+
+@pytest.fixture
+def tag(User):
+    """Nom commun aux utilisateurs importes, supprimes apres le test"""
+    tag = uuid.uuid4().hex
+    yield tag
+    for user in User.filter(name=tag):
+        user.delete()
+
+
+def csv_body(tag, rows):
+    lines = ['name,email,password,age'] + [f'{tag},{email},{password},{age}' for email, password, age in rows]
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def run_import(User, body, fmt, **options):
+    return importer_for(User, **options).run(parse_records(io.BytesIO(body), fmt)).to_dict()
+
+
+class TestParsing:
+    """Tests de la lecture des flux"""
+
+    def test_ndjson_errors_keep_line_numbers(self):
+        body = b'{"a": 1}\n\nnot json\n[1, 2]\n{"b": 2}\n'
+        records = list(parse_records(io.BytesIO(body), 'ndjson'))
+
+        assert [(line, row) for line, row, _ in records] == [(1, {'a': 1}), (3, None), (4, None), (5, {'b': 2})]
+        assert records[1][2].startswith('JSON invalide')
+
+    def test_csv_gzip(self):
+        body = gzip.compress('﻿name,age\nÉlodie,\n'.encode())
+        records = list(parse_records(io.BytesIO(body), 'csv', gzipped=True))
+
+        assert records == [(2, {'name': 'Élodie', 'age': None}, None)]
+
+    @pytest.mark.parametrize('args, expected', [
+        (('ndjson', 'text/csv', None), 'ndjson'),
+        ((None, 'text/csv', None), 'csv'),
+        ((None, 'application/octet-stream', 'users.jsonl.gz'), 'ndjson'),
+    ])
+    def test_import_format(self, args, expected):
+        assert import_format(*args) == expected
+
+    def test_unknown_format(self):
+        with pytest.raises(BulkImportError):
+            import_format(None, 'application/json')
+
+
+class TestBulkImporter:
+    """Tests de l'import par lots"""
+
+    def test_csv_report(self, User, tag):
+        """Lignes valides inserees, erreurs par numero de ligne"""
+        existing = User(name=tag, email=f'{tag}-0@example.com', password='x').save()
+        body = csv_body(tag, [
+            (f'{tag}-1@example.com', 'secret1', 21),
+            (f'{tag}-0@example.com', 'secret1', 22),   # deja en base
+            (f'{tag}-1@example.com', 'secret1', 23),   # doublon du fichier
+            ('pas-un-email', 'secret1', 24),
+            (f'{tag}-2@example.com', 'abc', 25),       # mot de passe trop court
+            (f'{tag}-3@example.com', 'secret1', 'vingt'),
+            (f'{tag}-4@example.com', 'secret1', ''),
+        ])
+
+        report = run_import(User, body, 'csv')
+
+        assert report['inserted'] == 2
+        assert report['rejected'] == 5
+        assert [error['line'] for error in sorted(report['errors'], key=lambda e: e['line'])] == [3, 4, 5, 6, 7]
+        imported = User.first(email=f'{tag}-1@example.com')
+        assert imported.age == 21
+        assert check_password_hash(imported.password, 'secret1')
+        assert User.first(email=f'{tag}-4@example.com').age is None
+        assert User.get(existing.id).password == 'x'
+
+    def test_ndjson_unknown_columns(self, User, tag):
+        body = b'\n'.join(json.dumps(row).encode() for row in [
+            {'name': tag, 'email': f'{tag}-1@example.com', 'password': 'secret1'},
+            {'name': tag, 'email': f'{tag}-2@example.com', 'password': 'secret1', 'role': 'admin'},
+            {'id': 1, 'name': tag, 'email': f'{tag}-3@example.com', 'password': 'secret1'},
+        ])
+
+        report = run_import(User, body, 'ndjson')
+
+        assert report['inserted'] == 1
+        assert report['errors'] == [
+            {'line': 2, 'errors': ['Colonne inconnue: role']},
+            {'line': 3, 'errors': ['Colonne inconnue: id']},
+        ]
+
+    def test_prehashed(self, User, tag):
+        """Migration: mots de passe repris tels quels, sans regle de longueur"""
+        hashed = generate_password_hash('old', method='pbkdf2:sha256:1000')
+        body = json.dumps({'name': tag, 'email': f'{tag}@example.com', 'password': hashed}).encode()
+
+        assert run_import(User, body, 'ndjson', prehashed=True)['inserted'] == 1
+        assert User.first(email=f'{tag}@example.com').password == hashed
+
+    def test_failed_batch_falls_back_to_rows(self, User, tag, monkeypatch):
+        """Lot refuse par la base: insertion ligne par ligne, seules les lignes fautives rejetees"""
+        monkeypatch.setattr(BulkImporter, '_reject_duplicates', lambda self, batch, report: batch)
+        User(name=tag, email=f'{tag}-0@example.com', password='x').save()
+        body = csv_body(tag, [(f'{tag}-{i}@example.com', 'secret1', 20) for i in range(3)])
+
+        report = run_import(User, body, 'csv', batch_size=3)
+
+        assert (report['inserted'], report['rejected']) == (2, 1)
+        assert report['errors'][0]['line'] == 2
+
+    def test_errors_truncated(self, User, tag):
+        body = b'\n'.join([b'oops'] * 5)
+        report = run_import(User, body, 'ndjson', max_errors=2)
+
+        assert report['rejected'] == 5
+        assert len(report['errors']) == 2 and report['errors_truncated']
+
+
+class TestImportRoutes:
+    """Tests de POST /api/users/import"""
+
+    @pytest.fixture
+    def headers(self, User, tag, monkeypatch):
+        user = User(name=tag, email=f'{tag}-admin@example.com', password='x').save()
+        monkeypatch.setattr(AppConfig, 'IMPORT_ADMINS', [user.email])
+        return {'Authorization': f'Bearer {JWTManager.generate_token(user.id)}'}
+
+    def test_admins_only(self, client, User, tag, headers, monkeypatch):
+        """Un utilisateur authentifie hors IMPORT_ADMINS ne cree pas de comptes"""
+        monkeypatch.setattr(AppConfig, 'IMPORT_ADMINS', [])
+        body = csv_body(tag, [(f'{tag}-0@example.com', 'secret1', 30)])
+        response = client.post('/api/users/import', data=body, headers={**headers, 'Content-Type': 'text/csv'})
+
+        assert response.status_code == 403
+        assert User.count(name=tag) == 1
+
+    def test_gzip_csv_upload(self, client, User, tag, headers):
+        body = gzip.compress(csv_body(tag, [(f'{tag}-{i}@example.com', 'secret1', 30) for i in range(5)]))
+        response = client.post('/api/users/import', data=body, headers={
+            **headers, 'Content-Type': 'text/csv', 'Content-Encoding': 'gzip'
+        })
+
+        assert response.status_code == 200
+        assert response.get_json()['data']['import']['inserted'] == 5
+        assert User.count(name=tag) == 6
+
+    def test_unknown_format(self, client, headers):
+        response = client.post('/api/users/import', data=b'{}', headers={**headers, 'Content-Type': 'application/json'})
+        assert response.status_code == 400
+
+    def test_too_large(self, client, headers, monkeypatch):
+        monkeypatch.setattr(AppConfig, 'IMPORT_MAX_CONTENT_LENGTH', 10)
+        response = client.post('/api/users/import?format=ndjson', data=b'{}\n' * 10, headers=headers)
+        assert response.status_code == 413
+
+    def test_asgi_import(self, User, tag, headers):
+        """Meme import en mode ASGI, corps lu en flux depuis le thread d'import"""
+        pytest.importorskip('quart')
+        from bmb.asgi import create_asgi_app
+        from bmb.models_loader import ModelsLoader
+
+        body = b'\n'.join(
+            json.dumps({'name': tag, 'email': f'{tag}-{i}@example.com', 'password': 'secret1'}).encode()
+            for i in range(3)
+        )
+
+        async def run():
+            try:
+                response = await create_asgi_app().test_client().post(
+                    '/api/users/import', data=body,
+                    headers={**headers, 'Content-Type': 'application/x-ndjson'}
+                )
+                return response.status_code, await response.get_json()
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        status, data = asyncio.run(run())
+
+        assert status == 200
+        assert data['data']['import']['inserted'] == 3
+
+
+class TestImportCommand:
+    """Tests de bmb import"""
+
+    def test_cli_import(self, User, tag, tmp_path):
+        path = tmp_path / 'users.csv.gz'
+        path.write_bytes(gzip.compress(csv_body(tag, [
+            (f'{tag}-1@example.com', 'secret1', 40),
+            ('invalide', 'secret1', 41),
+        ])))
+        report = tmp_path / 'report.json'
+
+        assert BMBCLI().import_file('User', path, report_path=report)
+
+        assert User.count(name=tag) == 1
+        assert json.loads(report.read_text())['errors'][0]['line'] == 3
+
+    def test_cli_unknown_format(self, tmp_path):
+        path = tmp_path / 'users.xlsx'
+        path.write_bytes(b'')
+        assert not BMBCLI().import_file('User', path)
@@ -0,0 +1,121 @@
+"""
+Tests pour les fournisseurs JSON des reponses API
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+from collections import namedtuple
+
+import pytest
+from flask import Flask, jsonify
+from flask.json.provider import JSONProvider
+
+from bmb.utils.json_provider import JSON_PROVIDERS, install_json_provider
+
+Row = namedtuple('Row', ['id', 'name'])
+
+
+class Model:
+    def to_dict(self):
+        return {'id': 1}
+
+
+PAYLOAD = {
+    'at': datetime.datetime(2024, 1, 31, 12, 30),
+    'day': datetime.date(2024, 1, 31),
+    'ref': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'amount': decimal.Decimal('9.90'),
+    'model': Model(),
+    'row': Row(1, 'é'),
+}
+
+EXPECTED = {
+    'at': '2024-01-31T12:30:00',
+    'day': '2024-01-31',
+    'ref': '12345678-1234-5678-1234-567812345678',
+    'amount': '9.90',
+    'model': {'id': 1},
+    'row': [1, 'é'],
+}
+
+
+def provider(name):
+    if name != 'stdlib':
+        pytest.importorskip(name)
+    app = Flask(__name__)
+    return app, install_json_provider(app, name)
+
+
+@pytest.mark.parametrize('name', list(JSON_PROVIDERS))
+class TestProviders:
+    """Meme sortie quel que soit l'encodeur"""
+
+    def test_encodes_extended_types(self, name):
+        """datetime, UUID, Decimal, modeles et records"""
+        _, json_provider = provider(name)
+        assert json.loads(json_provider.dumps(PAYLOAD)) == EXPECTED
+
+    def test_jsonify_uses_provider(self, name):
+        """jsonify passe par app.json"""
+        app, _ = provider(name)
+        with app.app_context():
+            response = jsonify({'data': PAYLOAD})
+
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == {'data': EXPECTED}
+
+    def test_is_flask_provider(self, name):
+        """Sous-classe de JSONProvider (Flask et Quart)"""
+        _, json_provider = provider(name)
+        assert isinstance(json_provider, JSONProvider)
+
+    def test_dumps_honors_indent_and_sort_keys(self, name):
+        """indent et sort_keys ne sont pas ignores"""
+        _, json_provider = provider(name)
+        text = json_provider.dumps({'b': 1, 'a': [1]}, indent=2, sort_keys=True)
+        assert text == json.dumps({'a': [1], 'b': 1}, indent=2)
+
+    def test_dumps_falls_back_for_other_options(self, name):
+        """Options inconnues de l'encodeur: json stdlib"""
+        _, json_provider = provider(name)
+        assert json_provider.dumps({'a': 1}, separators=(',', ' = ')) == '{"a" = 1}'
+
+    def test_pretty_sorted_response(self, name):
+        """compact=False et sort_keys comme DefaultJSONProvider"""
+        app, json_provider = provider(name)
+        json_provider.compact = False
+        json_provider.sort_keys = True
+        with app.app_context():
+            response = jsonify({'b': 1, 'a': 2})
+        assert response.get_data(as_text=True) == json.dumps({'a': 2, 'b': 1}, indent=2)
+
+
+class TestInstall:
+    """Tests du choix de l'encodeur"""
+
+    def test_auto_prefers_installed_library(self):
+        """auto choisit la bibliotheque la plus rapide disponible"""
+        app = Flask(__name__)
+        try:
+            import orjson  # noqa: F401
+            expected = 'orjson'
+        except ImportError:
+            expected = 'stdlib'
+            try:
+                import ujson  # noqa: F401
+                expected = 'ujson'
+            except ImportError:
+                pass
+        assert install_json_provider(app).name == expected
+
+    def test_unknown_provider_rejected(self):
+        """Un nom inconnu est une erreur de configuration"""
+        with pytest.raises(ValueError):
+            install_json_provider(Flask(__name__), 'simplejson')
+
+    def test_app_responses_are_json(self, client):
+        """Les routes de l'application repondent via l'encodeur installe"""
+        response = client.get('/api/health')
+        assert response.get_json()['data']['status'] in ('healthy', 'unhealthy')
@@ -0,0 +1,173 @@
+"""
+Tests pour les lectures economes (exists / count borne)
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from bmb.models_loader import ModelsLoader, load_models
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def users(User):
+    tag = uuid.uuid4().hex
+    users = [User(name=tag, email=f'{tag}-{i}@example.com', password='x').save() for i in range(5)]
+    yield users
+    for user in users:
+        user.delete()
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = ModelsLoader.get_engine()
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+class TestExists:
+    """Tests de Model.exists"""
+
+    def test_exists(self, User, users):
+        """Vrai si au moins une ligne correspond"""
+        assert User.exists(email=users[0].email)
+        assert not User.exists(email='nobody@example.com')
+
+    def test_exists_does_not_select_columns(self, User, users, statements):
+        """Une seule requete EXISTS, sans lire le mot de passe"""
+        User.exists(email=users[0].email)
+
+        assert len(statements) == 1
+        assert 'EXISTS' in statements[0]
+        assert 'password' not in statements[0]
+
+
+class TestCount:
+    """Tests de Model.count"""
+
+    def test_count_unbounded(self, User, users):
+        """Sans limite: comportement de ModelMixin.count"""
+        assert User.count(name=users[0].name) == 5
+
+    def test_count_with_limit(self, User, users):
+        """La limite borne le comptage"""
+        assert User.count(limit=3, name=users[0].name) == 3
+        assert User.count(limit=10, name=users[0].name) == 5
+
+    def test_async_equivalents(self, User, users):
+        """aexists et acount(limit=) sont les equivalents asyncio"""
+        async def run():
+            try:
+                return (
+                    await User.aexists(email=users[0].email),
+                    await User.acount(limit=2, name=users[0].name)
+                )
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        assert asyncio.run(run()) == (True, 2)
+
+
+class TestProjection:
+    """Tests de only= / defer= et des colonnes differees"""
+
+    def test_only_loads_listed_columns(self, User, users, statements):
+        """Seules les colonnes demandees sont lues et serialisees"""
+        rows = User.filter(name=users[0].name, only=['name'])
+
+        assert len(rows) == 5
+        assert 'password' not in statements[0]
+        assert set(rows[0].to_dict()) == {'id', 'name'}
+
+    def test_defer_skips_columns(self, User, users):
+        """Les colonnes differees sont absentes de to_dict"""
+        user = User.first(email=users[0].email, defer=['password'])
+
+        assert user.email == users[0].email
+        assert 'password' not in user.to_dict()
+
+    def test_default_deferred_columns(self, User, users):
+        """defer_columns s'applique par defaut, defer=[] charge tout"""
+        User.defer_columns('password')
+        try:
+            assert 'password' not in User.first(email=users[0].email).to_dict()
+            assert User.first(email=users[0].email, defer=[]).password == 'x'
+        finally:
+            User._deferred_columns = ()
+
+    def test_unknown_column_rejected(self, User):
+        """Une colonne inconnue est une erreur"""
+        with pytest.raises(ValueError):
+            User.filter(only=['nickname'])
+
+    def test_async_projection(self, User, users):
+        """afilter accepte only= / defer="""
+        async def run():
+            try:
+                return await User.afilter(name=users[0].name, only=['email'])
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        rows = asyncio.run(run())
+        assert set(rows[0].to_dict()) == {'id', 'email'}
+
+
+class TestRows:
+    """Tests de Model.rows (lignes brutes)"""
+
+    def test_rows_as_dicts(self, User, users):
+        """Dictionnaires tries par id, sans colonnes differees"""
+        rows = User.rows(name=users[0].name, defer=['password'])
+
+        assert [row['id'] for row in rows] == [user.id for user in users]
+        assert 'password' not in rows[0]
+        assert rows[0]['email'] == users[0].email
+
+    def test_serializer_excluded_columns_never_read(self, User, users, statements):
+        """Sans defer explicite, les champs exclus de to_dict ne sont pas lus non plus"""
+        rows = User.rows(name=users[0].name, limit=1)
+        streamed = list(User.stream(name=users[0].name, defer=[]))
+
+        assert set(rows[0]) == set(users[0].to_dict())
+        assert 'password' not in rows[0] and 'password' not in streamed[0]
+        assert 'password' not in statements[0]
+
+    def test_sql_pagination(self, User, users, statements):
+        """limit/offset sont appliques par la base"""
+        rows = User.rows(name=users[0].name, columns=['id'], limit=2, offset=2, desc=True)
+
+        assert [row['id'] for row in rows] == [users[2].id, users[1].id]
+        assert 'LIMIT' in statements[0] and 'OFFSET' in statements[0]
+
+    def test_tuples_and_records(self, User, users):
+        """Formes tuple et record (namedtuple par modele)"""
+        name = users[0].name
+        assert User.rows(name=name, columns=['id', 'email'], result='tuple')[0] == (users[0].id, users[0].email)
+
+        record = User.rows(name=name, columns=['id', 'email'], result='record')[0]
+        assert record.email == users[0].email
+        assert record.to_dict() == {'id': users[0].id, 'email': users[0].email}
+        assert not hasattr(record, '__dict__')
+
+    def test_async_rows(self, User, users):
+        """arows est l'equivalent asyncio"""
+        async def run():
+            try:
+                return await User.arows(name=users[0].name, columns=['id'], limit=1)
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        assert asyncio.run(run()) == [{'id': users[0].id}]
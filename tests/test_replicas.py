@@ -0,0 +1,180 @@
+"""
+Tests pour le routage des lectures vers les replicas
+"""
+
+import shutil
+import time
+import types
+
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from bmb.middleware import setup_read_your_writes
+from bmb.middleware.consistency import sign_primary_until
+from bmb.models_loader import ModelsLoader
+from bmb.orm import ReplicaSet, RoutingSession, ReadYourWrites
+
+
+@pytest.fixture
+def databases(app, tmp_path):
+    """Primaire + deux replicas SQLite (copies de fichier)"""
+    User = ModelsLoader.get_model('User')
+
+    primary_path = tmp_path / 'primary.db'
+    primary = create_engine(f'sqlite:///{primary_path}')
+    User.metadata.create_all(primary)
+
+    replicas = []
+    for name in ('replica1.db', 'replica2.db'):
+        shutil.copy(primary_path, tmp_path / name)
+        engine = create_engine(f'sqlite:///{tmp_path / name}')
+        # Ligne presente uniquement sur les replicas pour les reconnaitre
+        with engine.begin() as conn:
+            conn.execute(User.__table__.insert().values(name='Replica', email='replica@example.com'))
+        replicas.append(engine)
+
+    yield User, primary, replicas
+
+    for engine in [primary, *replicas]:
+        engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def fresh_context():
+    """Chaque test demarre sans fenetre lecture-apres-ecriture"""
+    ReadYourWrites.begin()
+    yield
+    ReadYourWrites.begin()
+
+
+def make_session(primary, replica_set):
+    return sessionmaker(bind=primary, class_=RoutingSession, replica_set=replica_set)
+
+
+class TestReplicaRouting:
+    """Tests de RoutingSession"""
+
+    def test_reads_go_to_replica(self, databases):
+        """Les SELECT sont servis par un replica"""
+        User, primary, replicas = databases
+        Session = make_session(primary, ReplicaSet(replicas))
+
+        with Session() as session:
+            assert session.query(User).filter_by(email='replica@example.com').first() is not None
+
+    def test_writes_go_to_primary_and_stick(self, databases):
+        """Les ecritures vont au primaire, les lectures suivantes aussi"""
+        User, primary, replicas = databases
+        Session = make_session(primary, ReplicaSet(replicas))
+
+        with Session() as session:
+            session.add(User(name='Writer', email='writer@example.com'))
+            session.commit()
+            # Meme session apres ecriture: primaire
+            assert session.query(User).filter_by(email='writer@example.com').count() == 1
+            assert session.query(User).filter_by(email='replica@example.com').count() == 0
+
+        # Nouvelle session dans la fenetre: toujours le primaire
+        with Session() as session:
+            assert session.query(User).filter_by(email='writer@example.com').first() is not None
+
+        # Nouveau contexte sans fenetre: retour sur les replicas (ligne non repliquee)
+        ReadYourWrites.begin()
+        with Session() as session:
+            assert session.query(User).filter_by(email='writer@example.com').first() is None
+
+    def test_weighted_strategy(self, databases):
+        """Un replica de poids nul n'est jamais choisi"""
+        _, _, replicas = databases
+        replica_set = ReplicaSet(replicas, weights=[1, 0])
+
+        assert all(replica_set.choose() is replicas[0] for _ in range(20))
+
+    def test_least_connections_strategy(self, databases):
+        """Le replica le moins charge est choisi"""
+        _, _, replicas = databases
+        replica_set = ReplicaSet(replicas, strategy='least_connections')
+
+        with replicas[0].connect():
+            assert replica_set.choose() is replicas[1]
+            assert replica_set.stats()[0]['in_use'] == 1
+
+    def test_invalid_strategy(self, databases):
+        """Une strategie inconnue est refusee"""
+        _, _, replicas = databases
+        with pytest.raises(ValueError):
+            ReplicaSet(replicas, strategy='round_robin')
+
+    def test_install_replicas_replaces_session_local(self, databases, tmp_path):
+        """ModelsLoader remplace SessionLocal du module genere"""
+        User, primary, _ = databases
+        models_module = types.SimpleNamespace(engine=primary, SessionLocal=None)
+        previous = ModelsLoader._replica_set
+
+        try:
+            session_local = ModelsLoader.install_replicas(
+                models_module, urls=[f"sqlite:///{tmp_path / 'replica1.db'}"]
+            )
+            assert models_module.SessionLocal is session_local
+            with session_local() as session:
+                assert session.query(User).filter_by(email='replica@example.com').count() == 1
+        finally:
+            ModelsLoader._replica_set.dispose()
+            ModelsLoader._replica_set = previous
+
+
+class TestReadYourWritesMiddleware:
+    """Tests de la fenetre lecture-apres-ecriture entre requetes"""
+
+    @pytest.fixture
+    def flask_app(self):
+        app = Flask(__name__)
+        setup_read_your_writes(app)
+
+        @app.route('/write', methods=['POST'])
+        def write():
+            ReadYourWrites.mark_write()
+            return jsonify(ok=True)
+
+        @app.route('/read')
+        def read():
+            return jsonify(sticky=ReadYourWrites.sticky())
+
+        return app
+
+    def test_cookie_after_write(self, flask_app):
+        """Une ecriture transmet l'echeance, la requete suivante lit sur le primaire"""
+        client = flask_app.test_client()
+
+        assert client.get('/read').get_json()['sticky'] is False
+
+        response = client.post('/write')
+        assert 'X-BMB-Primary-Until' in response.headers
+        assert 'bmb_primary_until' in response.headers['Set-Cookie']
+
+        assert client.get('/read').get_json()['sticky'] is True
+
+    @pytest.mark.parametrize('offset', [3600, 1e12, float('inf')])
+    def test_client_cannot_pin_primary(self, flask_app, offset):
+        """Une echeance au-dela de la fenetre est ignoree, meme signee"""
+        until = sign_primary_until(time.time() + offset)
+        response = flask_app.test_client().get('/read', headers={'X-BMB-Primary-Until': until})
+        assert response.get_json()['sticky'] is False
+
+    def test_client_deadline_within_window(self, flask_app):
+        until = sign_primary_until(time.time() + 2)
+        response = flask_app.test_client().get('/read', headers={'X-BMB-Primary-Until': until})
+        assert response.get_json()['sticky'] is True
+
+    def test_unsigned_or_forged_deadline_ignored(self, flask_app):
+        """Une echeance non signee ou forgee ne fixe pas le client au primaire"""
+        client = flask_app.test_client()
+        value = f"{time.time() + 2:.3f}"
+        forged = f"{value}:{'0' * 64}"
+        tampered = sign_primary_until(time.time() + 2).replace(value[:3], '999', 1)
+
+        for until in (value, forged, tampered, 'x:y'):
+            response = client.get('/read', headers={'X-BMB-Primary-Until': until})
+            assert response.get_json()['sticky'] is False
@@ -0,0 +1,234 @@
+"""
+Tests pour le cache des reponses (@cached_response)
+"""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import uuid
+
+import pytest
+from flask import Flask, request
+from sqlalchemy import update
+
+from bmb.models_loader import ModelsLoader, load_models
+from bmb.orm import TableVersions
+from bmb.utils import JWTManager, cached_response, success_response
+from bmb.utils import response_cache
+from bmb.utils.response_cache import ResponseCache
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def user(User):
+    tag = uuid.uuid4().hex
+    user = User(name=tag, email=f'{tag}@example.com', password='secret', age=30).save()
+    yield user
+    user.delete()
+
+
+@pytest.fixture
+def headers(user):
+    return {'Authorization': f'Bearer {JWTManager.generate_token(user.id)}'}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResponseCache()
+    monkeypatch.setattr(response_cache, '_cache', cache)
+    return cache
+
+
+class TestResponseCache:
+    """Tests de l'invalidation par versions et de la perimation"""
+
+    def test_versions_invalidate(self, cache):
+        tables = ('cache_test_table',)
+        cache.store('k', b'body', 200, [], TableVersions.get(tables), 60, 60)
+        assert cache.lookup('k', tables)[1] == 'fresh'
+
+        TableVersions.bump(tables)
+        assert cache.lookup('k', tables) == (None, 'miss')
+        assert cache.stats()['invalidations'] == 1
+
+    def test_stale_and_single_refresh(self, cache):
+        cache.store('k', b'body', 200, [], (), ttl=0, stale_ttl=60)
+        assert cache.lookup('k', ())[1] == 'stale'
+
+        assert cache.claim('k') is None
+        event = cache.claim('k')
+        assert event is not None and not event.is_set()
+        cache.release('k')
+        assert event.is_set()
+
+    def test_versions_shared_between_workers(self, cache, tmp_path, monkeypatch):
+        """Un commit d'un autre processus invalide l'entree de ce worker"""
+        monkeypatch.setattr(TableVersions, '_shared_dir', None)
+        TableVersions.share(tmp_path)
+        tables = ('cache_shared_table',)
+        cache.store('k', b'body', 200, [], TableVersions.get(tables), 60, 60)
+
+        subprocess.run([
+            sys.executable, '-c',
+            f"from bmb.orm import TableVersions; TableVersions.share({str(tmp_path)!r}); "
+            f"TableVersions.bump({tables!r})"
+        ], check=True)
+
+        assert TableVersions.get(tables) == (1,)
+        assert cache.lookup('k', tables) == (None, 'miss')
+
+    def test_lru_and_max_body(self):
+        cache = ResponseCache(max_entries=1, max_body=3)
+        assert cache.store('big', b'abcd', 200, [], (), 60, 60) is None
+        cache.store('a', b'a', 200, [], (), 60, 60)
+        cache.store('b', b'b', 200, [], (), 60, 60)
+        assert cache.lookup('a', ())[1] == 'miss'
+        assert cache.lookup('b', ())[1] == 'fresh'
+
+
+class TestCommitTracking:
+    """Tests des versions publiees au commit"""
+
+    def test_commit_bumps_rollback_discards(self, User, user):
+        table = User.__table__.name
+        before = TableVersions.get((table,))
+
+        User.update(user.id, age=31)
+        after = TableVersions.get((table,))
+        assert after[0] > before[0]
+
+        session = ModelsLoader.get_session()()
+        try:
+            session.execute(update(User).where(User.id == user.id).values(age=32))
+            session.rollback()
+        finally:
+            session.close()
+        assert TableVersions.get((table,)) == after
+
+
+class TestCachedRoutes:
+    """Tests des routes en cache"""
+
+    def test_stats_hit_and_invalidation(self, client, User, user, headers, cache):
+        first = client.get('/api/users/stats', headers=headers)
+        second = client.get('/api/users/stats', headers=headers)
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.get_json() == first.get_json()
+
+        tag = uuid.uuid4().hex
+        other = User(name=tag, email=f'{tag}@example.com', password='x', age=40).save()
+        try:
+            third = client.get('/api/users/stats', headers=headers)
+            assert third.headers['X-Cache'] == 'MISS'
+            total = third.get_json()['data']['stats']['total_users']
+            assert total == first.get_json()['data']['stats']['total_users'] + 1
+        finally:
+            other.delete()
+
+    def test_varies_on_args(self, client, user, headers, cache):
+        client.get(f'/api/users?name={user.name}', headers=headers)
+        response = client.get(f'/api/users?name={user.name}&page_size=5', headers=headers)
+        assert response.headers['X-Cache'] == 'MISS'
+
+    def test_streams_bypass_cache(self, client, user, headers, cache):
+        response = client.get(f'/api/users?name={user.name}&stream=ndjson', headers=headers)
+        assert 'X-Cache' not in response.headers
+        assert cache.stats()['entries'] == 0
+
+    def test_asgi_hit(self, app, headers, cache):
+        """Meme cache en mode ASGI"""
+        pytest.importorskip('quart')
+        from bmb.asgi import create_asgi_app
+
+        async def run():
+            try:
+                client = create_asgi_app().test_client()
+                first = await client.get('/api/users/stats', headers=headers)
+                second = await client.get('/api/users/stats', headers=headers)
+                return first.headers['X-Cache'], second.headers['X-Cache']
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        assert asyncio.run(run()) == ('MISS', 'HIT')
+
+
+class TestCachedResponseDecorator:
+    """Tests du decorateur sur une application minimale"""
+
+    def make_app(self, User, view, **options):
+        app = Flask(__name__)
+        app.add_url_rule('/view', 'view', cached_response(depends_on=[User], **options)(view))
+        return app
+
+    def test_commit_during_compute_is_not_served(self, User, cache):
+        calls = []
+
+        def view():
+            calls.append(1)
+            TableVersions.bump((User.__table__.name,))  # commit concurrent
+            return success_response(data={'calls': len(calls)})
+
+        client = self.make_app(User, view).test_client()
+        client.get('/view')
+        response = client.get('/view')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert len(calls) == 2
+
+    def test_stale_while_revalidate(self, User, cache):
+        """Une seule requete recalcule; les autres recoivent la version perimee"""
+        computing, proceed = threading.Event(), threading.Event()
+        calls = []
+
+        def view():
+            calls.append(1)
+            if len(calls) > 1:
+                computing.set()
+                proceed.wait(5)
+            return success_response(data={'calls': len(calls)})
+
+        app = self.make_app(User, view, ttl=0, stale_ttl=60)
+        assert app.test_client().get('/view').headers['X-Cache'] == 'MISS'
+
+        refresh = threading.Thread(target=lambda: app.test_client().get('/view'))
+        refresh.start()
+        assert computing.wait(5)
+
+        stale = [app.test_client().get('/view') for _ in range(3)]
+        proceed.set()
+        refresh.join(5)
+
+        assert [response.headers['X-Cache'] for response in stale] == ['STALE'] * 3
+        assert all(response.get_json()['data']['calls'] == 1 for response in stale)
+        assert len(calls) == 2
+        assert cache.stats()['stale_hits'] == 3
+
+    def test_varies_on_user(self, User, cache):
+        """Par defaut, une entree par utilisateur authentifie"""
+        def view(current_user):
+            return success_response(data={'user': current_user.id})
+
+        app = Flask(__name__)
+        users = {'1': type('U', (), {'id': 1})(), '2': type('U', (), {'id': 2})()}
+        by_default = cached_response(depends_on=[User])(view)
+        user_only = cached_response(vary_on=('user',), depends_on=[User])(view)
+        app.add_url_rule('/view', 'view', lambda: by_default(users[request.args['uid']]))
+        app.add_url_rule('/other', 'other', lambda: user_only(users[request.args['uid']]))
+        client = app.test_client()
+
+        client.get('/view?uid=1')
+        assert client.get('/view?uid=1').headers['X-Cache'] == 'HIT'
+        response = client.get('/view?uid=2')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['data']['user'] == 2
+
+        # Meme chemin, parametres ignores (vary_on sans 'args'): seule l'identite varie
+        client.get('/other?uid=1&a=1')
+        assert client.get('/other?uid=1&a=2').headers['X-Cache'] == 'HIT'
+        assert client.get('/other?uid=2').headers['X-Cache'] == 'MISS'
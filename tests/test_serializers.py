@@ -0,0 +1,87 @@
+"""
+Tests pour les serialiseurs compiles (to_dict / to_dicts)
+"""
+
+import datetime
+import decimal
+
+from sqlalchemy import Column, Date, DateTime, Integer, Numeric, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base, load_only
+
+from bmb.orm import Serializer, SerializerMixin, install_serializers
+from bmb.models_loader import load_models
+
+Base = declarative_base()
+
+
+class Invoice(Base, SerializerMixin):
+    __tablename__ = 'invoices'
+    id = Column(Integer, primary_key=True)
+    label = Column(String)
+    secret = Column(String)
+    amount = Column(Numeric(10, 2))
+    issued_on = Column(Date)
+    created_at = Column(DateTime)
+
+
+install_serializers([Invoice], exclude=['secret', 'password'])
+
+
+def invoice(**values):
+    invoice = Invoice(
+        id=1,
+        label='A',
+        secret='s',
+        amount=decimal.Decimal('9.90'),
+        issued_on=datetime.date(2024, 1, 31),
+        created_at=datetime.datetime(2024, 1, 31, 12, 30)
+    )
+    for name, value in values.items():
+        setattr(invoice, name, value)
+    return invoice
+
+
+class TestSerializer:
+    """Tests du serialiseur compile"""
+
+    def test_excluded_fields_and_encoders(self):
+        """Champs sensibles omis, dates en ISO 8601, Decimal en chaine"""
+        assert invoice().to_dict() == {
+            'id': 1,
+            'label': 'A',
+            'amount': '9.90',
+            'issued_on': '2024-01-31',
+            'created_at': '2024-01-31T12:30:00'
+        }
+
+    def test_include_and_explicit_exclude(self):
+        """include restreint les champs, exclude=() reintegre les champs sensibles"""
+        assert invoice().to_dict(include=['id', 'label']) == {'id': 1, 'label': 'A'}
+        assert invoice().to_dict(include=['id', 'secret'], exclude=()) == {'id': 1, 'secret': 's'}
+
+    def test_none_values_not_encoded(self):
+        """Les valeurs NULL restent None"""
+        assert invoice(created_at=None).to_dict()['created_at'] is None
+
+    def test_to_dicts_batch(self):
+        """to_dicts serialise une liste avec un seul serialiseur"""
+        items = [invoice(id=i) for i in range(3)]
+        assert [item['id'] for item in Invoice.to_dicts(items)] == [0, 1, 2]
+
+    def test_unloaded_columns_omitted(self):
+        """Les colonnes non chargees (only=/defer=) sont omises"""
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(invoice(id=7, label='B'))
+            session.commit()
+        with Session(engine) as session:
+            partial = session.scalars(select(Invoice).options(load_only(Invoice.label))).one()
+        engine.dispose()
+
+        assert Serializer(Invoice).serialize(partial) == {'id': 7, 'label': 'B'}
+
+    def test_models_never_emit_password(self, app):
+        """Les modeles BMDB charges n'exposent pas le hash du mot de passe"""
+        User = load_models()['User']
+        assert 'password' not in User(id=1, email='a@b.c', password='hash').to_dict()
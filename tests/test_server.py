@@ -0,0 +1,58 @@
+"""
+Tests pour le serveur de production
+"""
+
+import sys
+
+import bmb
+from bmb.models_loader import ModelsLoader
+from bmb.server import build_options, default_workers, resolve_app_factory, _post_fork
+
+
+class TestServer:
+    """Tests de la configuration du serveur"""
+    
+    def test_auto_sized_workers(self):
+        """Workers et threads sont dimensionnes automatiquement"""
+        options = build_options(host='127.0.0.1', port=8000)
+        
+        assert options['bind'] == '127.0.0.1:8000'
+        assert options['workers'] == default_workers()
+        assert options['threads'] > 1
+        assert options['worker_class'] == 'gthread'
+    
+    def test_explicit_options(self):
+        """Les arguments explicites sont prioritaires"""
+        options = build_options(workers=2, threads=1, preload=False, max_requests=0)
+        
+        assert options['workers'] == 2
+        assert options['worker_class'] == 'sync'
+        assert options['preload_app'] is False
+        assert options['max_requests_jitter'] == 0
+    
+    def test_post_fork_disposes_engine(self, app):
+        """Apres le fork, le pool herite est abandonne"""
+        engine = ModelsLoader.get_engine()
+        with engine.connect():
+            pass
+        pool = engine.pool
+        
+        _post_fork(server=None, worker=None)
+        
+        assert engine.pool is not pool
+
+    def test_legacy_app_module_falls_back_to_package(self, tmp_path, monkeypatch):
+        """Un app.py sans create_app (module historique) n'est ni choisi ni importe"""
+        (tmp_path / 'app.py').write_text("raise RuntimeError('ne pas importer')\napp = None\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, 'path', list(sys.path))
+
+        assert resolve_app_factory() is bmb.create_app
+
+    def test_project_factory_is_used(self, tmp_path, monkeypatch):
+        (tmp_path / 'app.py').write_text("def create_app():\n    return 'projet'\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, 'path', list(sys.path))
+        monkeypatch.delitem(sys.modules, 'app', raising=False)
+
+        assert resolve_app_factory()() == 'projet'
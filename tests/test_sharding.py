@@ -0,0 +1,248 @@
+"""
+Tests pour le sharding horizontal des modeles
+"""
+
+import asyncio
+import types
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, inspect
+from sqlalchemy.orm import declarative_base, relationship
+
+from bmb.orm import ShardMap, Deadline, install_model_extensions, install_serializers
+from bmb.orm.sharding import merge_ordered
+
+Base = declarative_base()
+
+
+class Account(Base):
+    __tablename__ = 'accounts'
+    id = Column(Integer, primary_key=True)
+    email = Column(String, unique=True)
+    age = Column(Integer)
+
+
+class Member(Base):
+    __tablename__ = 'members'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class Login(Base):
+    __tablename__ = 'logins'
+    id = Column(Integer, primary_key=True)
+    email = Column(String, unique=True)
+
+
+class Team(Base):
+    __tablename__ = 'teams'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    players = relationship('Player', back_populates='team')
+
+
+class Player(Base):
+    __tablename__ = 'players'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    team_id = Column(Integer, ForeignKey('teams.id'))
+    team = relationship('Team', back_populates='players')
+
+
+install_model_extensions([Account, Login, Team, Player])
+install_serializers([Team, Player])
+
+
+@pytest.fixture
+def shards(tmp_path):
+    """Trois shards SQLite"""
+    engines = [create_engine(f'sqlite:///{tmp_path / f"shard{i}.db"}') for i in range(3)]
+    shard_map = ShardMap(engines, keys={'Account': 'email'})
+    shard_map.create_all(Base.metadata)
+    shard_map.install([Account, Member, Login, Team, Player])
+
+    yield shard_map
+
+    shard_map.dispose()
+
+
+def rows_per_shard(shard_map, model):
+    return [shard_map.run(i, lambda s: s.query(model).count()) for i in range(len(shard_map))]
+
+
+class TestSharding:
+    """Tests du routage et du fan-out"""
+
+    def test_ids_encode_owning_shard(self, shards):
+        """Les ids alloues designent le shard proprietaire"""
+        members = [Member(name=f'm{i}').save() for i in range(6)]
+
+        assert len({m.id for m in members}) == 6
+        assert rows_per_shard(shards, Member) == [2, 2, 2]
+        for member in members:
+            assert Member.get(member.id).name == member.name
+
+    def test_shard_key_places_rows(self, shards):
+        """La cle de sharding (email) choisit le shard"""
+        account = Account(email='alice@example.com', age=30).save()
+
+        expected = shards.shard_for_value('alice@example.com')
+        assert shards.shard_for_id(account.id) == expected
+        assert Account.first(email='alice@example.com').id == account.id
+
+    def test_shard_key_is_immutable(self, shards):
+        """Modifier la cle vers un autre shard est refuse"""
+        account = Account(email='bob@example.com', age=20).save()
+        other = next(
+            f'user{i}@example.com' for i in range(100)
+            if shards.shard_for_value(f'user{i}@example.com') != shards.shard_for_id(account.id)
+        )
+        account.email = other
+
+        with pytest.raises(ValueError):
+            account.save()
+
+    def test_fan_out_filter_count_all(self, shards):
+        """filter/count/all interrogent tous les shards et fusionnent par id"""
+        for i in range(10):
+            Account(email=f'a{i}@example.com', age=20 + i % 2).save()
+
+        assert Account.count() == 10
+        assert Account.count(age=21) == 5
+        assert len(Account.filter(age=20)) == 5
+
+        ids = [a.id for a in Account.all()]
+        assert ids == sorted(ids)
+        assert Account.first().id == min(ids)
+
+    def test_ordered_paginate(self, shards):
+        """Pagination triee fusionnee sur tous les shards"""
+        for i in range(9):
+            Account(email=f'p{i}@example.com', age=i).save()
+
+        page, total = Account.paginate(page=2, page_size=4, order_by='age', desc=True)
+
+        assert total == 9
+        assert [a.age for a in page] == [4, 3, 2, 1]
+
+    def test_delete(self, shards):
+        """delete supprime sur le shard proprietaire"""
+        member = Member(name='gone').save()
+        member.delete()
+
+        assert Member.get(member.id) is None
+        assert Member.count() == 0
+
+    def test_fan_out_keeps_request_deadline(self, shards):
+        """Le contexte (echeance) est propage aux threads du fan-out"""
+        Deadline.set(5)
+        try:
+            remaining = shards.fan_out(lambda session: Deadline.remaining())
+        finally:
+            Deadline.clear()
+
+        assert all(r is not None and 0 < r <= 5 for r in remaining)
+
+    def test_exists_and_capped_count(self, shards):
+        """exists et count(limit=) sur l'ensemble des shards"""
+        for i in range(6):
+            Member(name='same').save()
+
+        assert Member.exists(name='same')
+        assert not Member.exists(name='other')
+        assert Member.count(name='same') == 6
+        assert Member.count(limit=4, name='same') == 4
+
+    def test_projection_across_shards(self, shards):
+        """only= est applique sur chaque shard"""
+        Account(email='projected@example.com', age=40).save()
+
+        account = Account.first(email='projected@example.com', only=['email'])
+        assert 'age' not in inspect(account).dict
+        assert [a.email for a in Account.all(only=['email'])] == ['projected@example.com']
+
+    def test_rows_merged_across_shards(self, shards):
+        """rows() pagine dans l'ordre global des shards"""
+        for age in (30, 10, 50, 20, 40, 60):
+            Account(email=f'{age}@example.com', age=age).save()
+
+        page = Account.rows(columns=['email'], order_by='age', limit=2, offset=1)
+        assert page == [{'email': '20@example.com'}, {'email': '30@example.com'}]
+
+    def test_stream_merged_across_shards(self, shards):
+        """stream() fusionne les curseurs des shards dans l'ordre global"""
+        for age in (30, 10, 50, 20, 40, 60):
+            Account(email=f'{age}@example.com', age=age).save()
+
+        with Account.stream(columns=['age'], order_by='age', desc=True, batch_size=1) as rows:
+            assert [row['age'] for row in rows] == [60, 50, 40, 30, 20, 10]
+
+        rows = Account.stream(columns=['age'], email='20@example.com')
+        assert list(rows) == [{'age': 20}]
+        assert rows.closed
+
+    def test_rows_include_per_shard(self, shards):
+        """include= est charge sur chaque shard puis fusionne"""
+        def populate(session, shard):
+            # Equipe et joueurs sur le meme shard (ids de ce shard)
+            team = Team(id=3 + shard, name=f'team{shard}')
+            session.add_all([team, Player(id=6 + shard, name=f'p{shard}', team=team)])
+            session.commit()
+
+        for shard in range(len(shards)):
+            shards.run(shard, lambda session: populate(session, shard))
+
+        rows = Player.rows(columns=['name'], include=['team'], order_by='name', desc=True)
+        assert rows == [
+            {'name': f'p{shard}', 'team': {'id': 3 + shard, 'name': f'team{shard}'}} for shard in (2, 1, 0)
+        ]
+        assert Player.rows(columns=['name'], include=['team'], limit=1, offset=1)[0]['name'] == 'p1'
+
+    def test_nulls_merged_like_the_database(self, shards):
+        """Les NULL sont fusionnes a la place que leur donne l'ORDER BY du SGBD"""
+        for email, age in (('n1@example.com', None), ('n2@example.com', 5), ('n3@example.com', 1)):
+            Account(email=email, age=age).save()
+        assert shards.nulls_first
+        assert [row['age'] for row in Account.rows(columns=['age'], order_by='age')] == [None, 1, 5]
+
+        item = lambda id, age: types.SimpleNamespace(id=id, age=age)
+        per_shard = [[item(1, 1), item(4, None)], [item(2, 3)]]
+        assert [i.id for i in merge_ordered(per_shard, 'age', nulls_first=False)] == [1, 2, 4]
+
+
+class TestShardedInserts:
+    """Tests de l'unicite hors cle de shard (insert_or_ignore / upsert)"""
+
+    def test_unique_column_checked_on_all_shards(self, shards):
+        """Sharde par id: le meme email n'est accepte qu'une fois, tous shards confondus"""
+        first = Login.insert_or_ignore(conflict_cols=['email'], email='dup@example.com')
+        assert first is not None
+
+        for _ in range(len(shards)):
+            assert Login.insert_or_ignore(conflict_cols=['email'], email='dup@example.com') is None
+        assert sum(rows_per_shard(shards, Login)) == 1
+
+    def test_shard_key_conflict_stays_atomic(self, shards):
+        assert Account.insert_or_ignore(conflict_cols=['email'], email='k@example.com', age=1) is not None
+        assert Account.insert_or_ignore(conflict_cols=['email'], email='k@example.com', age=2) is None
+
+    def test_upsert_requires_shard_key(self, shards):
+        with pytest.raises(ValueError):
+            Login.upsert(['email'], email='u@example.com')
+
+    def test_save_checks_unique_on_all_shards(self, shards):
+        """save() refuse une valeur unique deja presente sur un autre shard"""
+        login = Login(email='saved@example.com').save()
+        login.save()
+
+        for _ in range(len(shards)):
+            with pytest.raises(ValueError, match='email'):
+                Login(email='saved@example.com').save()
+        assert sum(rows_per_shard(shards, Login)) == 1
+
+    def test_async_methods_refused(self, shards):
+        """Les sessions asyncio ne connaissent pas les shards"""
+        with pytest.raises(NotImplementedError):
+            asyncio.run(Login.aget(1))
+        with pytest.raises(NotImplementedError):
+            asyncio.run(Login(email='async@example.com').asave())
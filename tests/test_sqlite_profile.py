@@ -0,0 +1,79 @@
+"""
+Tests pour le profil SQLite de production
+"""
+
+import importlib.util
+import types
+
+import dotenv
+from sqlalchemy import create_engine, text
+
+from bmb.config import BMDBConfig, bmdb_config
+from bmb.models_loader import ModelsLoader
+from bmb.orm import SQLiteProfile
+
+
+def pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSQLiteProfile:
+    """Tests des PRAGMA appliques a la connexion"""
+
+    def test_production_pragmas_applied(self, tmp_path, monkeypatch):
+        """Chaque nouvelle connexion recoit les PRAGMA du profil"""
+        monkeypatch.setattr(BMDBConfig, 'SQLITE_PROFILE', 'production')
+        engine = create_engine(f'sqlite:///{tmp_path / "prod.db"}')
+        SQLiteProfile(BMDBConfig.sqlite_pragmas()).install(engine)
+
+        with engine.connect() as conn:
+            assert pragma(conn, 'journal_mode') == 'wal'
+            assert pragma(conn, 'busy_timeout') == BMDBConfig.SQLITE_BUSY_TIMEOUT
+            assert pragma(conn, 'synchronous') == 1  # NORMAL
+            assert pragma(conn, 'temp_store') == 2  # MEMORY
+            assert pragma(conn, 'cache_size') == BMDBConfig.SQLITE_CACHE_SIZE
+
+        engine.dispose()
+
+    def test_default_profile_is_empty(self, monkeypatch):
+        """Par defaut, les reglages SQLite d'origine sont conserves"""
+        monkeypatch.delenv('SQLITE_PROFILE', raising=False)
+        # Configuration relue sans .env ni variable d'environnement
+        monkeypatch.setattr(dotenv, 'load_dotenv', lambda *args, **kwargs: None)
+        spec = importlib.util.spec_from_file_location('fresh_bmdb_config', bmdb_config.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        assert module.BMDBConfig.SQLITE_PROFILE == 'default'
+        assert module.BMDBConfig.sqlite_pragmas() == {}
+
+    def test_periodic_checkpoint(self, tmp_path):
+        """Le journal WAL est reporte au retour des connexions dans le pool"""
+        engine = create_engine(f'sqlite:///{tmp_path / "wal.db"}')
+        profile = SQLiteProfile({'journal_mode': 'WAL'}, checkpoint_interval=0.001)
+        profile.install(engine)
+        profile._last_checkpoint = 0
+
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+
+        assert profile.checkpoints >= 1
+        engine.dispose()
+
+    def test_other_dialects_untouched(self):
+        """Le profil ne s'installe que sur SQLite"""
+        # event.listen echouerait sur cet objet: install() ne doit pas l'appeler
+        engine = types.SimpleNamespace(dialect=types.SimpleNamespace(name='postgresql'))
+        assert SQLiteProfile({'journal_mode': 'WAL'}).install(engine) is engine
+
+    def test_models_engine_profile_is_opt_in(self, app, tmp_path, monkeypatch):
+        """Journal d'origine par defaut, WAL avec SQLITE_PROFILE=production"""
+        with ModelsLoader.get_engine().connect() as conn:
+            assert pragma(conn, 'journal_mode') == 'delete'
+
+        monkeypatch.setattr(BMDBConfig, 'SQLITE_PROFILE', 'production')
+        monkeypatch.setattr(ModelsLoader, '_sqlite_profile', None)
+        engine = ModelsLoader.configure_engine(create_engine(f'sqlite:///{tmp_path / "prod.db"}'))
+        with engine.connect() as conn:
+            assert pragma(conn, 'journal_mode') == 'wal'
+        engine.dispose()
@@ -0,0 +1,185 @@
+"""
+Tests pour les lectures en flux (Model.stream) et les reponses NDJSON
+"""
+
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from bmb.models_loader import ModelsLoader, load_models
+from bmb.utils import JWTManager
+from bmb.utils.streaming import ChunkEncoder, encode_stream
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def users(User):
+    tag = uuid.uuid4().hex
+    users = [User(name=tag, email=f'{tag}-{i}@example.com', password='x', age=i).save() for i in range(5)]
+    yield users
+    for user in users:
+        user.delete()
+
+
+@pytest.fixture
+def headers(users):
+    return {'Authorization': f'Bearer {JWTManager.generate_token(users[0].id)}'}
+
+
+def checked_out():
+    return ModelsLoader.get_engine().pool.checkedout()
+
+
+class TestModelStream:
+    """Tests de Model.stream"""
+
+    def test_stream_reads_all_rows_in_batches(self, User, users):
+        """Toutes les lignes, dans l'ordre, quelle que soit la taille des lots"""
+        with User.stream(name=users[0].name, defer=['password'], batch_size=2) as rows:
+            streamed = list(rows)
+
+        assert [row['id'] for row in streamed] == [user.id for user in users]
+        assert 'password' not in streamed[0]
+
+    def test_session_released_when_exhausted(self, User, users):
+        """La connexion est rendue au pool a la fin du flux"""
+        before = checked_out()
+        rows = User.stream(name=users[0].name, columns=['id'])
+        assert checked_out() == before + 1
+
+        list(rows)
+        assert rows.closed
+        assert checked_out() == before
+
+    def test_close_mid_stream(self, User, users):
+        """close() en cours de lecture libere curseur et session"""
+        before = checked_out()
+        rows = User.stream(name=users[0].name, columns=['id'], batch_size=1)
+        next(rows)
+        rows.close()
+
+        assert checked_out() == before
+        assert list(rows) == []
+
+    def test_invalid_arguments_fail_before_query(self, User):
+        """Colonne ou forme inconnue: erreur immediate, aucune session ouverte"""
+        before = checked_out()
+        with pytest.raises(ValueError):
+            User.stream(columns=['nope'])
+        with pytest.raises(ValueError):
+            User.stream(result='xml')
+        assert checked_out() == before
+
+    def test_async_stream(self, User, users):
+        """astream est l'equivalent asyncio"""
+        async def run():
+            try:
+                async with await User.astream(name=users[0].name, columns=['id'], batch_size=2) as rows:
+                    return [row['id'] async for row in rows]
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        assert asyncio.run(run()) == [user.id for user in users]
+
+
+class TestEncoding:
+    """Tests de l'encodage par morceaux"""
+
+    def test_ndjson_chunks(self):
+        """Un morceau par lot, une ligne par enregistrement"""
+        encoder = ChunkEncoder('ndjson', lambda obj: json.dumps(obj).encode())
+        chunks = list(encode_stream(iter([{'id': 1}, {'id': 2}, {'id': 3}]), encoder, 2))
+
+        assert chunks == [b'{"id": 1}\n{"id": 2}\n', b'{"id": 3}\n', b'']
+
+    def test_json_array_chunks(self):
+        """Le tableau reconstitue est un document JSON valide"""
+        encoder = ChunkEncoder('json', lambda obj: json.dumps(obj).encode())
+        body = b''.join(encode_stream(iter([{'id': i} for i in range(5)]), encoder, 2))
+
+        assert json.loads(body) == [{'id': i} for i in range(5)]
+
+    def test_empty_json_array(self):
+        encoder = ChunkEncoder('json', lambda obj: json.dumps(obj).encode())
+        assert b''.join(encode_stream(iter([]), encoder, 2)) == b'[]'
+
+    def test_error_mid_stream(self, caplog):
+        """NDJSON: l'erreur est signalee par une derniere ligne et journalisee"""
+        def rows():
+            yield {'id': 1}
+            raise RuntimeError('connexion perdue')
+
+        encoder = ChunkEncoder('ndjson', lambda obj: json.dumps(obj).encode())
+        lines = b''.join(encode_stream(rows(), encoder, 1)).splitlines()
+
+        assert json.loads(lines[0]) == {'id': 1}
+        assert 'connexion perdue' in json.loads(lines[-1])['error']
+        assert any(
+            record.name == 'bmb' and 'connexion perdue' in record.getMessage()
+            for record in caplog.records
+        )
+
+
+class TestStreamingRoutes:
+    """Tests de GET /api/users en flux"""
+
+    def test_ndjson_from_accept_header(self, client, users, headers):
+        """Accept: application/x-ndjson renvoie tous les resultats, sans pagination"""
+        response = client.get(
+            f'/api/users?name={users[0].name}&page_size=2',
+            headers={**headers, 'Accept': 'application/x-ndjson'}
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert response.headers['X-Accel-Buffering'] == 'no'
+        rows = [json.loads(line) for line in response.data.splitlines()]
+        assert [row['email'] for row in rows] == [user.email for user in users]
+        assert all('password' not in row for row in rows)
+
+    def test_json_array_stream(self, client, users, headers):
+        """?stream=json renvoie un tableau JSON envoye par morceaux"""
+        response = client.get(f'/api/users?name={users[0].name}&stream=json', headers=headers)
+
+        assert response.status_code == 200
+        assert [row['id'] for row in response.get_json()] == [user.id for user in users]
+
+    def test_unknown_stream_format(self, client, headers):
+        response = client.get('/api/users?stream=csv', headers=headers)
+        assert response.status_code == 400
+
+    def test_client_disconnect_releases_session(self, client, users, headers):
+        """Deconnexion du client (Response.close) en cours de flux"""
+        before = checked_out()
+        response = client.get(f'/api/users?name={users[0].name}&stream=ndjson', headers=headers, buffered=False)
+        next(response.response)
+        response.close()
+
+        assert checked_out() == before
+
+    def test_asgi_ndjson(self, app, users, headers):
+        """Meme reponse NDJSON en mode ASGI"""
+        pytest.importorskip('quart')
+        from bmb.asgi import create_asgi_app
+
+        async def run():
+            try:
+                response = await create_asgi_app().test_client().get(
+                    f'/api/users?name={users[0].name}',
+                    headers={**headers, 'Accept': 'application/x-ndjson'}
+                )
+                return response.status_code, response.mimetype, await response.get_data()
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        status, mimetype, body = asyncio.run(run())
+
+        assert status == 200
+        assert mimetype == 'application/x-ndjson'
+        assert [json.loads(line)['id'] for line in body.splitlines()] == [user.id for user in users]
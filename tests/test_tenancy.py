@@ -0,0 +1,203 @@
+"""
+Tests pour le multi-tenant (une base par client)
+"""
+
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from bmb.config import AppConfig
+from bmb.middleware import setup_tenancy
+from bmb.models_loader import ModelsLoader
+from bmb.orm import Tenant, TenantRegistry, InvalidTenant, UnknownTenant, RoutingSession
+from bmb.utils import JWTManager
+
+
+@pytest.fixture
+def registry(app, tmp_path):
+    """Registre de bases SQLite par tenant"""
+    User = ModelsLoader.get_model('User')
+    registry = TenantRegistry(
+        f'sqlite:///{tmp_path}/tenants/{{tenant}}.db',
+        max_engines=2,
+        metadata=User.metadata,
+        tenants=['acme', 'globex', 'initech']
+    )
+    yield registry
+    registry.dispose()
+
+
+class TestTenantRegistry:
+    """Tests du registre d'engines"""
+
+    def test_lazy_creation_and_lru_eviction(self, registry):
+        """Au plus max_engines pools ouverts, le moins recent est libere"""
+        acme = registry.get_engine('acme')
+        assert registry.get_engine('acme') is acme
+
+        registry.get_engine('globex')
+        registry.get_engine('acme')
+        registry.get_engine('initech')
+
+        assert 'globex' not in registry
+        assert 'acme' in registry and 'initech' in registry
+        assert registry.stats() == {'open': 2, 'max_engines': 2, 'created': 3, 'evicted': 1}
+
+    def test_idle_eviction(self, registry):
+        """Les pools inactifs sont liberes"""
+        registry.idle_timeout = 0
+        registry.get_engine('acme')
+
+        assert registry.evict_idle() == 1
+        assert registry.stats()['open'] == 0
+
+    def test_invalid_tenant_rejected(self, registry):
+        """Un identifiant ne peut pas sortir du modele d'URL"""
+        for tenant in ('../etc', 'a/b', '', 'x' * 100):
+            with pytest.raises(InvalidTenant):
+                registry.url_for(tenant)
+
+    def test_unknown_tenant_creates_nothing(self, registry, tmp_path):
+        """Un tenant hors liste n'ouvre aucun engine et ne cree aucun fichier"""
+        with pytest.raises(UnknownTenant):
+            registry.get_engine('umbrella')
+        with pytest.raises(UnknownTenant):
+            registry.provision('umbrella')
+        assert registry.stats()['created'] == 0
+        assert not (tmp_path / 'tenants').exists()
+
+    def test_existing_databases_without_list(self, app, tmp_path):
+        """Sans liste, seules les bases deja provisionnees sont servies"""
+        User = ModelsLoader.get_model('User')
+        registry = TenantRegistry(f'sqlite:///{tmp_path}/tenants/{{tenant}}.db', metadata=User.metadata)
+        try:
+            assert not registry.exists('acme')
+            with pytest.raises(UnknownTenant):
+                registry.get_engine('acme')
+
+            registry.provision('acme')
+            assert (tmp_path / 'tenants' / 'acme.db').is_file()
+            registry.dispose()
+            assert registry.exists('acme')
+            assert registry.get_engine('acme') is not None
+        finally:
+            registry.dispose()
+
+    def test_sessions_use_tenant_database(self, registry, tmp_path):
+        """Les modeles lisent et ecrivent dans la base du tenant courant"""
+        User = ModelsLoader.get_model('User')
+        registry.provision('acme')
+        registry.provision('globex')
+        default = create_engine(f'sqlite:///{tmp_path}/default.db')
+        User.metadata.create_all(default)
+        Session = sessionmaker(bind=default, class_=RoutingSession, tenant_registry=registry)
+
+        with Tenant.scope('acme'):
+            with Session() as session:
+                session.add(User(name='Acme', email='boss@acme.test'))
+                session.commit()
+                assert session.query(User).count() == 1
+
+        with Tenant.scope('globex'):
+            with Session() as session:
+                assert session.query(User).count() == 0
+
+        with Session() as session:
+            assert session.query(User).count() == 0
+
+        default.dispose()
+
+
+class TestTenantResolution:
+    """Tests de la resolution du tenant par requete"""
+
+    @pytest.fixture
+    def flask_app(self, monkeypatch):
+        monkeypatch.setattr(AppConfig, 'TENANT_BASE_DOMAIN', 'example.com')
+        app = Flask(__name__)
+        setup_tenancy(app)
+
+        @app.route('/api/whoami')
+        def whoami():
+            return jsonify(tenant=Tenant.current())
+
+        @app.route('/api/private')
+        @JWTManager.token_required
+        def private(current_user):
+            return jsonify(user=current_user.id)
+
+        return app
+
+    def test_header(self, flask_app):
+        response = flask_app.test_client().get('/api/whoami', headers={'X-Tenant-ID': 'acme'})
+        assert response.get_json()['tenant'] == 'acme'
+
+    def test_subdomain(self, flask_app):
+        response = flask_app.test_client().get('/api/whoami', base_url='http://globex.example.com')
+        assert response.get_json()['tenant'] == 'globex'
+
+    def test_jwt_claim(self, flask_app):
+        with Tenant.scope('initech'):
+            token = JWTManager.generate_token(1)
+
+        response = flask_app.test_client().get('/api/whoami', headers={'Authorization': f'Bearer {token}'})
+        assert response.get_json()['tenant'] == 'initech'
+
+    def test_invalid_tenant(self, flask_app):
+        response = flask_app.test_client().get('/api/whoami', headers={'X-Tenant-ID': '../secret'})
+        assert response.status_code == 400
+
+    def test_required_tenant(self, flask_app, monkeypatch):
+        monkeypatch.setattr(AppConfig, 'TENANT_REQUIRED', True)
+        response = flask_app.test_client().get('/api/whoami')
+        assert response.status_code == 400
+
+    def test_unknown_tenant(self, flask_app, registry, monkeypatch, tmp_path):
+        """Un en-tete ne cree jamais de base: tenant inconnu -> 404"""
+        monkeypatch.setattr(ModelsLoader, '_tenant_registry', registry)
+        client = flask_app.test_client()
+
+        assert client.get('/api/whoami', headers={'X-Tenant-ID': 'umbrella'}).status_code == 404
+        assert client.get('/api/whoami', headers={'X-Tenant-ID': 'acme'}).get_json()['tenant'] == 'acme'
+        assert registry.stats()['created'] == 0
+        assert not (tmp_path / 'tenants').exists()
+
+    def test_claim_overrides_header(self, flask_app):
+        """Le claim signe fait autorite: un en-tete qui le contredit est refuse"""
+        with Tenant.scope('initech'):
+            token = JWTManager.generate_token(1)
+        client = flask_app.test_client()
+
+        response = client.get('/api/whoami', headers={'Authorization': f'Bearer {token}', 'X-Tenant-ID': 'acme'})
+        assert response.status_code == 403
+
+        response = client.get('/api/whoami', headers={'Authorization': f'Bearer {token}', 'X-Tenant-ID': 'initech'})
+        assert response.get_json()['tenant'] == 'initech'
+
+    def test_token_without_claim_rejected_for_tenant(self, flask_app):
+        """Un token de la base par defaut ne donne pas acces a un tenant"""
+        token = JWTManager.generate_token(1)
+        response = flask_app.test_client().get(
+            '/api/private', headers={'Authorization': f'Bearer {token}', 'X-Tenant-ID': 'acme'}
+        )
+        assert response.status_code == 401
+        assert 'tenant' in response.get_json()['error']
+
+    def test_tenant_token_rejected_without_tenant(self, flask_app, monkeypatch):
+        monkeypatch.setattr(AppConfig, 'TENANT_RESOLVERS', ['header'])
+        with Tenant.scope('acme'):
+            token = JWTManager.generate_token(1)
+        response = flask_app.test_client().get('/api/private', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 401
+
+
+def test_asgi_refuses_tenancy(app, monkeypatch):
+    """Sessions asyncio sans routage par tenant: demarrage refuse"""
+    pytest.importorskip('quart')
+    from bmb.asgi import create_asgi_app
+    from bmb.config import BMDBConfig
+
+    monkeypatch.setattr(BMDBConfig, 'TENANT_DB_URL', 'sqlite:///./tenants/{tenant}.db')
+    with pytest.raises(RuntimeError, match='multi-tenant'):
+        create_asgi_app()
@@ -0,0 +1,85 @@
+"""
+Tests pour les mises a jour partielles (Model.update / update_where)
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from bmb.models_loader import ModelsLoader, load_models
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def user(User):
+    user = User(name='Partial', email=f'{uuid.uuid4().hex}@example.com', password='x', age=20).save()
+    yield user
+    user.delete()
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement.split()[0].upper())
+
+    engine = ModelsLoader.get_engine()
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+class TestModelUpdate:
+    """Tests de Model.update"""
+
+    def test_single_update_statement(self, User, user, statements):
+        """Une seule instruction UPDATE ... RETURNING, sans SELECT"""
+        updated = User.update(user.id, name='Renamed')
+
+        assert updated.name == 'Renamed'
+        assert updated.email == user.email
+        assert statements == ['UPDATE']
+        assert User.get(user.id).name == 'Renamed'
+
+    def test_missing_id_returns_none(self, User):
+        """Un id inexistant ne modifie rien"""
+        assert User.update(10 ** 9, name='Ghost') is None
+
+    def test_unknown_field_rejected(self, User, user):
+        """Les champs inconnus et l'id sont refuses"""
+        with pytest.raises(ValueError):
+            User.update(user.id, nickname='x')
+        with pytest.raises(ValueError):
+            User.update_where({'id': user.id}, id=1)
+
+    def test_async_update(self, User, user):
+        """aupdate est l'equivalent asyncio"""
+        async def run():
+            try:
+                return await User.aupdate(user.id, age=33)
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        assert asyncio.run(run()).age == 33
+        assert User.get(user.id).age == 33
+
+
+class TestModelUpdateWhere:
+    """Tests de Model.update_where"""
+
+    def test_updates_matching_rows(self, User, user):
+        """Retourne le nombre de lignes modifiees"""
+        assert User.update_where({'email': user.email}, age=41) == 1
+        assert User.get(user.id).age == 41
+
+    def test_unknown_filter_rejected(self, User):
+        """Un filtre inconnu ne doit pas devenir un UPDATE de toute la table"""
+        with pytest.raises(ValueError):
+            User.update_where({'mail': 'x'}, age=1)
@@ -0,0 +1,95 @@
+"""
+Tests pour les insertions atomiques (insert_or_ignore / upsert)
+"""
+
+import asyncio
+import types
+import uuid
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from bmb.models_loader import ModelsLoader, load_models
+from bmb.orm.upserts import insert_or_ignore_statement, was_inserted
+
+
+@pytest.fixture
+def User(app):
+    return load_models()['User']
+
+
+@pytest.fixture
+def email(User):
+    email = f'{uuid.uuid4().hex}@example.com'
+    yield email
+    for user in User.filter(email=email):
+        user.delete()
+
+
+class TestInsertOrIgnore:
+    """Tests de insert_or_ignore"""
+
+    def test_inserts_new_row(self, User, email):
+        """Retourne l'instance inseree avec son id"""
+        user = User.insert_or_ignore(conflict_cols=['email'], name='New', email=email, password='x')
+
+        assert user.id is not None
+        assert User.get(user.id).email == email
+
+    def test_conflict_returns_none(self, User, email):
+        """Une contrainte d'unicite violee n'insere rien et ne leve pas d'erreur"""
+        User.insert_or_ignore(conflict_cols=['email'], name='First', email=email, password='x')
+        duplicate = User.insert_or_ignore(conflict_cols=['email'], name='Second', email=email, password='y')
+
+        assert duplicate is None
+        assert User.count(email=email) == 1
+        assert User.first(email=email).name == 'First'
+
+    def test_conflict_cols_must_have_values(self, User):
+        """Les colonnes de conflit doivent etre renseignees"""
+        with pytest.raises(ValueError):
+            User.insert_or_ignore(conflict_cols=['email'], name='No email')
+
+    def test_mysql_ignores_duplicate_keys_only(self, User):
+        """MySQL: ON DUPLICATE KEY UPDATE id = id, pas INSERT IGNORE (NOT NULL, FK...)"""
+        dialect = mysql.dialect()
+        sql = str(insert_or_ignore_statement(dialect, User, {'email': 'a@b.c'}).compile(dialect=dialect))
+
+        assert 'IGNORE' not in sql
+        assert sql.endswith('ON DUPLICATE KEY UPDATE id = users.id')
+
+        # Doublon sans effet: une ligne comptee (CLIENT_FOUND_ROWS), aucun id insere
+        assert not was_inserted(dialect, types.SimpleNamespace(rowcount=1, lastrowid=0))
+        assert was_inserted(dialect, types.SimpleNamespace(rowcount=1, lastrowid=42))
+
+    def test_async_insert_or_ignore(self, User, email):
+        """ainsert_or_ignore est l'equivalent asyncio"""
+        async def run():
+            try:
+                first = await User.ainsert_or_ignore(conflict_cols=['email'], name='A', email=email)
+                second = await User.ainsert_or_ignore(conflict_cols=['email'], name='B', email=email)
+                return first, second
+            finally:
+                await ModelsLoader.dispose_async_engine()
+
+        first, second = asyncio.run(run())
+        assert first.id is not None
+        assert second is None
+
+
+class TestUpsert:
+    """Tests de upsert"""
+
+    def test_insert_then_update(self, User, email):
+        """La meme instruction insere puis met a jour"""
+        created = User.upsert(['email'], email=email, name='Before', age=1)
+        updated = User.upsert(['email'], update_cols=['name'], email=email, name='After', age=2)
+
+        assert updated.id == created.id
+        assert updated.name == 'After'
+        assert updated.age == 1
+
+    def test_nothing_to_update_returns_row(self, User, email):
+        """Sans colonne a mettre a jour, la ligne existante est retournee"""
+        created = User.upsert(['email'], email=email)
+        assert User.upsert(['email'], email=email).id == created.id
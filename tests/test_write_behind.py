@@ -0,0 +1,133 @@
+"""
+Tests pour l'ecriture differee (write-behind)
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from bmb.orm import TableVersions, WriteBehindBuffer
+
+Base = declarative_base()
+
+
+class Counter(Base):
+    __tablename__ = 'counters'
+    id = Column(Integer, primary_key=True)
+    views = Column(Integer, default=0)
+    score = Column(Integer, default=0)
+    last_seen = Column(DateTime)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "behind.db"}')
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add_all([Counter(id=i, views=0, score=0) for i in range(1, 4)])
+        session.commit()
+
+    yield factory
+
+    engine.dispose()
+
+
+@pytest.fixture
+def buffer(session_factory):
+    buffer = WriteBehindBuffer(lambda: session_factory, flush_interval=60, max_rows=1000)
+    yield buffer
+    buffer.stop()
+
+
+def load(session_factory, id):
+    with session_factory() as session:
+        return session.get(Counter, id)
+
+
+class TestWriteBehindBuffer:
+    """Tests du tampon d'ecriture differee"""
+
+    def test_flush_bumps_table_version(self, buffer):
+        """Les ecritures differees invalident les reponses en cache"""
+        before = TableVersions.get(('counters',))
+        buffer.update(Counter, 1, {'score': 5})
+        assert TableVersions.get(('counters',)) == before
+
+        buffer.flush()
+        assert TableVersions.get(('counters',))[0] == before[0] + 1
+
+    def test_tracking_columns_keep_version(self, buffer):
+        """Une ecriture limitee aux colonnes de suivi n'invalide pas le cache"""
+        buffer.unversioned_columns = frozenset({'last_seen'})
+        before = TableVersions.get(('counters',))
+
+        buffer.update(Counter, 1, {'last_seen': datetime(2024, 1, 1)})
+        buffer.flush()
+        assert TableVersions.get(('counters',)) == before
+
+        buffer.update(Counter, 1, {'last_seen': datetime(2024, 1, 2), 'score': 1})
+        buffer.flush()
+        assert TableVersions.get(('counters',))[0] == before[0] + 1
+
+    def test_updates_are_coalesced(self, buffer, session_factory):
+        """Plusieurs mises a jour d'une ligne donnent une seule ecriture"""
+        for score in range(10):
+            buffer.update(Counter, 1, {'score': score})
+
+        assert load(session_factory, 1).score == 0
+        assert buffer.flush() == 1
+        assert load(session_factory, 1).score == 9
+        assert buffer.stats()['coalesced'] == 9
+
+    def test_increments_are_summed(self, buffer, session_factory):
+        """Les increments s'additionnent en memoire et en base"""
+        for _ in range(5):
+            buffer.increment(Counter, 2, {'views': 1})
+        buffer.flush()
+        buffer.increment(Counter, 2, {'views': 3})
+        buffer.flush()
+
+        assert load(session_factory, 2).views == 8
+
+    def test_update_then_increment(self, buffer, session_factory):
+        """Un increment apres une valeur absolue s'applique a cette valeur"""
+        buffer.update(Counter, 3, {'views': 100})
+        buffer.increment(Counter, 3, {'views': 2})
+        buffer.flush()
+
+        assert load(session_factory, 3).views == 102
+
+    def test_max_rows_triggers_flush(self, session_factory):
+        """Le seuil de lignes en attente reveille le thread d'ecriture"""
+        buffer = WriteBehindBuffer(lambda: session_factory, flush_interval=60, max_rows=3)
+        try:
+            for id in range(1, 4):
+                buffer.increment(Counter, id, {'views': 1})
+
+            deadline = time.monotonic() + 5
+            while buffer.stats()['rows_written'] < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert buffer.stats()['rows_written'] == 3
+            assert load(session_factory, 3).views == 1
+        finally:
+            buffer.stop()
+
+    def test_stop_flushes_pending_updates(self, buffer, session_factory):
+        """L'arret ecrit les mises a jour restantes"""
+        buffer.update(Counter, 1, {'score': 42})
+        buffer.stop()
+
+        assert buffer.stats()['pending'] == 0
+        assert load(session_factory, 1).score == 42
+
+    def test_unknown_field_rejected(self, buffer):
+        """Les champs inconnus et la cle primaire sont refuses"""
+        with pytest.raises(ValueError):
+            buffer.update(Counter, 1, {'missing': 1})
+        with pytest.raises(ValueError):
+            buffer.update(Counter, 1, {'id': 2})
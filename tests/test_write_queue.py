@@ -0,0 +1,118 @@
+"""
+Tests pour la file d'ecriture unique (commit groupe)
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from bmb.orm import WriteCoordinator
+
+Base = declarative_base()
+
+
+class Note(Base):
+    __tablename__ = 'notes'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    slug = Column(String, unique=True)
+    body = Column(String)
+
+    def save(self):
+        return 'direct'
+
+    def delete(self):
+        return 'direct'
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "writes.db"}')
+    Base.metadata.create_all(engine)
+    coordinator = WriteCoordinator(sessionmaker(bind=engine), max_batch=64, max_wait=0.05)
+
+    yield coordinator
+
+    coordinator.stop()
+    engine.dispose()
+
+
+def count_notes(coordinator):
+    with coordinator.session_factory() as session:
+        return session.query(Note).count()
+
+
+class TestWriteCoordinator:
+    """Tests du thread ecrivain"""
+
+    def test_concurrent_saves_are_grouped(self, coordinator):
+        """Les ecritures simultanees partagent une transaction"""
+        barrier = threading.Barrier(20)
+        notes = [Note(slug=f'n{i}', body='x') for i in range(20)]
+
+        def save(note):
+            barrier.wait()
+            coordinator.write('save', note)
+
+        threads = [threading.Thread(target=save, args=(note,)) for note in notes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert count_notes(coordinator) == 20
+        assert all(note.id is not None for note in notes)
+        assert coordinator.stats()['batches'] < 20
+        assert coordinator.stats()['writes'] == 20
+
+    def test_failing_write_is_isolated(self, coordinator):
+        """Seule l'ecriture fautive echoue, le reste du lot est valide"""
+        coordinator.write('save', Note(slug='taken'))
+
+        futures = [
+            coordinator.submit('save', Note(slug='ok-1')),
+            coordinator.submit('save', Note(slug='taken')),
+            coordinator.submit('save', Note(slug='ok-2')),
+        ]
+
+        assert futures[0].result(5).slug == 'ok-1'
+        with pytest.raises(IntegrityError):
+            futures[1].result(5)
+        assert futures[2].result(5).slug == 'ok-2'
+        assert count_notes(coordinator) == 3
+
+    def test_update_and_delete_detached_instance(self, coordinator):
+        """Les instances detachees (get puis modification) sont fusionnees"""
+        note = coordinator.write('save', Note(slug='draft', body='v1'))
+
+        with coordinator.session_factory() as session:
+            loaded = session.get(Note, note.id)
+        loaded.body = 'v2'
+        coordinator.write('save', loaded)
+
+        with coordinator.session_factory() as session:
+            assert session.get(Note, note.id).body == 'v2'
+
+        assert coordinator.write('delete', loaded) is True
+        assert count_notes(coordinator) == 0
+
+    def test_stop_flushes_pending_writes(self, coordinator):
+        """L'arret vide la file"""
+        futures = [coordinator.submit('save', Note(slug=f's{i}')) for i in range(5)]
+        coordinator.stop()
+
+        assert all(future.done() for future in futures)
+        assert count_notes(coordinator) == 5
+
+    def test_install_routes_model_methods(self, coordinator):
+        """save/delete des modeles passent par la file"""
+        coordinator.install([Note])
+        try:
+            note = Note(slug='installed').save()
+            assert isinstance(note, Note) and note.id is not None
+            assert note._bmb_direct_save() == 'direct'
+        finally:
+            Note.save = Note._bmb_direct_save
+            Note.delete = Note._bmb_direct_delete